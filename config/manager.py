@@ -3,8 +3,8 @@ Configuration Manager for THE CLOSER PRO.
 Centralizes all system parameters, audio settings, and AI model configurations.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 import os
 
 
@@ -20,6 +20,12 @@ class AudioConfig:
         chunk_duration: Durée d'un chunk audio en secondes
         silence_threshold: Seuil de détection de silence (amplitude RMS)
         silence_duration: Durée de silence avant flush en secondes
+        capture_mode: Mode de capture ('queue' = copie par callback, 'ring' = ring buffer préalloué)
+        capture_dtype: Type des échantillons capturés ('float32' ou 'int16')
+        ring_buffer_duration: Capacité du ring buffer en secondes (mode 'ring')
+        channel_speakers: Locuteur de chaque canal capturé, dans l'ordre (1 à 8, libellés uniques).
+                          audio.channels doit couvrir ces canaux. Les analyses de vente
+                          reconnaissent les rôles 'VOUS' et 'CLIENT'.
     """
     device_id: int = 33
     sample_rate: int = 48000
@@ -27,6 +33,105 @@ class AudioConfig:
     chunk_duration: float = 0.5
     silence_threshold: float = 0.01
     silence_duration: float = 2.0
+    capture_mode: str = "queue"
+    capture_dtype: str = "float32"
+    ring_buffer_duration: float = 10.0
+    channel_speakers: List[str] = field(default_factory=lambda: ["VOUS", "CLIENT"])
+
+
+@dataclass
+class UtteranceConfig:
+    """
+    Configuration de l'assembleur d'énoncés (endpointing par canal).
+    
+    Attributes:
+        frame_duration: Durée d'une trame d'analyse en secondes
+        energy_threshold: Seuil RMS au-dessus duquel une trame est considérée comme parole
+        onset_duration: Durée de parole continue requise pour ouvrir un énoncé
+        hangover_duration: Durée de silence tolérée avant de clore un énoncé
+        preroll_duration: Audio conservé avant le début de parole (évite les attaques coupées)
+        min_duration: Durée minimale de parole dans un énoncé (en dessous: bruit, ignoré)
+        max_duration: Durée maximale avant flush forcé (Whisper plafonne à 30s)
+        vad_noise_margin_db: Marge au-dessus du plancher de bruit adaptatif pour une trame voisée
+        vad_noise_adaptation: Vitesse de remontée du plancher de bruit (0-1, par chunk)
+        vad_max_flatness: Planéité spectrale maximale d'une trame voisée (bruit blanc ≈ 0.56, voyelles < 0.1)
+        vad_backend: Détecteur d'activité vocale ('energy' ou 'silero': réseau ONNX sur CPU)
+        vad_model_path: Modèle Silero ONNX (vide = modèle fourni avec faster-whisper)
+        vad_threshold: Probabilité de parole minimale (backend 'silero', suivie par le profil de performance)
+    """
+    frame_duration: float = 0.03
+    energy_threshold: float = 0.01
+    onset_duration: float = 0.09
+    hangover_duration: float = 0.6
+    preroll_duration: float = 0.3
+    min_duration: float = 0.3
+    max_duration: float = 15.0
+    vad_noise_margin_db: float = 10.0
+    vad_noise_adaptation: float = 0.05
+    vad_max_flatness: float = 0.35
+    vad_backend: str = "energy"
+    vad_model_path: str = ""
+    vad_threshold: float = 0.5
+
+
+@dataclass
+class BleedConfig:
+    """
+    Configuration de la suppression de diaphonie entre canaux (le micro du
+    closer qui fuit dans le canal client, ou un périphérique mono dupliqué).
+    
+    Attributes:
+        enabled: Activer la détection
+        max_lag_ms: Décalage maximal recherché entre les deux canaux
+        min_correlation: Corrélation normalisée à partir de laquelle un canal est une copie de l'autre
+        min_attenuation_db: Écart de niveau minimal pour désigner le canal le plus faible comme fuite
+        duplicate_correlation: Corrélation d'une copie à l'identique (mono dupliqué: canal CLIENT écarté)
+        hold_duration: Maintien de la suppression après la dernière détection (évite les énoncés hachés)
+    """
+    enabled: bool = True
+    max_lag_ms: float = 20.0
+    min_correlation: float = 0.7
+    min_attenuation_db: float = 6.0
+    duplicate_correlation: float = 0.98
+    hold_duration: float = 0.3
+
+
+@dataclass
+class BackpressureConfig:
+    """
+    Configuration du délestage des queues de canal (capture live).
+    
+    Attributes:
+        policy: 'block' (aucune perte, attente), 'drop_oldest' ou 'coalesce_silence'
+                (le silence en attente est réduit avant de jeter de la parole)
+        latency_budget: Attente maximale d'un chunk en queue avant délestage (secondes)
+    """
+    policy: str = "coalesce_silence"
+    latency_budget: float = 2.0
+
+
+@dataclass
+class GatingConfig:
+    """
+    Configuration du filtrage des segments par les signaux du décodeur,
+    appliqué avant tout traitement de texte.
+    
+    Attributes:
+        enabled: Activer le filtrage
+        word_timestamps: Horodatage et probabilité par mot sur les passes finales
+        no_speech_prob: Probabilité de non-parole au-delà de laquelle un segment peu sûr est rejeté
+        no_speech_logprob: avg_logprob sous lequel la probabilité de non-parole s'applique
+        max_compression_ratio: Ratio de compression maximal (au-delà: boucle de répétition)
+        min_avg_logprob: avg_logprob minimal d'un segment
+        min_word_probability: Probabilité moyenne minimale des mots (si horodatés)
+    """
+    enabled: bool = True
+    word_timestamps: bool = True
+    no_speech_prob: float = 0.6
+    no_speech_logprob: float = -1.0
+    max_compression_ratio: float = 2.4
+    min_avg_logprob: float = -1.5
+    min_word_probability: float = 0.3
 
 
 @dataclass
@@ -36,17 +141,32 @@ class TranscriptionConfig:
     
     Attributes:
         model_name: Nom du modèle Whisper à utiliser
-        device: Device de calcul ('cuda' ou 'cpu')
-        compute_type: Type de précision ('float16', 'int8', 'float32')
+        device: Device de calcul ('cuda', 'cpu' ou 'auto' = cuda si disponible)
+        compute_type: Type de précision GPU ('float16', 'int8_float16', 'float32')
         language: Langue forcée pour la transcription
         task: Type de tâche ('transcribe' ou 'translate')
         beam_size: Taille du beam search (5 = bon compromis vitesse/qualité)
         vad_filter: Activer le filtre Voice Activity Detection
         min_silence_duration_ms: Durée minimale de silence pour VAD (en ms)
         initial_prompt: Prompt de conditionnement pour le contexte métier
+        max_batch_size: Nombre maximal d'énoncés décodés en un seul lot (1 = pas de batching)
+        batch_window_ms: Fenêtre d'attente des autres canaux avant décodage (en ms)
+        streaming_partials: Émettre des hypothèses partielles pendant la parole
+        partial_beam_size: Beam size des passes partielles (1 = greedy, rapide)
+        partial_min_duration: Audio minimal avant la première hypothèse partielle (secondes)
+        agreement_passes: Nombre de passes consécutives devant s'accorder pour valider un mot
+        cpu_threads: Threads intra-op par worker sur CPU (0 = calibration automatique)
+        num_workers: Décodages CPU parallèles (0 = calibration automatique)
+        cpu_calibration_file: Fichier de la calibration CPU persistée
+        cpu_target_rtf: RTF maximal visé sur CPU pour les deux canaux simultanés
+        cpu_model_candidates: Modèles CPU essayés, du plus précis au plus léger
+        inference_processes: Processus d'inférence, une réplique du modèle chacun (0 = modèle dans le processus principal)
+        draft_model: Petit modèle du texte provisoire immédiat, ex. "tiny" ("" = désactivé)
+        draft_compute_type: Précision du modèle provisoire
+        draft_beam_size: Beam size du modèle provisoire (1 = greedy)
     """
     model_name: str = "large-v3"
-    device: str = "cuda"
+    device: str = "auto"
     compute_type: str = "float16"
     language: str = "fr"
     task: str = "transcribe"
@@ -54,6 +174,21 @@ class TranscriptionConfig:
     vad_filter: bool = False
     min_silence_duration_ms: int = 500
     initial_prompt: str = "Transcription en français uniquement. Ne pas traduire. Conversation de vente professionnelle."
+    max_batch_size: int = 4
+    batch_window_ms: int = 20
+    streaming_partials: bool = True
+    partial_beam_size: int = 1
+    partial_min_duration: float = 1.0
+    agreement_passes: int = 2
+    cpu_threads: int = 0
+    num_workers: int = 0
+    cpu_calibration_file: str = "cpu_calibration.json"
+    cpu_target_rtf: float = 0.7
+    cpu_model_candidates: List[str] = field(default_factory=lambda: ["large-v3", "medium", "small", "base"])
+    inference_processes: int = 0
+    draft_model: str = ""
+    draft_compute_type: str = "int8"
+    draft_beam_size: int = 1
 
 
 @dataclass
@@ -110,6 +245,9 @@ class SystemConfig:
         log_level: Niveau de logging ('DEBUG', 'INFO', 'WARNING', 'ERROR')
         output_format: Format de sortie ('console', 'file', 'both')
         output_file: Fichier de sortie pour les transcriptions
+        latency_tracing: Tracer la latence de chaque étape du pipeline (histogrammes p50/p95/p99)
+        metrics_port: Port de l'endpoint Prometheus local (/metrics), 0 = désactivé
+        metrics_host: Adresse d'écoute de l'endpoint de métriques
     """
     enable_gpu_cache_cleanup: bool = True
     cache_cleanup_interval: float = 5.0
@@ -117,6 +255,9 @@ class SystemConfig:
     log_level: str = "INFO"
     output_format: str = "console"
     output_file: Optional[str] = "transcriptions.txt"
+    latency_tracing: bool = True
+    metrics_port: int = 0
+    metrics_host: str = "127.0.0.1"
 
 
 class ConfigManager:
@@ -146,7 +287,11 @@ class ConfigManager:
             return
         
         self.audio = AudioConfig()
+        self.utterance = UtteranceConfig()
+        self.bleed = BleedConfig()
+        self.backpressure = BackpressureConfig()
         self.transcription = TranscriptionConfig()
+        self.gating = GatingConfig()
         self.processing = ProcessingConfig()
         self.system = SystemConfig()
         
@@ -162,9 +307,38 @@ class ConfigManager:
         validations = [
             (self.audio.sample_rate > 0, "Sample rate must be positive"),
             (self.audio.device_id >= 0, "Device ID must be non-negative"),
+            (self.audio.capture_mode in ("queue", "ring"), "Capture mode must be 'queue' or 'ring'"),
+            (self.audio.capture_dtype in ("float32", "int16"), "Capture dtype must be 'float32' or 'int16'"),
+            (self.audio.ring_buffer_duration > self.audio.chunk_duration, "Ring buffer must hold more than one chunk"),
+            (1 <= len(self.audio.channel_speakers) <= 8, "Channel speakers must map 1 to 8 channels"),
+            (len(set(self.audio.channel_speakers)) == len(self.audio.channel_speakers), "Channel speakers must be unique"),
+            (self.utterance.frame_duration > 0, "Utterance frame duration must be positive"),
+            (self.utterance.max_duration > self.utterance.min_duration, "Utterance max duration must exceed min duration"),
+            (0 < self.utterance.vad_noise_adaptation <= 1, "VAD noise adaptation must be in (0, 1]"),
+            (0 < self.utterance.vad_max_flatness <= 1, "VAD max flatness must be in (0, 1]"),
+            (self.utterance.vad_backend in ("energy", "silero"), "VAD backend must be 'energy' or 'silero'"),
+            (0 < self.utterance.vad_threshold < 1, "VAD threshold must be in (0, 1)"),
+            (self.bleed.max_lag_ms >= 0, "Bleed max lag must be non-negative"),
+            (0 < self.bleed.min_correlation <= self.bleed.duplicate_correlation <= 1, "Bleed correlations must satisfy 0 < min <= duplicate <= 1"),
+            (self.bleed.min_attenuation_db >= 0, "Bleed attenuation must be non-negative"),
+            (self.backpressure.policy in ("block", "drop_oldest", "coalesce_silence"), "Backpressure policy must be 'block', 'drop_oldest' or 'coalesce_silence'"),
+            (self.backpressure.latency_budget > 0, "Latency budget must be positive"),
             (self.transcription.beam_size > 0, "Beam size must be positive"),
+            (self.transcription.max_batch_size > 0, "Max batch size must be positive"),
+            (self.transcription.batch_window_ms >= 0, "Batch window must be non-negative"),
+            (self.transcription.partial_beam_size > 0, "Partial beam size must be positive"),
+            (self.transcription.agreement_passes >= 2, "Agreement needs at least 2 passes"),
+            (self.transcription.device in ("cuda", "cpu", "auto"), "Device must be 'cuda', 'cpu' or 'auto'"),
+            (self.transcription.cpu_threads >= 0 and self.transcription.num_workers >= 0, "CPU threads/workers must be non-negative"),
+            (0 < self.transcription.cpu_target_rtf < 1, "CPU target RTF must be in (0, 1)"),
+            (self.transcription.inference_processes >= 0, "Inference processes must be non-negative"),
+            (self.transcription.draft_beam_size > 0, "Draft beam size must be positive"),
+            (0 <= self.gating.no_speech_prob <= 1, "No-speech probability must be 0-1"),
+            (self.gating.max_compression_ratio > 1, "Max compression ratio must exceed 1"),
+            (0 <= self.gating.min_word_probability <= 1, "Min word probability must be 0-1"),
             (0 <= self.processing.fuzzy_threshold <= 100, "Fuzzy threshold must be 0-100"),
             (self.system.max_queue_size > 0, "Queue size must be positive"),
+            (0 <= self.system.metrics_port <= 65535, "Metrics port must be 0-65535"),
         ]
         
         for is_valid, error_msg in validations:
@@ -188,7 +362,11 @@ class ConfigManager:
         return (
             f"ConfigManager(\n"
             f"  Audio: {self.audio}\n"
+            f"  Utterance: {self.utterance}\n"
+            f"  Bleed: {self.bleed}\n"
+            f"  Backpressure: {self.backpressure}\n"
             f"  Transcription: {self.transcription}\n"
+            f"  Gating: {self.gating}\n"
             f"  Processing: {self.processing}\n"
             f"  System: {self.system}\n"
             f")"
@@ -285,14 +285,14 @@ class AnalyticsEngine:
         if len(self.snapshots) < 3:
             return "stable"
         
-        # Comparer les 3 derniers snapshots
-        recent = list(self.snapshots)[-3:]
-        scores = [s.quality_score for s in recent]
+        # Comparer les 3 derniers snapshots (sans copier l'historique)
+        first = self.snapshots[-3].quality_score
+        last = self.snapshots[-1].quality_score
         
         # Calculer la pente
-        if scores[-1] > scores[0] + 5:
+        if last > first + 5:
             return "improving"
-        elif scores[-1] < scores[0] - 5:
+        elif last < first - 5:
             return "declining"
         else:
             return "stable"
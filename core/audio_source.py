@@ -0,0 +1,454 @@
+"""
+THE CLOSER PRO V25 - Audio Sources
+Interface commune des sources audio (capture live, replay de fichiers).
+Permet de rejouer des appels enregistrés à travers le pipeline V25 complet.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import numpy as np
+import threading
+import time
+import wave
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Callable, Iterator
+
+from config.manager import get_config
+from core.voice_activity import VoiceActivity, VoiceActivityDetector, create_voice_activity_detector
+
+
+@dataclass
+class AudioChunk:
+    """
+    Représente un chunk audio capturé.
+    
+    Attributes:
+        data: Données audio brutes (numpy array). En mode 'ring', vue sur le
+              ring buffer valide uniquement pendant l'appel du callback.
+        timestamp: Fin du bloc (epoch du dernier échantillon capturé)
+        sample_rate: Taux d'échantillonnage
+        is_silence: Aucune trame voisée sur aucun canal (renseigné par la VAD de la source)
+        captured_at: Horloge monotone (perf_counter) à la capture, origine du traçage de latence
+        voice: Décisions voisé/non-voisé par canal et par trame (VAD de capture)
+    """
+    data: np.ndarray
+    timestamp: float
+    sample_rate: int
+    is_silence: bool = False
+    captured_at: float = field(default_factory=time.perf_counter)
+    voice: Optional[VoiceActivity] = None
+    
+    def detach(self) -> 'AudioChunk':
+        """
+        Garantit que le chunk possède ses données (copie les vues du ring buffer).
+        À appeler avant de transmettre le chunk hors du callback.
+        
+        Returns:
+            Le chunk lui-même s'il possède déjà ses données, sinon une copie.
+        """
+        if self.data.flags.owndata:
+            return self
+        return AudioChunk(
+            data=self.data.copy(),
+            timestamp=self.timestamp,
+            sample_rate=self.sample_rate,
+            is_silence=self.is_silence,
+            captured_at=self.captured_at,
+            voice=self.voice
+        )
+
+
+class AudioSource(ABC):
+    """
+    Source audio produisant un flux d'AudioChunk multi-canaux.
+    
+    Implémentations:
+        - AudioStreamer: capture live PortAudio (VoiceMeeter)
+        - FileReplaySource: replay WAV/FLAC (temps réel ou aussi vite que possible)
+    """
+    
+    # True si la source est cadencée par le matériel (ne peut pas attendre le consommateur)
+    is_live: bool = True
+    
+    def __init__(self, callback: Optional[Callable[[AudioChunk], None]] = None):
+        """
+        Initialise la source.
+        
+        Args:
+            callback: Fonction appelée pour chaque chunk audio.
+                     Signature: callback(AudioChunk) -> None
+        """
+        self.config = get_config()
+        self.logger = logging.getLogger(type(self).__module__)
+        self.callback = callback
+        self.vad: Optional[VoiceActivityDetector] = None
+        self.vad_threshold = self.config.utterance.vad_threshold
+    
+    @property
+    @abstractmethod
+    def sample_rate(self) -> int:
+        """Fréquence d'échantillonnage des chunks produits."""
+    
+    @abstractmethod
+    def start(self):
+        """Démarre la production de chunks."""
+    
+    @abstractmethod
+    def stop(self):
+        """Arrête la production de chunks."""
+    
+    @abstractmethod
+    def is_running(self) -> bool:
+        """True si la source produit des chunks."""
+    
+    @abstractmethod
+    def get_stats(self) -> dict:
+        """Statistiques de la source."""
+    
+    def publish_metrics(self, registry):
+        """
+        Publie les compteurs de la source dans le registre de métriques.
+        
+        Args:
+            registry: MetricsRegistry (collecteur appelé à chaque lecture)
+        """
+        stats = self.get_stats()
+        registry.counter(
+            "closer_audio_chunks_total", "Chunks audio produits par la source"
+        ).set_total(stats.get("total_chunks", 0))
+    
+    def apply_performance_profile(self, profile):
+        """
+        Applique le seuil de VAD d'un profil de performance (backend 'silero').
+        
+        Args:
+            profile: PerformanceProfile du GPUSelfHealingManager
+        """
+        self.vad_threshold = profile.vad_threshold
+        if self.vad is not None:
+            self.vad.set_threshold(profile.vad_threshold)
+    
+    def prepare_voice_detection(self, sample_rate: Optional[int] = None) -> VoiceActivityDetector:
+        """
+        Crée le détecteur d'activité vocale du backend configuré, si besoin.
+        À appeler avant la capture pour ne pas charger un modèle sur le premier chunk.
+        
+        Args:
+            sample_rate: Fréquence des chunks (défaut: celle de la source)
+        
+        Returns:
+            Détecteur prêt
+        """
+        sample_rate = sample_rate or self.sample_rate
+        if self.vad is None or self.vad.sample_rate != sample_rate:
+            self.vad = create_voice_activity_detector(sample_rate, self.config.utterance)
+            self.vad.set_threshold(self.vad_threshold)
+        return self.vad
+    
+    def _detect_voice(self, chunk: AudioChunk):
+        """
+        Calcule une seule fois l'activité vocale par canal et l'attache au chunk.
+        
+        Args:
+            chunk: Chunk à analyser (voice et is_silence renseignés)
+        """
+        if chunk.voice is not None:
+            return
+        self.prepare_voice_detection(chunk.sample_rate)
+        chunk.voice = self.vad.analyze(chunk.data)
+        chunk.is_silence = not chunk.voice.any_voiced
+    
+    def _emit(self, chunk: AudioChunk):
+        """
+        Transmet un chunk au callback en isolant ses erreurs.
+        
+        Args:
+            chunk: Chunk à transmettre
+        """
+        self._detect_voice(chunk)
+        
+        if self.callback:
+            try:
+                self.callback(chunk)
+            except Exception as e:
+                self.logger.error(f"Error in audio callback: {e}", exc_info=True)
+    
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+        return False
+
+
+class FileReplaySource(AudioSource):
+    """
+    Source de replay d'un fichier enregistré (stéréo VOUS/CLIENT).
+    Produit exactement le même flux d'AudioChunk que la capture live.
+    
+    Modes:
+        - realtime=True: cadencement temps réel (démos, tests de latence)
+        - realtime=False: aussi vite que le consommateur le permet (retraitement en masse),
+          chunks horodatés à l'émission (horloge murale) et non à la position dans le fichier
+    """
+    
+    is_live = False
+    
+    def __init__(
+        self,
+        path: str,
+        callback: Optional[Callable[[AudioChunk], None]] = None,
+        realtime: bool = True,
+        on_complete: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialise le replay.
+        
+        Args:
+            path: Fichier WAV (PCM) ou FLAC (nécessite soundfile)
+            callback: Fonction appelée pour chaque chunk
+            realtime: Cadencer en temps réel (sinon débit maximal)
+            on_complete: Appelé (depuis le thread de replay) en fin de fichier
+        
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+        """
+        super().__init__(callback)
+        
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Replay file not found: {self.path}")
+        
+        self.realtime = realtime
+        self.on_complete = on_complete
+        
+        self._sample_rate, self.channels, self.total_frames = self._probe()
+        self._block_frames = int(self._sample_rate * self.config.audio.chunk_duration)
+        
+        self._thread: Optional[threading.Thread] = None
+        self._is_running = False
+        self._lock = threading.Lock()
+        
+        # Statistiques
+        self._total_chunks = 0
+        self._frames_emitted = 0
+        self._wall_start: Optional[float] = None
+        self._wall_end: Optional[float] = None
+        
+        self.logger.info(
+            f"FileReplaySource initialized - {self.path.name}: "
+            f"{self._sample_rate} Hz, {self.channels} ch, "
+            f"{self.total_frames / self._sample_rate:.1f}s"
+        )
+    
+    @property
+    def sample_rate(self) -> int:
+        """Fréquence d'échantillonnage du fichier."""
+        return self._sample_rate
+    
+    def _probe(self) -> tuple[int, int, int]:
+        """
+        Lit l'en-tête du fichier.
+        
+        Returns:
+            (sample_rate, channels, frames)
+        """
+        if self.path.suffix.lower() == ".wav":
+            with wave.open(str(self.path), "rb") as wav:
+                return wav.getframerate(), wav.getnchannels(), wav.getnframes()
+        
+        soundfile = self._import_soundfile()
+        info = soundfile.info(str(self.path))
+        return info.samplerate, info.channels, info.frames
+    
+    @staticmethod
+    def _import_soundfile():
+        """Import optionnel de soundfile (FLAC et formats non-PCM)."""
+        try:
+            import soundfile
+        except ImportError as e:
+            raise RuntimeError(
+                "soundfile is required to replay non-WAV files (pip install soundfile)"
+            ) from e
+        return soundfile
+    
+    def _read_blocks(self) -> Iterator[np.ndarray]:
+        """
+        Lit le fichier par blocs de la taille d'un chunk live.
+        
+        Yields:
+            Blocs float32 (shape: [frames, channels])
+        """
+        if self.path.suffix.lower() == ".wav":
+            with wave.open(str(self.path), "rb") as wav:
+                width = wav.getsampwidth()
+                while True:
+                    raw = wav.readframes(self._block_frames)
+                    if not raw:
+                        return
+                    yield self._decode_pcm(raw, width, wav.getnchannels())
+        else:
+            soundfile = self._import_soundfile()
+            yield from soundfile.blocks(
+                str(self.path),
+                blocksize=self._block_frames,
+                dtype="float32",
+                always_2d=True
+            )
+    
+    @staticmethod
+    def _decode_pcm(raw: bytes, width: int, channels: int) -> np.ndarray:
+        """
+        Convertit des frames PCM entières en float32 [-1, 1].
+        
+        Args:
+            raw: Octets PCM entrelacés
+            width: Taille d'un échantillon (octets)
+            channels: Nombre de canaux
+        
+        Returns:
+            Tableau float32 (shape: [frames, channels])
+        """
+        if width == 1:
+            data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        elif width == 2:
+            data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+        elif width == 3:
+            bytes_ = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            ints = bytes_[:, 0] | (bytes_[:, 1] << 8) | (bytes_[:, 2] << 16)
+            ints = np.where(ints >= 1 << 23, ints - (1 << 24), ints)
+            data = ints.astype(np.float32) / float(1 << 23)
+        elif width == 4:
+            data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / float(1 << 31)
+        else:
+            raise ValueError(f"Unsupported PCM sample width: {width} bytes")
+        
+        return data.reshape(-1, channels)
+    
+    def _replay_loop(self):
+        """Boucle de replay (thread dédié)."""
+        self.logger.info(f"Replay started ({'realtime' if self.realtime else 'as fast as possible'})")
+        
+        self._wall_start = time.time()
+        
+        try:
+            for block in self._read_blocks():
+                if not self._is_running:
+                    break
+                
+                # Horloge d'échantillons: le timestamp marque la fin du bloc, comme en live
+                end_offset = (self._frames_emitted + len(block)) / self._sample_rate
+                
+                if self.realtime:
+                    delay = self._wall_start + end_offset - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    timestamp = self._wall_start + end_offset
+                else:
+                    # Débit maximal: l'horloge média devance le mur, on horodate à l'émission
+                    # pour garder lag, latences et expirations du contexte cohérents
+                    timestamp = time.time()
+                
+                chunk = AudioChunk(
+                    data=block,
+                    timestamp=timestamp,
+                    sample_rate=self._sample_rate
+                )
+                
+                self._emit(chunk)
+                
+                self._frames_emitted += len(block)
+                self._total_chunks += 1
+                
+        except Exception as e:
+            self.logger.error(f"Error in replay loop: {e}", exc_info=True)
+            
+        finally:
+            self._wall_end = time.time()
+            completed = self._is_running
+            self._is_running = False
+            
+            stats = self.get_stats()
+            self.logger.info(
+                f"Replay finished: {stats['audio_seconds']:.1f}s audio "
+                f"in {stats['wall_seconds']:.1f}s ({stats['speed_factor']:.1f}x realtime)"
+            )
+            
+            if completed and self.on_complete:
+                self.on_complete()
+    
+    def start(self):
+        """
+        Démarre le replay dans un thread dédié.
+        
+        Raises:
+            RuntimeError: Si le replay est déjà en cours.
+        """
+        with self._lock:
+            if self._is_running:
+                raise RuntimeError("FileReplaySource is already running")
+            
+            self._is_running = True
+            self._thread = threading.Thread(
+                target=self._replay_loop,
+                name="FileReplayThread",
+                daemon=True
+            )
+            self._thread.start()
+    
+    def stop(self):
+        """
+        Interrompt le replay et attend la fin du thread.
+        
+        Bloquant: depuis la boucle asyncio, appeler via run_in_executor (le
+        thread de replay attend que la boucle accepte son chunk en cours).
+        """
+        with self._lock:
+            self._is_running = False
+            thread = self._thread
+        
+        # Join hors du verrou: start() et stop() concurrents ne s'attendent pas
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+            if thread.is_alive():
+                self.logger.warning("Replay thread did not stop within 5s")
+    
+    def is_running(self) -> bool:
+        """
+        Vérifie si le replay est en cours.
+        
+        Returns:
+            True si des chunks sont encore produits
+        """
+        return self._is_running
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne les statistiques de replay (débit du pipeline).
+        
+        Returns:
+            Dict avec durée audio, durée murale et facteur de vitesse
+        """
+        audio_seconds = self._frames_emitted / self._sample_rate
+        
+        wall_seconds = 0.0
+        if self._wall_start is not None:
+            wall_seconds = (self._wall_end or time.time()) - self._wall_start
+        
+        return {
+            "is_running": self._is_running,
+            "file": str(self.path),
+            "realtime": self.realtime,
+            "total_chunks": self._total_chunks,
+            "audio_seconds": audio_seconds,
+            "wall_seconds": wall_seconds,
+            "speed_factor": audio_seconds / wall_seconds if wall_seconds > 0 else 0.0,
+            "progress_percent": (self._frames_emitted / max(self.total_frames, 1)) * 100
+        }
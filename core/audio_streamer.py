@@ -1,7 +1,7 @@
 """
 Audio Streamer Module - THE CLOSER PRO.
 Capture audio en continu depuis VoiceMeeter Virtual B1 avec gestion asynchrone.
-Utilise threading et queue.Queue pour garantir zéro perte de paquets.
+Utilise threading et queue.Queue (ou un ring buffer préalloué) pour garantir zéro perte de paquets.
 """
 
 import numpy as np
@@ -11,30 +11,13 @@ import queue
 import time
 import logging
 from typing import Optional, Callable
-from dataclasses import dataclass
 
-from config.manager import get_config
 from core.audio_device_detector import get_audio_detector
+from core.audio_source import AudioSource, AudioChunk
+from core.ring_buffer import AudioRingBuffer
 
 
-@dataclass
-class AudioChunk:
-    """
-    Représente un chunk audio capturé.
-    
-    Attributes:
-        data: Données audio brutes (numpy array)
-        timestamp: Timestamp de capture (epoch)
-        sample_rate: Taux d'échantillonnage
-        is_silence: Indicateur de silence détecté
-    """
-    data: np.ndarray
-    timestamp: float
-    sample_rate: int
-    is_silence: bool = False
-
-
-class AudioStreamer:
+class AudioStreamer(AudioSource):
     """
     Streamer audio temps réel avec buffer thread-safe.
     Capture l'audio en continu sans interruption, même si le consommateur est lent.
@@ -42,6 +25,7 @@ class AudioStreamer:
     Architecture:
         - Thread principal: Callback sounddevice (haute priorité)
         - Queue thread-safe: Buffer FIFO pour découpler capture/traitement
+          (ou ring buffer SPSC préalloué en mode 'ring': une seule copie par callback)
         - Thread consommateur: Traitement asynchrone des chunks
     """
     
@@ -53,11 +37,9 @@ class AudioStreamer:
             callback: Fonction appelée pour chaque chunk audio capturé.
                      Signature: callback(AudioChunk) -> None
         """
-        self.config = get_config()
-        self.logger = logging.getLogger(__name__)
+        super().__init__(callback)
         
         self.audio_queue = queue.Queue(maxsize=self.config.system.max_queue_size)
-        self.callback = callback
         
         self._stream: Optional[sd.InputStream] = None
         self._is_running = False
@@ -66,13 +48,29 @@ class AudioStreamer:
         
         self._total_chunks = 0
         self._dropped_chunks = 0
+        self._overrun_samples = 0
         self._silence_start: Optional[float] = None
         
+        # Mode de capture
+        self._capture_mode = self.config.audio.capture_mode
+        self._dtype = np.dtype(self.config.audio.capture_dtype)
+        self._blocksize = int(self.config.audio.sample_rate * self.config.audio.chunk_duration)
+        self._ring: Optional[AudioRingBuffer] = None
+        
         # Auto-détection et validation du périphérique audio
         self._validated_device_id = None
         self._validated_channels = None
         self._validate_audio_device()
         
+        if self._capture_mode == "ring":
+            # Capacité multiple du blocksize: les blocs ne rebouclent jamais
+            blocks = max(2, int(self.config.audio.ring_buffer_duration / self.config.audio.chunk_duration))
+            self._ring = AudioRingBuffer(
+                capacity_frames=blocks * self._blocksize,
+                channels=self._validated_channels,
+                dtype=self._dtype
+            )
+        
         self.logger.info(f"AudioStreamer initialized - Device ID: {self._validated_device_id}")
     
     def _validate_audio_device(self):
@@ -152,16 +150,18 @@ class AudioStreamer:
         if not self._is_running:
             return
         
-        audio_copy = indata.copy()
+        if self._ring is not None:
+            # Mode ring: une seule copie mémoire, tout le reste côté consommateur
+            self._ring.write(indata)
+            return
         
-        rms = np.sqrt(np.mean(audio_copy**2))
-        is_silence = rms < self.config.audio.silence_threshold
+        audio_copy = indata.copy()
         
+        # Callback appelé bloc complet: maintenant ≈ fin du bloc
         chunk = AudioChunk(
             data=audio_copy,
             timestamp=time.time(),
-            sample_rate=self.config.audio.sample_rate,
-            is_silence=is_silence
+            sample_rate=self.config.audio.sample_rate
         )
         
         try:
@@ -169,12 +169,33 @@ class AudioStreamer:
             self._total_chunks += 1
         except queue.Full:
             self._dropped_chunks += 1
+            self._overrun_samples += frames
             if self._dropped_chunks % 10 == 0:
                 self.logger.error(
                     f"Audio queue full! Dropped {self._dropped_chunks} chunks. "
                     f"Consumer too slow or queue size too small."
                 )
     
+    def _dispatch_chunk(self, chunk: AudioChunk):
+        """
+        Suivi du silence prolongé puis transmission au callback.
+        
+        Args:
+            chunk: Chunk audio à transmettre
+        """
+        # VAD hors du callback PortAudio, une fois par chunk
+        self._detect_voice(chunk)
+        
+        if chunk.is_silence:
+            if self._silence_start is None:
+                self._silence_start = chunk.timestamp
+            elif (chunk.timestamp - self._silence_start) > self.config.audio.silence_duration:
+                self.logger.debug("Silence prolongé détecté - Opportunité de nettoyage GPU")
+        else:
+            self._silence_start = None
+        
+        self._emit(chunk)
+    
     def _consumer_loop(self):
         """
         Boucle de consommation des chunks audio.
@@ -182,23 +203,16 @@ class AudioStreamer:
         """
         self.logger.info("Audio consumer thread started")
         
+        if self._ring is not None:
+            self._ring_consumer_loop()
+            self.logger.info("Audio consumer thread stopped")
+            return
+        
         while self._is_running:
             try:
                 chunk = self.audio_queue.get(timeout=0.1)
                 
-                if chunk.is_silence:
-                    if self._silence_start is None:
-                        self._silence_start = chunk.timestamp
-                    elif (chunk.timestamp - self._silence_start) > self.config.audio.silence_duration:
-                        self.logger.debug("Silence prolongé détecté - Opportunité de nettoyage GPU")
-                else:
-                    self._silence_start = None
-                
-                if self.callback:
-                    try:
-                        self.callback(chunk)
-                    except Exception as e:
-                        self.logger.error(f"Error in audio callback: {e}", exc_info=True)
+                self._dispatch_chunk(chunk)
                 
                 self.audio_queue.task_done()
                 
@@ -209,6 +223,38 @@ class AudioStreamer:
         
         self.logger.info("Audio consumer thread stopped")
     
+    def _ring_consumer_loop(self):
+        """
+        Boucle de consommation du ring buffer.
+        Les chunks transmis sont des vues zéro-copie, libérées après le callback.
+        """
+        sample_rate = self.config.audio.sample_rate
+        poll_interval = min(0.01, self.config.audio.chunk_duration / 4)
+        
+        while self._is_running:
+            try:
+                available = self._ring.available()
+                if available < self._blocksize:
+                    time.sleep(poll_interval)
+                    continue
+                
+                block = self._ring.read_block(self._blocksize)
+                
+                # Fin du bloc ≈ maintenant moins le retard restant dans le buffer
+                chunk = AudioChunk(
+                    data=block,
+                    timestamp=time.time() - (available - self._blocksize) / sample_rate,
+                    sample_rate=sample_rate
+                )
+                
+                self._dispatch_chunk(chunk)
+                
+                self._ring.advance(self._blocksize)
+                self._total_chunks += 1
+                
+            except Exception as e:
+                self.logger.error(f"Error in ring consumer loop: {e}", exc_info=True)
+    
     def start(self):
         """
         Démarre la capture audio et le thread de consommation.
@@ -229,11 +275,14 @@ class AudioStreamer:
                     device=self._validated_device_id,
                     channels=self._validated_channels,
                     samplerate=self.config.audio.sample_rate,
-                    blocksize=int(self.config.audio.sample_rate * self.config.audio.chunk_duration),
+                    blocksize=self._blocksize,
                     callback=self._audio_callback,
-                    dtype=np.float32
+                    dtype=self._dtype.name
                 )
                 
+                if self._ring is not None:
+                    self._ring.reset()
+                
                 self._is_running = True
                 
                 self._consumer_thread = threading.Thread(
@@ -250,7 +299,8 @@ class AudioStreamer:
                     f"  Device: {self._validated_device_id}\n"
                     f"  Sample Rate: {self.config.audio.sample_rate} Hz\n"
                     f"  Channels: {self._validated_channels}\n"
-                    f"  Chunk Duration: {self.config.audio.chunk_duration}s"
+                    f"  Chunk Duration: {self.config.audio.chunk_duration}s\n"
+                    f"  Capture Mode: {self._capture_mode} ({self._dtype.name})"
                 )
                 
             except Exception as e:
@@ -286,13 +336,19 @@ class AudioStreamer:
             except queue.Empty:
                 pass
             
+            stats = self.get_stats()
             self.logger.info(
                 f"Audio streamer stopped\n"
                 f"  Total chunks: {self._total_chunks}\n"
-                f"  Dropped chunks: {self._dropped_chunks}\n"
-                f"  Loss rate: {(self._dropped_chunks / max(self._total_chunks, 1)) * 100:.2f}%"
+                f"  Overrun samples: {stats['overrun_samples']}\n"
+                f"  Loss rate: {stats['loss_rate_percent']:.2f}%"
             )
     
+    @property
+    def sample_rate(self) -> int:
+        """Fréquence d'échantillonnage de la capture."""
+        return self.config.audio.sample_rate
+    
     def is_running(self) -> bool:
         """
         Vérifie si le streamer est en cours d'exécution.
@@ -309,23 +365,57 @@ class AudioStreamer:
         Returns:
             Dictionnaire contenant les métriques de performance.
         """
+        overrun = self.get_overrun_samples()
+        captured = self._total_chunks * self._blocksize
+        
+        if self._ring is not None:
+            backlog = self._ring.available()
+        else:
+            backlog = self.audio_queue.qsize() * self._blocksize
+        
         return {
             "is_running": self._is_running,
+            "capture_mode": self._capture_mode,
             "total_chunks": self._total_chunks,
             "dropped_chunks": self._dropped_chunks,
+            "overrun_samples": overrun,
+            "overrun_seconds": overrun / self.config.audio.sample_rate,
             "queue_size": self.audio_queue.qsize(),
-            "loss_rate_percent": (self._dropped_chunks / max(self._total_chunks, 1)) * 100
+            "backlog_samples": backlog,
+            "loss_rate_percent": (overrun / max(captured + overrun, 1)) * 100
         }
     
-    def __enter__(self):
-        """Context manager entry."""
-        self.start()
-        return self
+    def publish_metrics(self, registry):
+        """
+        Publie les métriques de capture (chunks perdus, overrun, backlog).
+        
+        Args:
+            registry: MetricsRegistry
+        """
+        stats = self.get_stats()
+        registry.counter(
+            "closer_audio_chunks_total", "Chunks audio produits par la source"
+        ).set_total(stats["total_chunks"])
+        registry.counter(
+            "closer_audio_dropped_chunks_total", "Chunks perdus (queue de capture pleine)"
+        ).set_total(stats["dropped_chunks"])
+        registry.counter(
+            "closer_audio_overrun_samples_total", "Échantillons perdus par overrun"
+        ).set_total(stats["overrun_samples"])
+        registry.gauge(
+            "closer_audio_backlog_samples", "Échantillons capturés en attente de lecture"
+        ).set(stats["backlog_samples"])
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        self.stop()
-        return False
+    def get_overrun_samples(self) -> int:
+        """
+        Retourne le nombre exact d'échantillons (frames) perdus par overrun.
+        
+        Returns:
+            Frames perdues depuis le démarrage
+        """
+        if self._ring is not None:
+            return self._ring.overrun_frames
+        return self._overrun_samples
 
 
 def list_audio_devices():
@@ -0,0 +1,162 @@
+"""
+THE CLOSER PRO V25 - Backpressure
+Queues de canal à budget de latence: au lieu de bloquer le producteur (et
+d'empiler les soumissions du thread audio), une queue en retard déleste
+selon une politique explicite. Le délestage et le retard observé par canal
+alimentent le signal de charge du GPUSelfHealingManager.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from config.manager import BackpressureConfig
+
+# Politiques de délestage
+POLICIES = ("block", "drop_oldest", "coalesce_silence")
+
+
+def _is_silent(stream) -> bool:
+    """True si la VAD de capture n'a trouvé aucune trame voisée dans le chunk."""
+    return stream.voiced is not None and not stream.voiced.any()
+
+
+class StreamQueue(asyncio.Queue):
+    """
+    Queue bornée d'un canal, avec échéance par chunk (arrivée + latency_budget).
+    
+    Politiques (offer):
+    - block: aucune perte, le producteur attend (put), comportement historique
+    - drop_oldest: les chunks dont l'échéance est dépassée sont jetés, du plus
+      ancien au plus récent
+    - coalesce_silence: en retard, les plages de silence en attente sont
+      d'abord réduites à ce qu'il faut pour clore un énoncé (hangover); s'il
+      reste du retard, les plus anciens chunks sont jetés
+    
+    Une queue pleine jette toujours son plus ancien chunk (hors 'block').
+    """
+    
+    def __init__(self, maxsize: int = 0, config: Optional[BackpressureConfig] = None, hangover: float = 0.6):
+        """
+        Initialise la queue.
+        
+        Args:
+            maxsize: Capacité (chunks)
+            config: Politique et budget de latence
+            hangover: Silence nécessaire à l'assembleur pour clore un énoncé (secondes)
+        """
+        super().__init__(maxsize=maxsize)
+        self.config = config or BackpressureConfig()
+        self.hangover = hangover
+        
+        self.shed_chunks = 0
+        self.shed_seconds = 0.0
+        self.shed_silence_seconds = 0.0
+        self.max_lag = 0.0
+    
+    def _get(self):
+        """Retire le plus ancien chunk et mesure son attente."""
+        stream = super()._get()
+        if stream.enqueued_at:
+            self.max_lag = max(self.max_lag, time.perf_counter() - stream.enqueued_at)
+        return stream
+    
+    def head_age(self, now: Optional[float] = None) -> float:
+        """
+        Attente du plus ancien chunk en queue.
+        
+        Appelable hors de la boucle (collecte des métriques): la boucle peut
+        dépiler ou remplacer _queue pendant la lecture, d'où la référence locale.
+        
+        Args:
+            now: Horloge perf_counter (défaut: maintenant)
+        
+        Returns:
+            Secondes (0 si la queue est vide)
+        """
+        now = time.perf_counter() if now is None else now
+        queue = self._queue
+        try:
+            return now - queue[0].enqueued_at if queue else 0.0
+        except IndexError:
+            return 0.0
+    
+    @property
+    def pressure(self) -> float:
+        """Attente du plus ancien chunk rapportée au budget (>= 1: délestage)."""
+        return self.head_age() / self.config.latency_budget
+    
+    def offer(self, stream) -> float:
+        """
+        Enfile un chunk sans jamais attendre, en délestant selon la politique.
+        
+        Args:
+            stream: AudioStream à enfiler
+        
+        Returns:
+            Secondes d'audio délestées par cet appel
+        """
+        now = time.perf_counter()
+        stream.enqueued_at = now
+        shed = 0.0
+        
+        deadline = now - self.config.latency_budget
+        if self._queue and self._queue[0].enqueued_at < deadline:
+            if self.config.policy == "coalesce_silence":
+                shed += self._coalesce_silence()
+            while self._queue and self._queue[0].enqueued_at < deadline:
+                shed += self._drop(self._queue.popleft())
+        
+        if self.full():
+            shed += self._drop(self._queue.popleft())
+        
+        self.put_nowait(stream)
+        return shed
+    
+    def _coalesce_silence(self) -> float:
+        """Réduit chaque plage de chunks silencieux en attente au hangover de l'assembleur."""
+        kept = deque()
+        run = 0
+        shed = 0.0
+        for stream in self._queue:
+            if not _is_silent(stream):
+                run = 0
+                kept.append(stream)
+                continue
+            run += 1
+            if run <= max(1, math.ceil(self.hangover / max(stream.duration, 1e-3))):
+                kept.append(stream)
+            else:
+                shed += self._drop(stream)
+        self._queue = kept
+        return shed
+    
+    def _drop(self, stream) -> float:
+        """Comptabilise un chunk jeté (et le marque traité pour join())."""
+        self.shed_chunks += 1
+        self.shed_seconds += stream.duration
+        if _is_silent(stream):
+            self.shed_silence_seconds += stream.duration
+        self.task_done()
+        return stream.duration
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne les compteurs de délestage de la queue.
+        
+        Returns:
+            Dict avec chunks et secondes délestés (dont silence), retard max et pression
+        """
+        return {
+            "policy": self.config.policy,
+            "shed_chunks": self.shed_chunks,
+            "shed_seconds": self.shed_seconds,
+            "shed_silence_seconds": self.shed_silence_seconds,
+            "max_lag_seconds": self.max_lag,
+            "pressure": self.pressure
+        }
@@ -0,0 +1,195 @@
+"""
+THE CLOSER PRO V25 - Bleed Suppressor
+Détection de diaphonie entre canaux: quand un canal n'est qu'une copie
+retardée et atténuée d'un autre (micro du closer qui fuit dans le canal
+client, périphérique mono dupliqué), le canal le plus faible est marqué non
+voisé avant l'assemblage. La même phrase n'est plus décodée deux fois.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.manager import BleedConfig
+
+CHANNELS = ("LEFT", "RIGHT")
+
+
+@dataclass
+class BleedDecision:
+    """Résultat de l'analyse d'un chunk multi-canaux."""
+    suppressed: Tuple[int, ...] = ()  # Index des canaux écartés
+    correlation: Optional[np.ndarray] = None  # Pic de corrélation normalisée [canaux, canaux]
+    level_db: Optional[np.ndarray] = None  # Niveau du canal i - niveau du canal j (dB)
+    lag_ms: Optional[np.ndarray] = None  # Retard du canal j sur le canal i au pic (ms)
+
+
+@dataclass
+class _Hold:
+    """Suppression maintenue d'un canal, copie d'un canal source."""
+    source: int
+    remaining: float = 0.0
+
+
+class BleedSuppressor:
+    """
+    Corrélation croisée normalisée (FFT, toutes les paires de canaux en une
+    passe) sur ±max_lag, puis écart de niveau, pour chaque paire active:
+    
+    - corrélation >= duplicate_correlation et niveaux proches: copie à
+      l'identique (mono dupliqué), le canal d'index le plus élevé est écarté
+      (VOUS, canal 0, est toujours conservé)
+    - corrélation >= min_correlation et écart >= min_attenuation_db: le canal
+      le plus faible est une fuite de l'autre
+    
+    En double parole, la voix propre du canal faible décorrèle les deux
+    signaux: rien n'est supprimé. Une détection est maintenue hold_duration
+    tant que le canal écarté reste le plus faible et partiellement corrélé.
+    """
+    
+    def __init__(
+        self,
+        sample_rate: int,
+        config: Optional[BleedConfig] = None,
+        channels: Sequence[str] = CHANNELS
+    ):
+        """
+        Initialise le détecteur.
+        
+        Args:
+            sample_rate: Fréquence des canaux analysés (après rééchantillonnage)
+            config: Seuils de détection
+            channels: Noms des canaux (statistiques)
+        """
+        self.sample_rate = sample_rate
+        self.config = config or BleedConfig()
+        self.channels = tuple(channels)
+        self.max_lag = int(sample_rate * self.config.max_lag_ms / 1000)
+        
+        # Paires (i < j) analysées à chaque chunk
+        self._pairs = np.triu_indices(len(self.channels), k=1)
+        self._holds: Dict[int, _Hold] = {}
+        
+        self.chunks_checked = 0
+        self.chunks_suppressed = 0
+        self.suppressed_seconds = [0.0] * len(self.channels)
+    
+    def analyze(self, audio: np.ndarray) -> BleedDecision:
+        """
+        Mesure la corrélation et l'écart de niveau de chaque paire de canaux.
+        
+        Args:
+            audio: Audio float32 [échantillons, canaux]
+        
+        Returns:
+            BleedDecision sans canal écarté (la décision est prise par check)
+        """
+        samples, count = audio.shape
+        correlation = np.zeros((count, count))
+        level_db = np.zeros((count, count))
+        lag_ms = np.zeros((count, count))
+        
+        centered = (audio - audio.mean(axis=0)).T  # [canaux, échantillons]
+        energy = np.maximum(np.einsum("ij,ij->i", centered, centered), 1e-12)
+        first, second = self._pairs
+        if samples <= self.max_lag or not len(first):
+            return BleedDecision((), correlation, level_db, lag_ms)
+        
+        size = 1 << (samples + self.max_lag - 1).bit_length()
+        spectra = np.fft.rfft(centered, n=size, axis=1)
+        xcorr = np.fft.irfft(spectra[first] * np.conj(spectra[second]), n=size, axis=1)
+        
+        # Décalages -max_lag..+max_lag (indice négatif: le second canal en retard)
+        if self.max_lag:
+            window = np.concatenate((xcorr[:, -self.max_lag:], xcorr[:, :self.max_lag + 1]), axis=1)
+        else:
+            window = xcorr[:, :1]
+        peaks = np.argmax(np.abs(window), axis=1)
+        pair_correlation = np.abs(window[np.arange(len(peaks)), peaks]) / np.sqrt(energy[first] * energy[second])
+        pair_level = 10 * np.log10(energy[first] / energy[second])
+        pair_lag = (self.max_lag - peaks) * 1000 / self.sample_rate
+        
+        correlation[first, second] = correlation[second, first] = pair_correlation
+        level_db[first, second] = pair_level
+        level_db[second, first] = -pair_level
+        lag_ms[first, second] = pair_lag
+        lag_ms[second, first] = -pair_lag
+        return BleedDecision((), correlation, level_db, lag_ms)
+    
+    def check(self, audio: np.ndarray, active: Optional[np.ndarray] = None) -> BleedDecision:
+        """
+        Décide quels canaux du chunk doivent être écartés et tient les compteurs.
+        
+        Args:
+            audio: Audio float32 [échantillons, canaux]
+            active: Canaux portant de l'activité (défaut: tous); seules les paires actives comptent
+        
+        Returns:
+            BleedDecision avec les canaux écartés
+        """
+        duration = audio.shape[0] / self.sample_rate
+        active = np.ones(audio.shape[1], dtype=bool) if active is None else np.asarray(active, dtype=bool)
+        if not self.config.enabled or active.sum() < 2:
+            self._age_holds(duration)
+            return BleedDecision()
+        
+        decision = self.analyze(audio)
+        self.chunks_checked += 1
+        
+        config = self.config
+        correlation, level_db = decision.correlation, decision.level_db
+        detected: Dict[int, int] = {}  # canal écarté -> canal source
+        for i, j in zip(*(index.tolist() for index in self._pairs)):
+            if not (active[i] and active[j]):
+                continue
+            if correlation[i, j] >= config.duplicate_correlation and abs(level_db[i, j]) < config.min_attenuation_db:
+                detected.setdefault(j, i)
+            elif correlation[i, j] >= config.min_correlation and abs(level_db[i, j]) >= config.min_attenuation_db:
+                weaker, source = (j, i) if level_db[i, j] > 0 else (i, j)
+                detected.setdefault(weaker, source)
+        
+        # Maintien tant que le canal écarté reste le plus faible et encore corrélé
+        # (la double parole décorrèle franchement: elle n'est jamais maintenue)
+        suppressed: Dict[int, int] = {}
+        for index, hold in self._holds.items():
+            if hold.remaining <= 0 or not (active[index] and active[hold.source]):
+                continue
+            if level_db[index, hold.source] < 0 and correlation[index, hold.source] >= config.min_correlation / 2:
+                suppressed[index] = hold.source
+        
+        # Seule une nouvelle détection relance le maintien
+        self._age_holds(duration)
+        for index, source in detected.items():
+            self._holds[index] = _Hold(source, config.hold_duration)
+        suppressed.update(detected)
+        
+        for index in suppressed:
+            self.suppressed_seconds[index] += duration
+        if suppressed:
+            self.chunks_suppressed += 1
+        
+        decision.suppressed = tuple(sorted(suppressed))
+        return decision
+    
+    def _age_holds(self, duration: float):
+        """Fait expirer les maintiens de suppression."""
+        for hold in self._holds.values():
+            hold.remaining -= duration
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne les compteurs de suppression.
+        
+        Returns:
+            Dict avec chunks analysés/supprimés et secondes écartées par canal
+        """
+        return {
+            "enabled": self.config.enabled,
+            "chunks_checked": self.chunks_checked,
+            "chunks_suppressed": self.chunks_suppressed,
+            "suppressed_seconds": dict(zip(self.channels, self.suppressed_seconds))
+        }
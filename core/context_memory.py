@@ -1,19 +1,159 @@
 """
 THE CLOSER PRO V25 - Context Memory Engine
 Buffer de contexte intelligent pour améliorer la cohérence des transcriptions.
-Maintient 30 secondes de contexte pour noms propres, prix, marques.
+Maintient 30 secondes de contexte, et les noms propres, prix et marques
+récurrents de l'appel dans un stockage borné à décroissance temporelle.
+Le prompt de chaque locuteur est mis en cache (texte et tokens) et tient
+dans le budget de tokens du prompt Whisper. Les statistiques par locuteur
+sont tenues à jour à l'insertion et à l'éviction des segments.
 
 Author: THE CLOSER PRO Team
 Version: 2.5.0 (Elite)
 """
 
+import math
 import numpy as np
 from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 
+from core.text_annotation import AnnotatedSegment, annotate
+
+
+# Catégories d'entités mémorisées
+ENTITY_CATEGORIES = ("names", "prices", "brands", "numbers")
+
+# Exposant au-delà duquel les scores sont ramenés au repère courant (exp(50) ~ 5e21)
+RESCALE_EXPONENT = 50.0
+
+# Tokens de prompt conservés par Whisper (max_length // 2 - 1): au-delà, le début est coupé
+WHISPER_PROMPT_TOKENS = 223
+
+EMPTY_PROMPT = "Transcription en français uniquement. Ne pas traduire."
+BASE_PROMPT = "Transcription en français uniquement. Ne pas traduire. Conversation de vente."
+
+
+@dataclass
+class EntityStat:
+    """Entité mémorisée et son score de fréquence récente."""
+    value: str
+    score: float  # Somme des poids exp((t - repère) / tau) de ses occurrences
+    count: int
+    last_seen: float  # Horodatage de la dernière occurrence (secondes)
+
+
+class EntityStore:
+    """
+    Entités d'une catégorie, bornées et classées par fréquence récente.
+    
+    Décroissance "forward": chaque occurrence pèse exp((t - repère) / tau),
+    le score d'une entité est la somme de ses poids. Les scores des autres
+    entités n'ont pas à être vieillis (mise à jour O(1)), et l'ordre est celui
+    d'une décroissance exponentielle de demi-vie half_life: une entité citée
+    souvent reste devant, une entité citée il y a longtemps s'efface.
+    Pleine, la catégorie évince l'entité de plus faible score.
+    """
+    
+    def __init__(self, capacity: int = 32, half_life: float = 300.0):
+        """
+        Initialise le stockage.
+        
+        Args:
+            capacity: Nombre maximal d'entités conservées
+            half_life: Durée au bout de laquelle une occurrence compte moitié moins (secondes)
+        """
+        self.capacity = capacity
+        self.half_life = half_life
+        self._tau = half_life / math.log(2)
+        self._entries: Dict[str, EntityStat] = {}
+        self._landmark: Optional[float] = None
+        self._ranked: Optional[List[EntityStat]] = None  # Classement mis en cache jusqu'à la prochaine occurrence
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        """Nombre d'entités conservées."""
+        return len(self._entries)
+    
+    def add(self, value: str, now: float):
+        """
+        Enregistre une occurrence.
+        
+        Args:
+            value: Entité
+            now: Horodatage de l'occurrence (secondes)
+        """
+        if self._landmark is None:
+            self._landmark = now
+        exponent = (now - self._landmark) / self._tau
+        if exponent > RESCALE_EXPONENT:
+            self._rescale(now)
+            exponent = 0.0
+        weight = math.exp(exponent)
+        
+        entry = self._entries.get(value)
+        if entry is None:
+            if len(self._entries) >= self.capacity:
+                self._evict()
+            self._entries[value] = EntityStat(value, weight, 1, now)
+        else:
+            entry.score += weight
+            entry.count += 1
+            entry.last_seen = max(entry.last_seen, now)
+        self._ranked = None
+    
+    def top(self, k: Optional[int] = None) -> List[str]:
+        """
+        Entités les mieux classées.
+        
+        Args:
+            k: Nombre d'entités (défaut: toutes)
+        
+        Returns:
+            Entités, de la plus fréquente récemment à la moins fréquente
+        """
+        if self._ranked is None:
+            self._ranked = sorted(self._entries.values(), key=lambda entry: (-entry.score, -entry.last_seen))
+        ranked = self._ranked if k is None else self._ranked[:k]
+        return [entry.value for entry in ranked]
+    
+    def clear(self):
+        """Oublie toutes les entités."""
+        self._entries.clear()
+        self._landmark = None
+        self._ranked = None
+    
+    def _evict(self):
+        """Retire l'entité de plus faible score (la plus ancienne à égalité)."""
+        weakest = min(self._entries.values(), key=lambda entry: (entry.score, entry.last_seen))
+        del self._entries[weakest.value]
+        self.evictions += 1
+    
+    def _rescale(self, now: float):
+        """Ramène les scores au repère `now` (évite le dépassement de exp)."""
+        factor = math.exp(-(now - self._landmark) / self._tau)
+        for entry in self._entries.values():
+            entry.score *= factor
+        self._landmark = now
+
+
+@dataclass(frozen=True)
+class ContextPrompt:
+    """Prompt de contexte d'un locuteur, partagé tant qu'il reste valide."""
+    text: str
+    tokens: Optional[Tuple[int, ...]] = None  # Ids Whisper (None sans tokenizer), dans le budget
+    valid_until: Optional[datetime] = None  # Expiration du plus ancien segment cité
+
+
+@dataclass
+class SpeakerAggregate:
+    """Agrégats d'un locuteur sur les segments de la fenêtre."""
+    count: int = 0
+    duration: float = 0.0
+    last_activity: Optional[datetime] = None  # Dernier segment reçu (conservé après éviction)
+
 
 @dataclass
 class ContextSegment:
@@ -35,7 +175,10 @@ class ContextMemory:
         self,
         context_window_seconds: float = 30.0,
         max_segments: int = 50,
-        sample_rate: int = 16000
+        sample_rate: int = 16000,
+        entity_capacity: int = 32,
+        entity_half_life: float = 300.0,
+        max_prompt_tokens: int = WHISPER_PROMPT_TOKENS
     ):
         """
         Initialise le moteur de contexte.
@@ -44,26 +187,41 @@ class ContextMemory:
             context_window_seconds: Durée de la fenêtre de contexte
             max_segments: Nombre maximum de segments en mémoire
             sample_rate: Fréquence d'échantillonnage pour l'audio
+            entity_capacity: Nombre maximal d'entités mémorisées par catégorie
+            entity_half_life: Demi-vie du score des entités (secondes)
+            max_prompt_tokens: Budget de tokens du prompt de contexte
         """
         self.context_window = timedelta(seconds=context_window_seconds)
         self.max_segments = max_segments
         self.sample_rate = sample_rate
         
-        # Buffer circulaire pour les segments texte
-        self.text_buffer: deque[ContextSegment] = deque(maxlen=max_segments)
+        # Segments texte triés par timestamp (les énoncés des canaux peuvent finir dans le désordre)
+        self.text_buffer: deque[ContextSegment] = deque()
+        
+        # Agrégats par locuteur, tenus à l'insertion et à l'éviction
+        self.speakers: Dict[str, SpeakerAggregate] = {}
+        self._next_expiry: Optional[datetime] = None  # Sortie de fenêtre du plus ancien segment
         
         # Buffer audio pour reconstitution
         self.audio_buffer: deque[np.ndarray] = deque(maxlen=10)
         
         self.logger = logging.getLogger(__name__)
         
-        # Dictionnaire d'entités détectées (noms, prix, marques)
-        self.entities = {
-            "names": set(),
-            "prices": set(),
-            "brands": set(),
-            "numbers": set()
+        # Entités détectées (noms, prix, marques), bornées et classées par fréquence récente
+        self.entities: Dict[str, EntityStore] = {
+            category: EntityStore(entity_capacity, entity_half_life) for category in ENTITY_CATEGORIES
         }
+        
+        # Prompt par locuteur, reconstruit après add_segment (ou expiration d'un segment cité)
+        self.max_prompt_tokens = max_prompt_tokens
+        self._encode: Optional[Callable[[str], List[int]]] = None
+        self._prompts: Dict[Optional[str], ContextPrompt] = {}
+        self.prompt_requests = 0
+        self.prompt_hits = 0
+        self.prompt_builds = 0
+        self.prompt_truncations = 0
+        self._prompt_tokens_total = 0
+        self.max_prompt_length = 0
     
     def add_segment(
         self,
@@ -94,52 +252,109 @@ class ContextMemory:
             duration=duration
         )
         
-        self.text_buffer.append(segment)
+        # Insertion à sa place dans l'ordre temporel (en fin de buffer dans le cas courant)
+        index = len(self.text_buffer)
+        while index and self.text_buffer[index - 1].timestamp > timestamp:
+            index -= 1
+        self.text_buffer.insert(index, segment)
+        
+        stats = self.speakers.setdefault(speaker, SpeakerAggregate())
+        stats.count += 1
+        stats.duration += duration
+        if stats.last_activity is None or timestamp > stats.last_activity:
+            stats.last_activity = timestamp
+        
+        if len(self.text_buffer) > self.max_segments:
+            self._evict_oldest()
+        self._next_expiry = self.text_buffer[0].timestamp + self.context_window
+        self._prompts.clear()
         
         # Extraire les entités du texte
-        self._extract_entities(text)
+        self._extract_entities(annotate(text), timestamp.timestamp())
         
         # Nettoyer les segments trop anciens
         self._cleanup_old_segments()
     
-    def _cleanup_old_segments(self):
-        """Supprime les segments hors de la fenêtre temporelle."""
-        if not self.text_buffer:
+    def _cleanup_old_segments(self, now: Optional[datetime] = None):
+        """
+        Supprime les segments hors de la fenêtre temporelle.
+        
+        Sans effet (une comparaison) tant que le plus ancien segment n'a pas expiré.
+        
+        Args:
+            now: Instant de référence (défaut: maintenant)
+        """
+        if self._next_expiry is None:
             return
         
-        cutoff_time = datetime.now() - self.context_window
+        now = now or datetime.now()
+        if now <= self._next_expiry:
+            return
         
         # Retirer les segments trop anciens
+        cutoff_time = now - self.context_window
         while self.text_buffer and self.text_buffer[0].timestamp < cutoff_time:
-            self.text_buffer.popleft()
+            self._evict_oldest()
+        self._next_expiry = self.text_buffer[0].timestamp + self.context_window if self.text_buffer else None
     
-    def _extract_entities(self, text: str):
+    def _evict_oldest(self):
+        """Retire le plus ancien segment et le décompte de son locuteur."""
+        segment = self.text_buffer.popleft()
+        stats = self.speakers[segment.speaker]
+        stats.count -= 1
+        # Dernier segment du locuteur: repartir de zéro plutôt que d'accumuler l'erreur flottante
+        stats.duration = stats.duration - segment.duration if stats.count else 0.0
+    
+    def _extract_entities(self, segment: AnnotatedSegment, now: float):
         """
         Extrait les entités importantes du texte (noms, prix, marques).
         
         Args:
-            text: Texte à analyser
-        """
-        words = text.split()
-        
-        for i, word in enumerate(words):
-            # Détection de prix (€, $, euros, dollars)
-            if any(currency in word.lower() for currency in ['€', '$', 'euro', 'dollar']):
-                # Chercher le nombre associé
-                for j in range(max(0, i-2), min(len(words), i+3)):
-                    if words[j].replace(',', '').replace('.', '').isdigit():
-                        self.entities["prices"].add(f"{words[j]} {word}")
-            
-            # Détection de nombres importants
-            clean_word = word.replace(',', '').replace('.', '')
-            if clean_word.isdigit() and len(clean_word) >= 3:
-                self.entities["numbers"].add(word)
-            
-            # Détection de mots capitalisés (noms propres potentiels)
-            if word and word[0].isupper() and len(word) > 2:
-                # Éviter les débuts de phrase
-                if i > 0 and not words[i-1].endswith('.'):
-                    self.entities["names"].add(word)
+            segment: Texte annoté
+            now: Horodatage du segment (secondes)
+        """
+        tokens = segment.tokens
+        
+        # Détection de prix (€, $, euros, dollars): nombre dans les 2 mots autour de la devise
+        for i in segment.currency_tokens:
+            for j in range(max(0, i-2), min(len(tokens), i+3)):
+                if tokens[j].is_number:
+                    self.entities["prices"].add(f"{tokens[j].text} {tokens[i].text}", now)
+        
+        # Détection de nombres importants
+        for token in tokens:
+            if token.is_number and len(token.clean) >= 3:
+                self.entities["numbers"].add(token.text, now)
+        
+        # Détection de mots capitalisés (noms propres potentiels, hors débuts de phrase)
+        for name in segment.names:
+            self.entities["names"].add(name, now)
+    
+    def set_tokenizer(self, encode: Optional[Callable[[str], List[int]]]):
+        """
+        Branche le tokenizer du modèle: les prompts portent alors leurs ids
+        et respectent max_prompt_tokens. Sans tokenizer, le prompt reste du
+        texte et le budget n'est pas appliqué (Whisper coupe alors le début).
+        
+        Args:
+            encode: Texte -> ids Whisper, sans tokens spéciaux (None: texte seul)
+        """
+        self._encode = encode
+        self._prompts.clear()
+    
+    def encode(self, text: str) -> Optional[Tuple[int, ...]]:
+        """
+        Encode un texte comme faster-whisper encode un initial_prompt.
+        
+        Args:
+            text: Texte du prompt
+        
+        Returns:
+            Ids Whisper, ou None sans tokenizer
+        """
+        if self._encode is None:
+            return None
+        return tuple(self._encode(" " + text.strip()))
     
     def get_context_prompt(self, speaker: Optional[str] = None) -> str:
         """
@@ -151,13 +366,54 @@ class ContextMemory:
         Returns:
             Prompt de contexte enrichi
         """
-        self._cleanup_old_segments()
+        return self.get_prompt(speaker).text
+    
+    def get_prompt(self, speaker: Optional[str] = None) -> ContextPrompt:
+        """
+        Prompt de contexte en cache (texte et ids), reconstruit seulement
+        après un add_segment ou l'expiration d'un segment cité.
+        
+        Args:
+            speaker: Filtrer par locuteur (optionnel)
+        
+        Returns:
+            ContextPrompt
+        """
+        self.prompt_requests += 1
+        now = datetime.now()
+        prompt = self._prompts.get(speaker)
+        if prompt is not None and (prompt.valid_until is None or now < prompt.valid_until):
+            self.prompt_hits += 1
+            return prompt
+        
+        prompt = self._build_prompt(speaker, now)
+        self._prompts[speaker] = prompt
+        return prompt
+    
+    def _build_prompt(self, speaker: Optional[str], now: datetime) -> ContextPrompt:
+        """
+        Construit le prompt d'un locuteur dans le budget de tokens.
+        
+        Whisper ne garde que la fin d'un prompt trop long, ce qui couperait la
+        consigne et les entités: ce sont les phrases récentes, de la plus
+        ancienne à la plus récente, qui cèdent leur place.
+        
+        Args:
+            speaker: Filtrer par locuteur (optionnel)
+            now: Instant de la demande
+        
+        Returns:
+            ContextPrompt
+        """
+        self._cleanup_old_segments(now)
+        self.prompt_builds += 1
         
         if not self.text_buffer:
-            return "Transcription en français uniquement. Ne pas traduire."
+            return self._finish_prompt(EMPTY_PROMPT, self.encode(EMPTY_PROMPT), None)
         
-        # Récupérer les derniers segments
-        recent_segments = list(self.text_buffer)[-5:]
+        # Récupérer les derniers segments (sans copier tout le buffer)
+        recent_segments = list(islice(reversed(self.text_buffer), 5))[::-1]
+        valid_until = min(s.timestamp for s in recent_segments) + self.context_window
         
         if speaker:
             recent_segments = [s for s in recent_segments if s.speaker == speaker]
@@ -165,26 +421,73 @@ class ContextMemory:
         # Construire le contexte
         context_parts = []
         
-        # Ajouter les entités détectées
+        # Ajouter les entités les plus citées récemment
         if self.entities["names"]:
-            names = ", ".join(list(self.entities["names"])[-5:])
+            names = ", ".join(self.entities["names"].top(5))
             context_parts.append(f"Noms: {names}")
         
         if self.entities["prices"]:
-            prices = ", ".join(list(self.entities["prices"])[-3:])
+            prices = ", ".join(self.entities["prices"].top(3))
             context_parts.append(f"Prix: {prices}")
         
         # Ajouter les dernières phrases
-        if recent_segments:
-            last_texts = [s.text for s in recent_segments[-3:]]
-            context_parts.append(" ".join(last_texts))
-        
-        base_prompt = "Transcription en français uniquement. Ne pas traduire. Conversation de vente."
-        
+        last_texts = [s.text for s in recent_segments[-3:]]
+        text = self._compose_prompt(context_parts, last_texts)
+        tokens = self.encode(text)
+        if tokens is None or len(tokens) <= self.max_prompt_tokens:
+            return self._finish_prompt(text, tokens, valid_until)
+        
+        self.prompt_truncations += 1
+        while last_texts and len(tokens) > self.max_prompt_tokens:
+            if len(last_texts) > 1:
+                last_texts = last_texts[1:]
+            else:
+                # Dernière phrase trop longue: chaque mot vaut au moins un token
+                words = last_texts[0].split()[len(tokens) - self.max_prompt_tokens:]
+                last_texts = [" ".join(words)] if words else []
+            text = self._compose_prompt(context_parts, last_texts)
+            tokens = self.encode(text)
+        
+        return self._finish_prompt(text, tokens[:self.max_prompt_tokens], valid_until)
+    
+    @staticmethod
+    def _compose_prompt(context_parts: List[str], last_texts: List[str]) -> str:
+        """Assemble consigne, entités et phrases récentes."""
+        if last_texts:
+            context_parts = context_parts + [" ".join(last_texts)]
         if context_parts:
-            return f"{base_prompt} Contexte: {' | '.join(context_parts)}"
+            return f"{BASE_PROMPT} Contexte: {' | '.join(context_parts)}"
+        return BASE_PROMPT
+    
+    def _finish_prompt(
+        self,
+        text: str,
+        tokens: Optional[Tuple[int, ...]],
+        valid_until: Optional[datetime]
+    ) -> ContextPrompt:
+        """Comptabilise la longueur d'un prompt construit."""
+        if tokens is not None:
+            self._prompt_tokens_total += len(tokens)
+            self.max_prompt_length = max(self.max_prompt_length, len(tokens))
+        return ContextPrompt(text, tokens, valid_until)
+    
+    def get_prompt_stats(self) -> dict:
+        """
+        Retourne l'efficacité du cache de prompts et leur longueur.
         
-        return base_prompt
+        Returns:
+            Dict avec demandes, taux de succès du cache, reconstructions,
+            longueur moyenne/max en tokens et prompts réduits au budget
+        """
+        return {
+            "requests": self.prompt_requests,
+            "cache_hit_rate": self.prompt_hits / self.prompt_requests if self.prompt_requests else 0.0,
+            "builds": self.prompt_builds,
+            "mean_tokens": self._prompt_tokens_total / self.prompt_builds if self.prompt_builds else 0.0,
+            "max_tokens": self.max_prompt_length,
+            "token_budget": self.max_prompt_tokens,
+            "truncated": self.prompt_truncations
+        }
     
     def get_audio_context(self, max_duration: float = 30.0) -> Optional[np.ndarray]:
         """
@@ -216,37 +519,41 @@ class ContextMemory:
     
     def get_speaker_stats(self) -> dict:
         """
-        Calcule les statistiques par locuteur.
+        Retourne les statistiques par locuteur (agrégats tenus à jour, O(1)).
         
         Returns:
             Dict avec les stats par speaker
         """
         self._cleanup_old_segments()
         
-        vous_count = sum(1 for s in self.text_buffer if s.speaker == "VOUS")
-        client_count = sum(1 for s in self.text_buffer if s.speaker == "CLIENT")
-        
-        vous_duration = sum(s.duration for s in self.text_buffer if s.speaker == "VOUS")
-        client_duration = sum(s.duration for s in self.text_buffer if s.speaker == "CLIENT")
+        vous = self.speakers.get("VOUS", SpeakerAggregate())
+        client = self.speakers.get("CLIENT", SpeakerAggregate())
         
         return {
-            "vous_segments": vous_count,
-            "client_segments": client_count,
-            "vous_duration": vous_duration,
-            "client_duration": client_duration,
-            "total_segments": len(self.text_buffer)
+            "vous_segments": vous.count,
+            "client_segments": client.count,
+            "vous_duration": vous.duration,
+            "client_duration": client.duration,
+            "total_segments": len(self.text_buffer),
+            "speakers": {
+                speaker: {
+                    "segments": stats.count,
+                    "duration": stats.duration,
+                    "last_activity": stats.last_activity
+                }
+                for speaker, stats in self.speakers.items()
+            }
         }
     
     def clear(self):
         """Vide complètement le contexte."""
         self.text_buffer.clear()
         self.audio_buffer.clear()
-        self.entities = {
-            "names": set(),
-            "prices": set(),
-            "brands": set(),
-            "numbers": set()
-        }
+        self.speakers.clear()
+        self._next_expiry = None
+        self._prompts.clear()
+        for store in self.entities.values():
+            store.clear()
         self.logger.info("Context memory cleared")
     
     def get_entities_summary(self) -> dict:
@@ -254,11 +561,6 @@ class ContextMemory:
         Retourne un résumé des entités détectées.
         
         Returns:
-            Dict avec les entités par catégorie
+            Dict avec les entités par catégorie, les plus citées récemment d'abord
         """
-        return {
-            "names": list(self.entities["names"]),
-            "prices": list(self.entities["prices"]),
-            "brands": list(self.entities["brands"]),
-            "numbers": list(self.entities["numbers"])
-        }
+        return {category: store.top() for category, store in self.entities.items()}
@@ -0,0 +1,315 @@
+"""
+THE CLOSER PRO V25 - CPU Backend
+Sélection du device et auto-réglage de l'inférence CPU (modèle, int8, threads, workers).
+Calibration courte au premier démarrage, résultat persisté pour les suivants.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import json
+import os
+import platform
+import time
+import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from core.model_cache import resolve_model_path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Nombre de canaux à tenir en temps réel par défaut (VOUS + CLIENT)
+REALTIME_CHANNELS = 2
+
+
+def resolve_device(device: str) -> str:
+    """
+    Résout le device de calcul demandé.
+    
+    Args:
+        device: "cuda", "cpu" ou "auto"
+    
+    Returns:
+        "cuda" ou "cpu"
+    """
+    if device != "auto":
+        return device
+    
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda"
+    except Exception:
+        pass
+    return "cpu"
+
+
+def synthetic_speech(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Signal proche de la parole (voisement harmonique modulé au rythme
+    syllabique), pour solliciter encodeur et décodeur sans audio réel.
+    
+    Args:
+        seconds: Durée du signal
+        sample_rate: Fréquence d'échantillonnage
+    
+    Returns:
+        Audio float32 mono
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    audio = 0.1 * voiced * envelope + 0.005 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def physical_cores() -> int:
+    """Nombre de cœurs physiques (threads logiques si inconnu)."""
+    cores = psutil.cpu_count(logical=False) if psutil else None
+    return max(1, cores or os.cpu_count() or 1)
+
+
+@dataclass
+class CPUBackendConfig:
+    """Configuration d'inférence CPU retenue."""
+    model_name: str
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
+    rtf: float  # Temps de traitement / audio pour les canaux simultanés calibrés
+    cpu_signature: str
+    calibrated_at: str = ""
+    
+    @property
+    def is_realtime(self) -> bool:
+        """True si les canaux simultanés sont traités plus vite que le temps réel."""
+        return self.rtf < 1.0
+
+
+class CPUBackendTuner:
+    """
+    Auto-réglage de faster-whisper sur CPU.
+    
+    Pour chaque modèle candidat (du plus précis au plus léger), mesure le
+    temps de traitement d'un énoncé par canal capturé, simultanément, avec
+    plusieurs répartitions threads/workers, et retient le premier modèle qui
+    tient `target_rtf` avec sa meilleure répartition. Le résultat est lié à une
+    signature (CPU et nombre de canaux): un changement relance la calibration.
+    """
+    
+    def __init__(
+        self,
+        calibration_file: str = "cpu_calibration.json",
+        model_candidates: Optional[List[str]] = None,
+        target_rtf: float = 0.7,
+        compute_type: str = "int8",
+        beam_size: int = 5,
+        calibration_seconds: float = 8.0,
+        channels: int = REALTIME_CHANNELS
+    ):
+        """
+        Initialise le tuner.
+        
+        Args:
+            calibration_file: Fichier JSON de persistance
+            model_candidates: Modèles du plus précis au plus léger
+            target_rtf: RTF maximal accepté (marge sous le temps réel)
+            compute_type: Précision CPU (int8 quantifié)
+            beam_size: Beam size utilisé pendant la mesure
+            calibration_seconds: Durée de l'audio de calibration
+            channels: Canaux décodés simultanément en temps réel
+        """
+        self.calibration_file = Path(calibration_file)
+        self.model_candidates = model_candidates or ["large-v3", "medium", "small", "base"]
+        self.target_rtf = target_rtf
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.calibration_seconds = calibration_seconds
+        self.channels = max(1, channels)
+        
+        self.logger = logging.getLogger(__name__)
+    
+    def cpu_signature(self) -> str:
+        """Identifie la machine (processeur et cœurs) et la charge calibrée pour valider le cache."""
+        return (
+            f"{platform.machine()}|{platform.processor()}|{physical_cores()}c/{os.cpu_count()}t"
+            f"|{self.channels}ch"
+        )
+    
+    def thread_layouts(self) -> List[tuple]:
+        """
+        Répartitions (cpu_threads, num_workers) à mesurer.
+        
+        Returns:
+            Liste de (threads par worker, workers)
+        """
+        cores = physical_cores()
+        layouts = [(cores, 1)]
+        if self.channels > 1 and cores >= 2 * self.channels:
+            # Un worker par canal: décodages parallèles, threads partagés
+            layouts.append((cores // self.channels, self.channels))
+        return layouts
+    
+    def load_cached(self) -> Optional[CPUBackendConfig]:
+        """
+        Charge la calibration persistée si elle correspond à cette machine.
+        
+        Returns:
+            Configuration ou None (absente, invalide ou autre machine)
+        """
+        if not self.calibration_file.exists():
+            return None
+        
+        try:
+            data = json.loads(self.calibration_file.read_text(encoding="utf-8"))
+            cached = CPUBackendConfig(**data)
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable CPU calibration {self.calibration_file}: {e}")
+            return None
+        
+        if cached.cpu_signature != self.cpu_signature():
+            self.logger.info("CPU or channel count changed since last calibration - recalibrating")
+            return None
+        if cached.model_name not in self.model_candidates:
+            return None
+        
+        return cached
+    
+    def save(self, backend: CPUBackendConfig):
+        """Persiste la configuration retenue."""
+        try:
+            self.calibration_file.write_text(json.dumps(asdict(backend), indent=2), encoding="utf-8")
+        except OSError as e:
+            self.logger.warning(f"Could not save CPU calibration: {e}")
+    
+    def get_backend(self, force: bool = False) -> CPUBackendConfig:
+        """
+        Retourne la configuration CPU (cache ou nouvelle calibration).
+        
+        Args:
+            force: Ignorer le cache et recalibrer
+        
+        Returns:
+            CPUBackendConfig
+        """
+        if not force:
+            cached = self.load_cached()
+            if cached:
+                self.logger.info(
+                    f"CPU backend from cache: {cached.model_name} ({cached.compute_type}), "
+                    f"{cached.cpu_threads} threads x {cached.num_workers} workers, RTF {cached.rtf:.2f}"
+                )
+                return cached
+        
+        backend = self.calibrate()
+        self.save(backend)
+        return backend
+    
+    def calibrate(self) -> CPUBackendConfig:
+        """
+        Mesure les candidats et retient le plus précis qui tient le temps réel.
+        
+        Returns:
+            CPUBackendConfig (le plus rapide mesuré si aucun ne tient la cible)
+        """
+        audio = synthetic_speech(self.calibration_seconds)
+        fastest: Optional[CPUBackendConfig] = None
+        
+        for model_name in self.model_candidates:
+            model_best: Optional[CPUBackendConfig] = None
+            
+            for threads, workers in self.thread_layouts():
+                try:
+                    rtf = self._measure(model_name, threads, workers, audio)
+                except Exception as e:
+                    self.logger.warning(f"Calibration of {model_name} failed: {e}")
+                    break
+                
+                self.logger.info(
+                    f"Calibration {model_name} ({self.compute_type}) "
+                    f"{threads}t x {workers}w: RTF {rtf:.2f}"
+                )
+                
+                if model_best is None or rtf < model_best.rtf:
+                    model_best = CPUBackendConfig(
+                        model_name=model_name,
+                        compute_type=self.compute_type,
+                        cpu_threads=threads,
+                        num_workers=workers,
+                        rtf=rtf,
+                        cpu_signature=self.cpu_signature(),
+                        calibrated_at=datetime.now().isoformat(timespec="seconds")
+                    )
+            
+            if model_best is None:
+                continue
+            
+            # Premier modèle (le plus précis) qui tient la cible
+            if model_best.rtf <= self.target_rtf:
+                return model_best
+            
+            if fastest is None or model_best.rtf < fastest.rtf:
+                fastest = model_best
+        
+        if fastest is None:
+            raise RuntimeError("CPU calibration failed for every candidate model")
+        
+        self.logger.warning(
+            f"No candidate reaches RTF {self.target_rtf:.2f} - using fastest measured "
+            f"({fastest.model_name}, RTF {fastest.rtf:.2f})"
+        )
+        return fastest
+    
+    def _measure(self, model_name: str, threads: int, workers: int, audio: np.ndarray) -> float:
+        """
+        Mesure le RTF d'une transcription simultanée par canal.
+        
+        Args:
+            model_name: Modèle à charger
+            threads: Threads intra-op par worker
+            workers: Workers ctranslate2 (décodages parallèles)
+            audio: Audio de calibration 16kHz
+        
+        Returns:
+            Temps mural / durée audio d'un canal
+        """
+        from faster_whisper import WhisperModel
+        
+        model = WhisperModel(
+            resolve_model_path(model_name),
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=threads,
+            num_workers=workers
+        )
+        
+        def _run(_):
+            segments, _info = model.transcribe(
+                audio,
+                language="fr",
+                beam_size=self.beam_size,
+                condition_on_previous_text=False,
+                temperature=0.0
+            )
+            return list(segments)
+        
+        # Préchauffage (allocation, caches) hors mesure
+        _run(0)
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.channels) as pool:
+            list(pool.map(_run, range(self.channels)))
+        elapsed = time.perf_counter() - started
+        
+        return elapsed / (len(audio) / 16000)
@@ -0,0 +1,174 @@
+"""
+THE CLOSER PRO V25 - Decoder Gate
+Filtrage des segments à partir des signaux du décodeur Whisper
+(no_speech_prob, ratio de compression, avg_logprob, probabilité des mots),
+avant tout traitement de texte. Compte les rejets par filtre pour le
+réglage des seuils.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import math
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config.manager import GatingConfig
+from core.local_agreement import Word
+
+# Filtres, dans l'ordre d'évaluation
+GATES = ("no_speech", "compression_ratio", "avg_logprob", "word_probability")
+
+
+def compression_ratio(text: str) -> float:
+    """
+    Ratio de compression zlib d'un texte (même mesure que Whisper).
+    Un texte qui boucle sur lui-même se compresse très bien (> 2.4).
+    
+    Args:
+        text: Texte décodé
+    
+    Returns:
+        Taille brute / taille compressée
+    """
+    raw = text.encode("utf-8")
+    if not raw:
+        return 0.0
+    return len(raw) / len(zlib.compress(raw))
+
+
+@dataclass
+class SegmentSignals:
+    """Segment décodé et signaux de confiance du décodeur."""
+    text: str
+    start: float  # Secondes depuis le début de l'énoncé
+    end: float
+    avg_logprob: float
+    no_speech_prob: float
+    compression_ratio: float
+    words: List[Word] = field(default_factory=list)  # Vide sans horodatage par mot
+    
+    @property
+    def word_logprobs(self) -> List[float]:
+        """Log-probabilités des mots (faster-whisper n'expose pas celles des tokens)."""
+        return [math.log(max(word.probability, 1e-12)) for word in self.words]
+    
+    @property
+    def mean_word_probability(self) -> Optional[float]:
+        """Probabilité moyenne des mots (None sans horodatage par mot)."""
+        if not self.words:
+            return None
+        return sum(word.probability for word in self.words) / len(self.words)
+
+
+class DecoderGate:
+    """
+    Rejette les segments dont les signaux du décodeur trahissent une
+    hallucination: silence décodé, boucle de répétition, décodage peu sûr.
+    """
+    
+    def __init__(self, config: Optional[GatingConfig] = None):
+        """
+        Initialise le filtre.
+        
+        Args:
+            config: Seuils (défaut: GatingConfig())
+        """
+        self.config = config or GatingConfig()
+        self._lock = threading.Lock()
+        self.segments_checked = 0
+        self.segments_passed = 0
+        self.utterances_checked = 0
+        self.utterances_rejected = 0
+        self.rejections: Dict[str, int] = {gate: 0 for gate in GATES}
+    
+    def check(self, segment: SegmentSignals) -> Optional[str]:
+        """
+        Évalue un segment.
+        
+        Args:
+            segment: Segment et ses signaux
+        
+        Returns:
+            Nom du filtre qui le rejette, ou None s'il passe
+        """
+        config = self.config
+        if segment.no_speech_prob > config.no_speech_prob and segment.avg_logprob < config.no_speech_logprob:
+            return "no_speech"
+        if segment.compression_ratio > config.max_compression_ratio:
+            return "compression_ratio"
+        if segment.avg_logprob < config.min_avg_logprob:
+            return "avg_logprob"
+        mean_probability = segment.mean_word_probability
+        if mean_probability is not None and mean_probability < config.min_word_probability:
+            return "word_probability"
+        return None
+    
+    def filter(self, segments: List[SegmentSignals], record: bool = True) -> List[SegmentSignals]:
+        """
+        Conserve les segments qui passent tous les filtres.
+        
+        Args:
+            segments: Segments d'un énoncé
+            record: Comptabiliser les rejets (False pour les textes provisoires)
+        
+        Returns:
+            Segments retenus (liste vide: énoncé entièrement rejeté)
+        """
+        if not self.config.enabled:
+            return segments
+        
+        kept = []
+        rejected: List[str] = []
+        for segment in segments:
+            gate = self.check(segment)
+            if gate is None:
+                kept.append(segment)
+            else:
+                rejected.append(gate)
+        
+        if record:
+            with self._lock:
+                self.utterances_checked += 1
+                self.segments_checked += len(segments)
+                self.segments_passed += len(kept)
+                for gate in rejected:
+                    self.rejections[gate] += 1
+                if segments and not kept:
+                    self.utterances_rejected += 1
+        
+        return kept
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne les rejets par filtre.
+        
+        Returns:
+            Dict avec segments évalués/retenus, énoncés rejetés et rejets par filtre
+        """
+        with self._lock:
+            return {
+                "enabled": self.config.enabled,
+                "segments_checked": self.segments_checked,
+                "segments_passed": self.segments_passed,
+                "utterances_checked": self.utterances_checked,
+                "utterances_rejected": self.utterances_rejected,
+                "rejections": dict(self.rejections)
+            }
+    
+    def publish_metrics(self, registry):
+        """
+        Publie les rejets par filtre.
+        
+        Args:
+            registry: MetricsRegistry
+        """
+        stats = self.get_stats()
+        registry.counter(
+            "closer_gate_segments_total", "Segments évalués par les filtres du décodeur"
+        ).set_total(stats["segments_checked"])
+        rejections = registry.counter("closer_gate_rejected_total", "Segments rejetés par filtre", ("gate",))
+        for gate, count in stats["rejections"].items():
+            rejections.set_total(count, gate=gate)
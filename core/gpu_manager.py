@@ -1,20 +1,44 @@
 """
 THE CLOSER PRO V25 - GPU Self-Healing Manager
-Gestion dynamique de la charge GPU avec ajustement automatique des buffers.
-Maintient le système en temps réel strict même sous charge élevée.
+Gestion dynamique de la charge (GPU ou CPU) avec ajustement automatique des profils.
+Maintient le système en temps réel strict même sous charge élevée: les décisions
+reposent sur le real-time factor mesuré, la VRAM n'est qu'un signal d'appoint.
 
 Author: THE CLOSER PRO Team
 Version: 2.5.0 (Elite)
 """
 
-import torch
 import psutil
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Callable
+from functools import lru_cache
+from typing import Optional, Callable, List, Tuple
 import asyncio
 
+from core.rtf_controller import RealtimeFactorController
+
+
+@lru_cache(maxsize=1)
+def get_torch():
+    """
+    Import différé de torch (plusieurs secondes au démarrage).
+    
+    Returns:
+        Module torch, ou None sur les machines CPU-only où il n'est pas requis
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch
+
+
+def cuda_available() -> bool:
+    """True si torch est installé et un GPU CUDA est visible."""
+    torch = get_torch()
+    return torch is not None and torch.cuda.is_available()
+
 
 @dataclass
 class GPUMetrics:
@@ -39,6 +63,7 @@ class PerformanceProfile:
     beam_size: int
     compute_type: str
     vad_threshold: float
+    model_size: Optional[str] = None  # None = modèle configuré
     
     @property
     def profile_name(self) -> str:
@@ -57,6 +82,10 @@ class GPUSelfHealingManager:
     """
     Gestionnaire auto-adaptatif de la charge GPU.
     Ajuste dynamiquement les paramètres pour maintenir le temps réel.
+    
+    Les profils sont parcourus selon le RealtimeFactorController (RTF par
+    énoncé, profondeur des queues, lag bout-en-bout). Sur GPU, une VRAM
+    saturée force en plus le passage à un profil plus léger.
     """
     
     # Profils prédéfinis
@@ -65,8 +94,9 @@ class GPUSelfHealingManager:
             buffer_duration=1.5,
             max_queue_size=20,
             beam_size=3,
-            compute_type="float16",
-            vad_threshold=0.7
+            compute_type="int8_float16",
+            vad_threshold=0.7,
+            model_size="medium"
         ),
         "FAST": PerformanceProfile(
             buffer_duration=3.0,
@@ -95,7 +125,8 @@ class GPUSelfHealingManager:
         self,
         target_vram_percent: float = 80.0,
         monitoring_interval: float = 2.0,
-        adjustment_callback: Optional[Callable] = None
+        adjustment_callback: Optional[Callable] = None,
+        controller: Optional[RealtimeFactorController] = None
     ):
         """
         Initialise le gestionnaire GPU.
@@ -104,10 +135,15 @@ class GPUSelfHealingManager:
             target_vram_percent: Seuil VRAM cible (%)
             monitoring_interval: Intervalle de monitoring (secondes)
             adjustment_callback: Callback appelé lors d'un ajustement
+            controller: Contrôleur RTF (défaut: RealtimeFactorController())
         """
         self.target_vram_percent = target_vram_percent
         self.monitoring_interval = monitoring_interval
         self.adjustment_callback = adjustment_callback
+        self.controller = controller or RealtimeFactorController()
+        
+        # Abonnés supplémentaires aux changements de profil
+        self._adjustment_listeners: List[Callable[[PerformanceProfile], None]] = []
         
         self.logger = logging.getLogger(__name__)
         
@@ -127,10 +163,40 @@ class GPUSelfHealingManager:
         self.lag_events = 0
         self.adjustments_count = 0
         self.last_adjustment_time: Optional[datetime] = None
+        self.last_adjustment_reason: Optional[str] = None  # "vram", "realtime" ou "manual"
         
         # Cooldown pour éviter les ajustements trop fréquents
         self.adjustment_cooldown = timedelta(seconds=10)
     
+    def add_adjustment_listener(self, listener: Callable[[PerformanceProfile], None]):
+        """
+        Abonne une fonction aux changements de profil.
+        
+        Args:
+            listener: Appelée avec le nouveau profil
+        """
+        self._adjustment_listeners.append(listener)
+    
+    def set_queue_health_provider(self, provider: Callable[[], dict]):
+        """
+        Branche la source de profondeur des queues (MultiStreamManager.get_queue_health).
+        
+        Args:
+            provider: Fonction retournant l'état des queues
+        """
+        self.controller.queue_health_provider = provider
+    
+    def record_utterance(self, audio_seconds: float, processing_seconds: float, lag_seconds: float):
+        """
+        Enregistre la mesure temps réel d'un énoncé transcrit.
+        
+        Args:
+            audio_seconds: Durée de l'audio
+            processing_seconds: Temps de traitement (attente incluse)
+            lag_seconds: Retard entre la fin de l'énoncé et son résultat
+        """
+        self.controller.record_utterance(audio_seconds, processing_seconds, lag_seconds)
+    
     def get_gpu_metrics(self) -> GPUMetrics:
         """
         Récupère les métriques GPU actuelles.
@@ -138,7 +204,7 @@ class GPUSelfHealingManager:
         Returns:
             GPUMetrics avec les données en temps réel
         """
-        if not torch.cuda.is_available():
+        if not cuda_available():
             return GPUMetrics(
                 vram_allocated_gb=0.0,
                 vram_reserved_gb=0.0,
@@ -147,6 +213,7 @@ class GPUSelfHealingManager:
             )
         
         # Métriques VRAM
+        torch = get_torch()
         allocated = torch.cuda.memory_allocated(0) / (1024**3)
         reserved = torch.cuda.memory_reserved(0) / (1024**3)
         
@@ -179,7 +246,36 @@ class GPUSelfHealingManager:
         Returns:
             True si un ajustement est requis
         """
-        if not self.current_metrics:
+        return self._decide_direction() is not None
+    
+    def _decide_direction(self) -> Optional[str]:
+        """
+        Combine le contrôleur RTF et la pression VRAM (GPU uniquement).
+        
+        Returns:
+            "up" (plus rapide), "down" (plus qualitatif) ou None
+        """
+        return self._decide()[0]
+    
+    def _decide(self) -> Tuple[Optional[str], str]:
+        """
+        Décide de la direction et de sa cause.
+        
+        Returns:
+            (direction, raison): raison "vram" si la VRAM est saturée, sinon "realtime"
+        """
+        if self._vram_overloaded():
+            return "up", "vram"
+        return self.controller.decide(), "realtime"
+    
+    def _vram_overloaded(self) -> bool:
+        """
+        Détecte une saturation VRAM persistante.
+        
+        Returns:
+            True si la VRAM dépasse la cible (toujours False sur CPU)
+        """
+        if not self.current_metrics or not cuda_available():
             return False
         
         # Vérifier le cooldown
@@ -199,12 +295,13 @@ class GPUSelfHealingManager:
         
         return vram_overload or trending_up
     
-    def adjust_performance_profile(self, direction: str = "auto") -> PerformanceProfile:
+    def adjust_performance_profile(self, direction: str = "auto", reason: str = "manual") -> PerformanceProfile:
         """
         Ajuste le profil de performance.
         
         Args:
             direction: "up" (plus rapide), "down" (plus qualité), ou "auto"
+            reason: Cause de l'ajustement ("vram", "realtime" ou "manual"; déduite en "auto")
         
         Returns:
             Nouveau profil de performance
@@ -214,30 +311,39 @@ class GPUSelfHealingManager:
         current_index = profile_order.index(current_name)
         
         if direction == "auto":
-            # Décider automatiquement
-            if self.should_adjust_performance():
-                direction = "up"  # Plus rapide pour réduire la charge
-            else:
-                direction = "down"  # Plus de qualité si possible
+            # Décider automatiquement (aucun changement si la charge est dans la zone d'hystérésis)
+            direction, reason = self._decide()
         
         if direction == "up" and current_index > 0:
             # Passer à un profil plus rapide
             new_profile_name = profile_order[current_index - 1]
             self.current_profile = self.PROFILES[new_profile_name]
-            self.logger.warning(f"GPU overload detected - switching to {new_profile_name}")
+            self.logger.warning(f"Realtime overload detected - switching to {new_profile_name}")
             
         elif direction == "down" and current_index < len(profile_order) - 1:
             # Passer à un profil plus qualitatif
             new_profile_name = profile_order[current_index + 1]
             self.current_profile = self.PROFILES[new_profile_name]
-            self.logger.info(f"GPU headroom available - switching to {new_profile_name}")
+            self.logger.info(f"Realtime headroom available - switching to {new_profile_name}")
+            
+        else:
+            # Déjà au bout de l'échelle: réévaluer après le cooldown
+            self.controller.notify_change()
+            return self.current_profile
         
         self.adjustments_count += 1
         self.last_adjustment_time = datetime.now()
+        self.last_adjustment_reason = reason
+        self.controller.notify_change()
         
-        # Appeler le callback si défini
+        # Appeler le callback et les abonnés
         if self.adjustment_callback:
             self.adjustment_callback(self.current_profile)
+        for listener in self._adjustment_listeners:
+            try:
+                listener(self.current_profile)
+            except Exception as e:
+                self.logger.error(f"Error in profile listener: {e}", exc_info=True)
         
         return self.current_profile
     
@@ -248,7 +354,9 @@ class GPUSelfHealingManager:
         
         self._is_monitoring = True
         self._monitor_task = asyncio.create_task(self._monitor_loop())
-        self.logger.info("GPU self-healing monitoring started")
+        self.logger.info(
+            f"Self-healing monitoring started ({'GPU' if cuda_available() else 'CPU'} mode, RTF-driven)"
+        )
     
     async def stop_monitoring(self):
         """Arrête le monitoring GPU."""
@@ -270,12 +378,13 @@ class GPUSelfHealingManager:
         """Boucle de monitoring GPU."""
         while self._is_monitoring:
             try:
-                # Récupérer les métriques
-                metrics = self.get_gpu_metrics()
+                # Récupérer les métriques (VRAM nulle sur CPU)
+                self.get_gpu_metrics()
                 
-                # Vérifier si un ajustement est nécessaire
-                if self.should_adjust_performance():
-                    self.adjust_performance_profile("auto")
+                # Ajuster si le contrôleur le demande
+                direction, reason = self._decide()
+                if direction:
+                    self.adjust_performance_profile(direction, reason)
                 
                 # Attendre avant la prochaine mesure
                 await asyncio.sleep(self.monitoring_interval)
@@ -288,7 +397,8 @@ class GPUSelfHealingManager:
     
     def cleanup_vram(self):
         """Nettoie la VRAM (garbage collection)."""
-        if torch.cuda.is_available():
+        if cuda_available():
+            torch = get_torch()
             torch.cuda.empty_cache()
             torch.cuda.synchronize()
             self.logger.debug("VRAM cache cleared")
@@ -315,9 +425,36 @@ class GPUSelfHealingManager:
             "total_adjustments": self.adjustments_count,
             "lag_events": self.lag_events,
             "buffer_duration": self.current_profile.buffer_duration,
-            "beam_size": self.current_profile.beam_size
+            "beam_size": self.current_profile.beam_size,
+            "model_size": self.current_profile.model_size,
+            "realtime": self.controller.get_stats()
         }
     
+    def publish_metrics(self, registry):
+        """
+        Publie le profil actif, la VRAM et les mesures temps réel (RTF, retard).
+        
+        Args:
+            registry: MetricsRegistry
+        """
+        report = self.get_performance_report()
+        realtime = report["realtime"]
+        
+        profile = registry.gauge("closer_performance_profile", "Profil de performance actif (1 = actif)", ("profile",))
+        for name in self.PROFILES:
+            profile.set(1 if name == report["current_profile"] else 0, profile=name)
+        
+        registry.gauge("closer_gpu_vram_allocated_gb", "VRAM allouée (GB)").set(report["current_vram_gb"])
+        registry.counter(
+            "closer_profile_adjustments_total", "Changements de profil automatiques"
+        ).set_total(report["total_adjustments"])
+        registry.counter("closer_lag_events_total", "Événements de retard signalés").set_total(report["lag_events"])
+        registry.gauge("closer_rtf_p90", "Real-time factor p90 (décodage / durée audio)").set(realtime["rtf_p90"])
+        registry.gauge("closer_lag_seconds", "Retard maximal fin de parole -> texte (s)").set(realtime["max_lag_seconds"])
+        registry.gauge("closer_queue_fill_ratio", "Remplissage maximal des queues (0-1)").set(
+            realtime["queue_fill_percent"] / 100
+        )
+    
     def report_lag_event(self):
         """Signale un événement de lag détecté."""
         self.lag_events += 1
@@ -325,4 +462,4 @@ class GPUSelfHealingManager:
         
         # Ajustement immédiat si trop de lag
         if self.lag_events % 3 == 0:
-            self.adjust_performance_profile("up")
+            self.adjust_performance_profile("up", "realtime")
@@ -0,0 +1,238 @@
+"""
+THE CLOSER PRO V25 - Inference Batcher
+Ordonnanceur d'inférence par lots: regroupe les énoncés en attente de tous les
+canaux dans une courte fenêtre et les décode en un seul appel au modèle.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import asyncio
+import numpy as np
+import time
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from core.latency_tracer import NULL_TRACE
+
+
+@dataclass(eq=False)
+class InferenceRequest:
+    """Requête d'inférence en attente de lot."""
+    audio: np.ndarray  # 16kHz mono float32
+    initial_prompt: Union[str, Sequence[int]]  # Texte ou ids Whisper déjà encodés
+    beam_size: int
+    speaker: str
+    word_timestamps: bool = False  # Passe partielle (mots horodatés)
+    trace: Any = NULL_TRACE  # Trace de latence de l'énoncé
+    submitted_at: float = field(default_factory=time.perf_counter)
+    future: Optional[asyncio.Future] = None
+
+
+@dataclass
+class BatchStats:
+    """Statistiques de batching."""
+    batches_count: int = 0
+    requests_count: int = 0
+    batch_sizes: Counter = field(default_factory=Counter)
+    total_queue_delay: float = 0.0
+    max_queue_delay: float = 0.0
+    total_batch_time: float = 0.0
+    
+    @property
+    def mean_batch_size(self) -> float:
+        """Taille moyenne des lots."""
+        if self.batches_count == 0:
+            return 0.0
+        return self.requests_count / self.batches_count
+    
+    @property
+    def mean_queue_delay(self) -> float:
+        """Attente moyenne d'une requête avant décodage (secondes)."""
+        if self.requests_count == 0:
+            return 0.0
+        return self.total_queue_delay / self.requests_count
+
+
+# Exécuteur de lot: reçoit les requêtes, retourne un résultat (ou None) par requête
+BatchRunner = Callable[[List[InferenceRequest]], List[Optional[Dict[str, Any]]]]
+
+
+class InferenceBatcher:
+    """
+    Regroupe les requêtes d'inférence concurrentes en lots.
+    
+    Un worker unique attend la première requête, laisse `batch_window` secondes
+    aux autres canaux pour soumettre les leurs, puis exécute le lot (au plus
+    `max_batch_size` requêtes de mêmes options de décodage) dans un executor.
+    Le worker unique sérialise aussi l'accès au modèle.
+    """
+    
+    def __init__(
+        self,
+        runner: BatchRunner,
+        max_batch_size: int = 4,
+        batch_window: float = 0.02
+    ):
+        """
+        Initialise le batcher.
+        
+        Args:
+            runner: Fonction synchrone exécutant un lot
+            max_batch_size: Nombre maximal de requêtes par lot
+            batch_window: Fenêtre de regroupement après la première requête (secondes)
+        """
+        self.runner = runner
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window = max(0.0, batch_window)
+        self.logger = logging.getLogger(__name__)
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._pending: List[InferenceRequest] = []
+        
+        # Tenu pendant chaque lot: un remplacement du modèle attend la fin du lot en cours
+        self.model_lock = asyncio.Lock()
+        
+        self.stats = BatchStats()
+    
+    async def start(self):
+        """Démarre le worker de batching."""
+        if self._worker is not None:
+            return
+        
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        
+        self.logger.info(
+            f"InferenceBatcher started - max_batch={self.max_batch_size}, "
+            f"window={self.batch_window * 1000:.0f}ms"
+        )
+    
+    async def stop(self):
+        """Arrête le worker; les requêtes en attente reçoivent None."""
+        if self._worker is None:
+            return
+        
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+        for request in self._pending:
+            if not request.future.done():
+                request.future.set_result(None)
+        self._pending = []
+    
+    async def submit(self, request: InferenceRequest) -> Optional[Dict[str, Any]]:
+        """
+        Soumet une requête et attend son résultat.
+        
+        Args:
+            request: Requête d'inférence
+        
+        Returns:
+            Résultat du runner pour cette requête (ou None)
+        """
+        if self._worker is None:
+            raise RuntimeError("InferenceBatcher not started")
+        
+        request.future = asyncio.get_running_loop().create_future()
+        request.submitted_at = time.perf_counter()
+        await self._queue.put(request)
+        return await request.future
+    
+    async def _collect(self) -> List[InferenceRequest]:
+        """
+        Constitue le prochain lot.
+        
+        Returns:
+            Requêtes partageant les options de décodage de la plus ancienne
+        """
+        if not self._pending:
+            self._pending.append(await self._queue.get())
+        
+        # Fenêtre de regroupement: laisser les autres canaux soumettre
+        deadline = time.perf_counter() + self.batch_window
+        while len(self._pending) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                self._pending.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+        
+        # Un lot partage les options de décodage: grouper par (beam size, mode)
+        key = (self._pending[0].beam_size, self._pending[0].word_timestamps)
+        batch = [
+            r for r in self._pending
+            if (r.beam_size, r.word_timestamps) == key
+        ][:self.max_batch_size]
+        self._pending = [r for r in self._pending if r not in batch]
+        return batch
+    
+    async def _run(self):
+        """Boucle du worker: collecte, exécute, distribue."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            for request in batch:
+                request.trace.mark("inference_wait")
+            
+            try:
+                async with self.model_lock:
+                    results = await loop.run_in_executor(None, self.runner, batch)
+            except asyncio.CancelledError:
+                self._pending = batch + self._pending
+                raise
+            except Exception as e:
+                self.logger.error(f"Batch inference failed ({len(batch)} requests): {e}", exc_info=True)
+                results = [None] * len(batch)
+            
+            self._record(batch, started, time.perf_counter() - started)
+            
+            for request, result in zip(batch, results):
+                request.trace.mark("decode")
+                if not request.future.done():
+                    request.future.set_result(result)
+    
+    def _record(self, batch: List[InferenceRequest], started: float, batch_time: float):
+        """Met à jour les statistiques d'un lot exécuté."""
+        self.stats.batches_count += 1
+        self.stats.requests_count += len(batch)
+        self.stats.batch_sizes[len(batch)] += 1
+        self.stats.total_batch_time += batch_time
+        
+        for request in batch:
+            delay = started - request.submitted_at
+            self.stats.total_queue_delay += delay
+            self.stats.max_queue_delay = max(self.stats.max_queue_delay, delay)
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne les statistiques de batching.
+        
+        Returns:
+            Dict avec distribution des tailles de lot et délais d'attente
+        """
+        return {
+            "batches_count": self.stats.batches_count,
+            "requests_count": self.stats.requests_count,
+            "mean_batch_size": self.stats.mean_batch_size,
+            "batch_size_distribution": dict(sorted(self.stats.batch_sizes.items())),
+            "mean_queue_delay_ms": self.stats.mean_queue_delay * 1000,
+            "max_queue_delay_ms": self.stats.max_queue_delay * 1000,
+            "queued_requests": (self._queue.qsize() if self._queue else 0) + len(self._pending)
+        }
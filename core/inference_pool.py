@@ -0,0 +1,680 @@
+"""
+THE CLOSER PRO V25 - Inference Pool
+Pool de processus d'inférence: chaque worker charge sa propre réplique du
+modèle Whisper, l'audio transite par mémoire partagée et chaque requête est
+confiée au worker le moins chargé. Permet de décoder plusieurs appels en
+parallèle sur une machine multi-cœurs.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import asyncio
+import gc
+import itertools
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from core.local_agreement import Word
+from core.decoder_gate import SegmentSignals
+from core.model_cache import resolve_model_path
+from core.latency_tracer import NULL_TRACE
+
+# Nature des requêtes traitées par les workers
+TASK_UTTERANCE = "utterance"  # Énoncé final (texte)
+TASK_WORDS = "words"  # Passe partielle (mots horodatés)
+
+# Délai de vérification de la vie des workers (secondes)
+HEALTH_CHECK_INTERVAL = 0.5
+
+# Relances maximales d'un worker mort (au-delà, il reste arrêté)
+MAX_WORKER_RESTARTS = 5
+
+# Lissage exponentiel de la latence par worker
+LATENCY_EWMA_ALPHA = 0.2
+
+
+def decode_utterance(
+    model,
+    audio_data: np.ndarray,
+    initial_prompt: Union[str, Sequence[int]],
+    beam_size: int,
+    vad_filter: bool = False,
+    word_timestamps: bool = False
+) -> Optional[Dict]:
+    """
+    Transcrit un énoncé isolé avec model.transcribe.
+    
+    Les segments de non-parole ne sont pas écartés ici: ils remontent avec
+    leurs signaux (SegmentSignals) jusqu'au DecoderGate qui les compte.
+    
+    Args:
+        model: WhisperModel chargé
+        audio_data: Audio 16kHz mono float32
+        initial_prompt: Prompt de contexte (texte ou ids Whisper)
+        beam_size: Taille du beam search
+        vad_filter: Filtre VAD de faster-whisper
+        word_timestamps: Horodatage et probabilité par mot
+    
+    Returns:
+        Dict avec text, duration, confidence et segments (None si aucun segment)
+    """
+    segments, info = model.transcribe(
+        audio_data,
+        language="fr",
+        task="transcribe",
+        beam_size=beam_size,
+        vad_filter=vad_filter,
+        initial_prompt=initial_prompt,
+        condition_on_previous_text=True,
+        temperature=0.0,
+        compression_ratio_threshold=2.4,
+        log_prob_threshold=-1.0,
+        no_speech_threshold=None,
+        word_timestamps=word_timestamps
+    )
+    
+    # Collecter les segments et leurs signaux
+    signals = [
+        SegmentSignals(
+            text=segment.text.strip(),
+            start=segment.start,
+            end=segment.end,
+            avg_logprob=segment.avg_logprob,
+            no_speech_prob=segment.no_speech_prob,
+            compression_ratio=segment.compression_ratio,
+            words=[
+                Word(word.start, word.end, word.word.strip(), word.probability)
+                for word in segment.words or []
+            ]
+        )
+        for segment in segments
+    ]
+    
+    if not signals:
+        return None
+    
+    return {
+        "text": " ".join(s.text for s in signals),
+        "duration": len(audio_data) / 16000,
+        "confidence": sum(s.avg_logprob for s in signals) / len(signals),
+        "segments": signals
+    }
+
+
+def decode_words(
+    model,
+    audio_data: np.ndarray,
+    initial_prompt: Union[str, Sequence[int]],
+    beam_size: int
+) -> Optional[Dict]:
+    """
+    Transcrit un buffer partiel avec horodatage par mot.
+    
+    Args:
+        model: WhisperModel chargé
+        audio_data: Buffer non validé de l'énoncé
+        initial_prompt: Contexte + texte déjà validé (texte ou ids Whisper)
+        beam_size: Taille du beam search
+    
+    Returns:
+        Dict avec words (List[Word], temps relatifs au buffer) et confidence
+    """
+    segments, info = model.transcribe(
+        audio_data,
+        language="fr",
+        task="transcribe",
+        beam_size=beam_size,
+        initial_prompt=initial_prompt,
+        condition_on_previous_text=False,
+        word_timestamps=True,
+        temperature=0.0,
+        no_speech_threshold=0.6
+    )
+    
+    words: List[Word] = []
+    total_confidence = 0.0
+    segment_count = 0
+    
+    for segment in segments:
+        for word in segment.words or []:
+            words.append(Word(word.start, word.end, word.word.strip(), word.probability))
+        total_confidence += segment.avg_logprob
+        segment_count += 1
+    
+    if segment_count == 0:
+        return None
+    
+    return {
+        "words": words,
+        "confidence": total_confidence / segment_count
+    }
+
+
+def _load_whisper(model_options: Dict[str, Any]):
+    """Charge une réplique WhisperModel (dans le processus worker)."""
+    from faster_whisper import WhisperModel
+    options = dict(model_options)
+    options["model_size_or_path"] = resolve_model_path(options["model_size_or_path"])
+    return WhisperModel(**options)
+
+
+def _worker_main(
+    worker_id: int,
+    model_options: Dict[str, Any],
+    vad_filter: bool,
+    word_timestamps: bool,
+    tasks,
+    results
+):
+    """
+    Boucle d'un processus worker.
+    
+    Messages reçus: ("task", task_id, kind, shm_name, samples, prompt, beam_size),
+    ("reload", model_options, release_first) ou None (arrêt).
+    Messages émis: ("ready", worker_id, load_seconds, error), ("result", worker_id,
+    task_id, result, seconds, error).
+    
+    Args:
+        worker_id: Index du worker
+        model_options: Arguments de WhisperModel
+        vad_filter: Filtre VAD pour les énoncés finaux
+        word_timestamps: Horodatage par mot des énoncés finaux
+        tasks: Queue de requêtes propre au worker
+        results: Queue de résultats partagée
+    """
+    def _load(options):
+        started = time.perf_counter()
+        try:
+            loaded = _load_whisper(options)
+        except Exception as e:
+            results.put(("ready", worker_id, time.perf_counter() - started, repr(e)))
+            return None
+        results.put(("ready", worker_id, time.perf_counter() - started, None))
+        return loaded
+    
+    model = _load(model_options)
+    if model is None:
+        return
+    
+    while True:
+        message = tasks.get()
+        if message is None:
+            break
+        
+        if message[0] == "reload":
+            _, options, release_first = message
+            if not release_first:
+                replacement = _load(options)
+                if replacement is not None:
+                    model_options, model = options, replacement
+                continue
+            
+            # VRAM saturée: libérer l'ancien modèle avant de charger le nouveau
+            model = None
+            gc.collect()
+            model = _load(options)
+            if model is not None:
+                model_options = options
+                continue
+            try:
+                model = _load_whisper(model_options)
+            except Exception:
+                # Plus aucun modèle: le health check du pool redémarre le worker
+                break
+            continue
+        
+        _, task_id, kind, shm_name, samples, prompt, beam_size = message
+        started = time.perf_counter()
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name)
+            try:
+                audio = np.ndarray((samples,), dtype=np.float32, buffer=shm.buf).copy()
+            finally:
+                shm.close()
+            
+            if kind == TASK_WORDS:
+                result = decode_words(model, audio, prompt, beam_size)
+            else:
+                result = decode_utterance(model, audio, prompt, beam_size, vad_filter, word_timestamps)
+            results.put(("result", worker_id, task_id, result, time.perf_counter() - started, None))
+        except Exception as e:
+            results.put(("result", worker_id, task_id, None, time.perf_counter() - started, repr(e)))
+
+
+@dataclass
+class WorkerStats:
+    """Santé et latence d'un worker."""
+    worker_id: int
+    pid: Optional[int] = None
+    alive: bool = False
+    ready: bool = False
+    in_flight: int = 0
+    completed: int = 0
+    errors: int = 0
+    restarts: int = 0
+    latency_ewma: float = 0.0  # Secondes
+    max_latency: float = 0.0  # Secondes
+    total_busy: float = 0.0  # Secondes de décodage cumulées
+    last_result_at: Optional[float] = None  # Horloge monotone
+    load_seconds: float = 0.0
+
+
+@dataclass
+class _PendingTask:
+    """Requête confiée à un worker, en attente de résultat."""
+    worker_id: int
+    shm: shared_memory.SharedMemory
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.perf_counter)
+    decode_seconds: float = 0.0  # Temps de décodage mesuré dans le worker
+
+
+class _Worker:
+    """Processus worker et sa queue de requêtes."""
+    
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.process: Optional[mp.Process] = None
+        self.tasks = None
+        self.stats = WorkerStats(worker_id=worker_id)
+        self.load_error: Optional[str] = None  # Erreur du dernier chargement (None: réussi)
+
+
+class InferencePool:
+    """
+    Pool de N processus d'inférence, chacun avec sa réplique du modèle.
+    
+    - L'audio est copié une fois dans un segment de mémoire partagée; seul
+      son nom transite par les queues (pas de sérialisation du tableau).
+    - Dispatch au moins chargé: requêtes en vol, puis latence lissée.
+    - Un thread collecteur distribue les résultats à la boucle asyncio et
+      surveille les workers: un worker mort voit ses requêtes échouer (None)
+      et est relancé.
+    """
+    
+    def __init__(
+        self,
+        num_workers: int,
+        model_options: Dict[str, Any],
+        vad_filter: bool = False,
+        start_timeout: float = 300.0,
+        word_timestamps: bool = False
+    ):
+        """
+        Initialise le pool.
+        
+        Args:
+            num_workers: Nombre de processus (une réplique du modèle chacun)
+            model_options: Arguments de WhisperModel (model_size_or_path, device, ...)
+            vad_filter: Filtre VAD pour les énoncés finaux
+            start_timeout: Attente maximale du chargement des modèles (secondes)
+            word_timestamps: Horodatage par mot des énoncés finaux
+        """
+        self.num_workers = max(1, num_workers)
+        self.model_options = dict(model_options)
+        self.vad_filter = vad_filter
+        self.word_timestamps = word_timestamps
+        self.start_timeout = start_timeout
+        
+        self.logger = logging.getLogger(__name__)
+        
+        # spawn: pas d'état CUDA/threads hérité du parent
+        self._context = mp.get_context("spawn")
+        self._results = None
+        self._workers: List[_Worker] = [_Worker(i) for i in range(self.num_workers)]
+        self._pending: Dict[int, _PendingTask] = {}
+        self._task_ids = itertools.count()
+        self._lock = threading.Lock()
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._collector: Optional[threading.Thread] = None
+        self._running = False
+        self._ready_events: Dict[int, threading.Event] = {}
+    
+    @property
+    def is_running(self) -> bool:
+        """True si le pool accepte des requêtes."""
+        return self._running
+    
+    @property
+    def model_variant(self) -> tuple:
+        """(model_name, compute_type) chargé par les workers."""
+        return self.model_options["model_size_or_path"], self.model_options.get("compute_type", "default")
+    
+    async def start(self):
+        """Lance les workers et attend le chargement de leurs modèles."""
+        if self._running:
+            return
+        
+        self._loop = asyncio.get_running_loop()
+        self._results = self._context.Queue()
+        self._running = True
+        
+        for worker in self._workers:
+            self._spawn(worker)
+        
+        self._collector = threading.Thread(target=self._collect, name="InferencePoolCollector", daemon=True)
+        self._collector.start()
+        
+        await self._wait_ready(list(self._ready_events.values()))
+        
+        ready = [w for w in self._workers if w.stats.ready]
+        if not ready:
+            await self.stop()
+            raise RuntimeError("No inference worker could load the model")
+        
+        self.logger.info(
+            f"InferencePool started - {len(ready)}/{self.num_workers} workers, "
+            f"model {self.model_variant[0]} ({self.model_variant[1]}) on {self.model_options.get('device')}"
+        )
+    
+    async def stop(self):
+        """Arrête les workers; les requêtes en vol reçoivent None."""
+        if not self._running:
+            return
+        self._running = False
+        
+        for worker in self._workers:
+            if worker.process and worker.process.is_alive():
+                worker.tasks.put(None)
+        
+        loop = asyncio.get_running_loop()
+        for worker in self._workers:
+            if worker.process:
+                await loop.run_in_executor(None, worker.process.join, 5.0)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            worker.stats.alive = False
+        
+        if self._collector:
+            await loop.run_in_executor(None, self._collector.join, 2.0)
+            self._collector = None
+        
+        with self._lock:
+            pending = list(self._pending.keys())
+        for task_id in pending:
+            self._finish(task_id, None)
+    
+    async def reload(self, model_name: str, compute_type: str, release_first: bool = False):
+        """
+        Recharge le modèle de chaque worker (profil de performance).
+        Les workers terminent leurs requêtes en cours avant de recharger.
+        
+        Les options du pool (relances comprises) ne changent que si tous les
+        workers ont chargé la nouvelle variante; sinon ceux qui l'ont chargée
+        reviennent à l'ancienne.
+        
+        Args:
+            model_name: Modèle à charger
+            compute_type: Précision
+            release_first: Libérer l'ancien modèle avant le chargement (VRAM saturée)
+        
+        Raises:
+            RuntimeError: Un worker n'a pas chargé la variante demandée
+        """
+        previous = dict(self.model_options)
+        options = dict(previous, model_size_or_path=model_name, compute_type=compute_type)
+        
+        workers = [w for w in self._workers if w.process and w.process.is_alive()]
+        await self._reload_workers(workers, options, release_first)
+        
+        failed = [w for w in workers if w.load_error or not w.process.is_alive()]
+        if failed:
+            errors = ", ".join(f"worker {w.worker_id}: {w.load_error or 'died'}" for w in failed)
+            loaded = [w for w in workers if w not in failed]
+            if loaded:
+                await self._reload_workers(loaded, previous, release_first)
+            raise RuntimeError(f"InferencePool reload to {model_name} ({compute_type}) failed ({errors})")
+        
+        self.model_options = options
+        self.logger.info(f"InferencePool reloaded with {model_name} ({compute_type})")
+    
+    async def _reload_workers(self, workers: List[_Worker], options: Dict[str, Any], release_first: bool):
+        """
+        Envoie un rechargement à des workers et attend leur réponse.
+        
+        Args:
+            workers: Workers vivants à recharger
+            options: Arguments de WhisperModel
+            release_first: Libérer l'ancien modèle avant le chargement
+        """
+        events = []
+        for worker in workers:
+            event = threading.Event()
+            self._ready_events[worker.worker_id] = event
+            events.append(event)
+            worker.load_error = "no response"  # Remplacé par la réponse du worker
+            worker.tasks.put(("reload", dict(options), release_first))
+        
+        await self._wait_ready(events)
+    
+    async def submit(
+        self,
+        audio: np.ndarray,
+        initial_prompt: Union[str, Sequence[int]],
+        beam_size: int,
+        word_timestamps: bool = False,
+        trace=NULL_TRACE
+    ) -> Optional[Dict]:
+        """
+        Confie une requête au worker le moins chargé et attend son résultat.
+        
+        Args:
+            audio: Audio 16kHz mono float32
+            initial_prompt: Prompt de contexte (texte ou ids Whisper)
+            beam_size: Taille du beam search
+            word_timestamps: Passe partielle (mots horodatés)
+            trace: Trace de latence (attente vs décodage dans le worker)
+        
+        Returns:
+            Résultat du décodage (None si échec ou silence)
+        """
+        if not self._running:
+            raise RuntimeError("InferencePool not started")
+        
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+        np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+        
+        future = asyncio.get_running_loop().create_future()
+        kind = TASK_WORDS if word_timestamps else TASK_UTTERANCE
+        
+        with self._lock:
+            worker = self._least_loaded()
+            if worker is None:
+                shm.close()
+                shm.unlink()
+                self.logger.error("No inference worker available")
+                return None
+            
+            task_id = next(self._task_ids)
+            task = _PendingTask(worker.worker_id, shm, future)
+            self._pending[task_id] = task
+            worker.stats.in_flight += 1
+        
+        worker.tasks.put(("task", task_id, kind, shm.name, len(audio), initial_prompt, beam_size))
+        result = await future
+        trace.mark_split("inference_wait", "decode", task.decode_seconds)
+        return result
+    
+    def _least_loaded(self) -> Optional[_Worker]:
+        """Worker prêt avec le moins de requêtes en vol (puis la latence la plus basse)."""
+        candidates = [w for w in self._workers if w.stats.alive and w.stats.ready]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda w: (w.stats.in_flight, w.stats.latency_ewma))
+    
+    def _spawn(self, worker: _Worker):
+        """Démarre (ou redémarre) le processus d'un worker."""
+        worker.tasks = self._context.Queue()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(
+                worker.worker_id,
+                dict(self.model_options),
+                self.vad_filter,
+                self.word_timestamps,
+                worker.tasks,
+                self._results
+            ),
+            name=f"InferenceWorker-{worker.worker_id}",
+            daemon=True
+        )
+        self._ready_events[worker.worker_id] = threading.Event()
+        worker.stats.ready = False
+        worker.stats.load_seconds = 0.0  # Relancé seulement s'il charge à nouveau son modèle
+        worker.load_error = None
+        worker.process.start()
+        worker.stats.pid = worker.process.pid
+        worker.stats.alive = True
+    
+    async def _wait_ready(self, events: List[threading.Event]):
+        """Attend le chargement des modèles (borné par start_timeout)."""
+        deadline = time.monotonic() + self.start_timeout
+        while any(not e.is_set() for e in events) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+    
+    def _collect(self):
+        """Thread collecteur: distribue les résultats et surveille les workers."""
+        while self._running:
+            try:
+                message = self._results.get(timeout=HEALTH_CHECK_INTERVAL)
+            except queue.Empty:
+                message = None
+            except (EOFError, OSError):
+                break
+            
+            if message is not None:
+                self._handle(message)
+            
+            self._check_health()
+    
+    def _handle(self, message: tuple):
+        """Traite un message d'un worker."""
+        if message[0] == "ready":
+            _, worker_id, load_seconds, error = message
+            worker = self._workers[worker_id]
+            worker.load_error = error
+            if error:
+                self.logger.error(f"Inference worker {worker_id} failed to load model: {error}")
+                worker.stats.errors += 1
+            else:
+                worker.stats.ready = True
+                worker.stats.load_seconds = load_seconds
+            event = self._ready_events.get(worker_id)
+            if event:
+                event.set()
+            return
+        
+        _, worker_id, task_id, result, seconds, error = message
+        stats = self._workers[worker_id].stats
+        stats.completed += 1
+        stats.total_busy += seconds
+        stats.max_latency = max(stats.max_latency, seconds)
+        stats.latency_ewma = (
+            seconds if stats.completed == 1
+            else (1 - LATENCY_EWMA_ALPHA) * stats.latency_ewma + LATENCY_EWMA_ALPHA * seconds
+        )
+        stats.last_result_at = time.monotonic()
+        if error:
+            stats.errors += 1
+            self.logger.error(f"Inference worker {worker_id} failed on task {task_id}: {error}")
+        
+        with self._lock:
+            task = self._pending.get(task_id)
+            if task is not None:
+                task.decode_seconds = seconds
+        
+        self._finish(task_id, result)
+    
+    def _check_health(self):
+        """Échoue les requêtes d'un worker mort et le relance."""
+        for worker in self._workers:
+            if not worker.stats.alive or worker.process.is_alive():
+                continue
+            
+            worker.stats.alive = False
+            worker.stats.ready = False
+            self.logger.error(
+                f"Inference worker {worker.worker_id} died (exit code {worker.process.exitcode})"
+            )
+            
+            # Débloque une attente de chargement en cours
+            event = self._ready_events.get(worker.worker_id)
+            if event:
+                event.set()
+            
+            with self._lock:
+                lost = [tid for tid, task in self._pending.items() if task.worker_id == worker.worker_id]
+            for task_id in lost:
+                self._finish(task_id, None)
+            
+            # Un worker qui n'a pas chargé son modèle depuis sa dernière relance n'est pas relancé
+            if not self._running or worker.stats.load_seconds <= 0:
+                continue
+            if worker.stats.restarts >= MAX_WORKER_RESTARTS:
+                self.logger.error(f"Inference worker {worker.worker_id} exceeded {MAX_WORKER_RESTARTS} restarts - left stopped")
+                continue
+            worker.stats.restarts += 1
+            self._spawn(worker)
+    
+    def _finish(self, task_id: int, result: Optional[Dict]):
+        """Libère la mémoire partagée et résout la requête."""
+        with self._lock:
+            task = self._pending.pop(task_id, None)
+            if task is None:
+                return
+            self._workers[task.worker_id].stats.in_flight -= 1
+        
+        task.shm.close()
+        task.shm.unlink()
+        
+        def _resolve():
+            if not task.future.done():
+                task.future.set_result(result)
+        
+        self._loop.call_soon_threadsafe(_resolve)
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne la santé et la latence de chaque worker.
+        
+        Returns:
+            Dict avec totaux et détail par worker
+        """
+        workers = []
+        now = time.monotonic()
+        for worker in self._workers:
+            stats = worker.stats
+            workers.append({
+                "worker_id": stats.worker_id,
+                "pid": stats.pid,
+                "alive": stats.alive,
+                "ready": stats.ready,
+                "in_flight": stats.in_flight,
+                "completed": stats.completed,
+                "errors": stats.errors,
+                "restarts": stats.restarts,
+                "latency_ewma_ms": stats.latency_ewma * 1000,
+                "max_latency_ms": stats.max_latency * 1000,
+                "busy_seconds": stats.total_busy,
+                "idle_seconds": now - stats.last_result_at if stats.last_result_at else None,
+                "load_seconds": stats.load_seconds
+            })
+        
+        return {
+            "num_workers": self.num_workers,
+            "ready_workers": sum(1 for w in workers if w["ready"]),
+            "in_flight": sum(w["in_flight"] for w in workers),
+            "completed": sum(w["completed"] for w in workers),
+            "model_variant": self.model_variant,
+            "workers": workers
+        }
@@ -0,0 +1,268 @@
+"""
+THE CLOSER PRO V25 - Latency Tracer
+Traçage de latence bout-en-bout par énoncé: chaque chunk reçoit un identifiant
+de trace et un horodatage monotone à chaque frontière d'étape du pipeline
+(capture -> queues -> découpage -> assemblage -> inférence -> affichage).
+Les durées par étape alimentent des histogrammes logarithmiques (p50/p95/p99).
+
+Coût par marque: un perf_counter, un log et un incrément sous verrou.
+Conçu pour rester actif en production.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import itertools
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config.manager import get_config
+
+# Étapes du pipeline, dans l'ordre de traversée
+STAGES = (
+    "audio_queue",  # Capture -> callback de la source (queue du streamer)
+    "loop_hop",  # Callback (thread audio) -> event loop (run_coroutine_threadsafe)
+    "split",  # Conversion, rééchantillonnage et découpage des canaux
+    "stream_queue",  # Attente dans la queue du canal (MultiStreamManager)
+    "assembly",  # Assemblage de l'énoncé (VAD, endpointing)
+    "preprocess",  # Prétraitement audio du transcripteur
+    "inference_wait",  # Attente du modèle (batcher ou pool)
+    "decode",  # Décodage Whisper
+    "processor",  # Nettoyage et filtrage des hallucinations
+    "intelligence",  # SalesIntelligence et analytics
+    "display",  # Affichage et écriture du fichier
+    "total"  # Capture du dernier chunk -> affichage
+)
+
+
+class LatencyHistogram:
+    """
+    Histogramme à buckets logarithmiques (précision relative ~10%).
+    Enregistrement en O(1), mémoire fixe quel que soit le volume.
+    """
+    
+    MIN_SECONDS = 1e-5  # 10µs
+    GROWTH = 2 ** 0.25  # ~19% par bucket
+    BUCKETS = 112  # Jusqu'à ~2000s
+    
+    def __init__(self):
+        """Initialise un histogramme vide."""
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float):
+        """
+        Ajoute une mesure.
+        
+        Args:
+            seconds: Durée mesurée
+        """
+        if seconds <= self.MIN_SECONDS:
+            index = 0
+        else:
+            index = min(self.BUCKETS - 1, int(math.log(seconds / self.MIN_SECONDS, self.GROWTH)) + 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, fraction: float) -> float:
+        """
+        Percentile approché (milieu géométrique du bucket).
+        
+        Args:
+            fraction: Percentile visé (0-1)
+        
+        Returns:
+            Durée en secondes (0 si vide)
+        """
+        if self.count == 0:
+            return 0.0
+        
+        target = fraction * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target and bucket_count:
+                if index == 0:
+                    return self.MIN_SECONDS
+                upper = self.MIN_SECONDS * self.GROWTH ** index
+                return min(self.max, upper / math.sqrt(self.GROWTH))
+        return self.max
+    
+    def summary(self) -> dict:
+        """
+        Résumé de l'histogramme.
+        
+        Returns:
+            Dict avec count, moyenne, p50/p95/p99 et max (ms)
+        """
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+
+class Trace:
+    """
+    Trace d'un chunk puis de l'énoncé qu'il termine.
+    Chaque marque enregistre la durée écoulée depuis la marque précédente.
+    """
+    
+    __slots__ = ("trace_id", "started", "last", "_tracer")
+    
+    def __init__(self, tracer: "LatencyTracer", trace_id: int, started: float, last: Optional[float] = None):
+        self._tracer = tracer
+        self.trace_id = trace_id
+        self.started = started
+        self.last = started if last is None else last
+    
+    def mark(self, stage: str):
+        """
+        Clôt une étape à l'instant présent.
+        
+        Args:
+            stage: Étape qui vient de se terminer
+        """
+        now = time.perf_counter()
+        self._tracer.record(stage, now - self.last)
+        self.last = now
+    
+    def mark_split(self, wait_stage: str, work_stage: str, work_seconds: float):
+        """
+        Clôt deux étapes consécutives dont seule la seconde a été mesurée
+        (ex: attente puis décodage dans un worker).
+        
+        Args:
+            wait_stage: Étape d'attente (le reste du temps écoulé)
+            work_stage: Étape de travail
+            work_seconds: Durée mesurée de l'étape de travail
+        """
+        now = time.perf_counter()
+        elapsed = now - self.last
+        work_seconds = min(max(0.0, work_seconds), elapsed)
+        self._tracer.record(wait_stage, elapsed - work_seconds)
+        self._tracer.record(work_stage, work_seconds)
+        self.last = now
+    
+    def fork(self) -> "Trace":
+        """
+        Copie indépendante (même identifiant) pour une branche du pipeline,
+        par exemple un canal après le découpage stéréo.
+        
+        Returns:
+            Nouvelle trace partageant l'origine
+        """
+        return Trace(self._tracer, self.trace_id, self.started, self.last)
+    
+    def finish(self):
+        """Enregistre la latence bout-en-bout de la trace."""
+        self._tracer.record("total", time.perf_counter() - self.started)
+
+
+class _NullTrace:
+    """Trace inactive (traçage désactivé): toutes les marques sont ignorées."""
+    
+    trace_id = -1
+    
+    def mark(self, stage: str):
+        pass
+    
+    def mark_split(self, wait_stage: str, work_stage: str, work_seconds: float):
+        pass
+    
+    def fork(self) -> "_NullTrace":
+        return self
+    
+    def finish(self):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class LatencyTracer:
+    """
+    Agrège les latences par étape de toutes les traces.
+    Thread-safe: les marques viennent du thread audio, de l'event loop et des executors.
+    """
+    
+    def __init__(self, enabled: bool = True):
+        """
+        Initialise le traceur.
+        
+        Args:
+            enabled: False pour un traceur inerte (NULL_TRACE)
+        """
+        self.enabled = enabled
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self.traces_started = 0
+    
+    def start(self, origin: Optional[float] = None):
+        """
+        Démarre une trace.
+        
+        Args:
+            origin: Horodatage perf_counter de capture (défaut: maintenant)
+        
+        Returns:
+            Trace (ou NULL_TRACE si désactivé)
+        """
+        if not self.enabled:
+            return NULL_TRACE
+        
+        self.traces_started += 1
+        return Trace(self, next(self._ids), time.perf_counter() if origin is None else origin)
+    
+    def record(self, stage: str, seconds: float):
+        """
+        Enregistre la durée d'une étape.
+        
+        Args:
+            stage: Nom de l'étape
+            seconds: Durée mesurée
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+    
+    def reset(self):
+        """Efface les histogrammes."""
+        with self._lock:
+            self._histograms.clear()
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne les latences par étape, dans l'ordre du pipeline.
+        
+        Returns:
+            Dict {étape: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}
+        """
+        with self._lock:
+            order: List[str] = [s for s in STAGES if s in self._histograms]
+            order += sorted(s for s in self._histograms if s not in STAGES)
+            return {stage: self._histograms[stage].summary() for stage in order}
+
+
+# Singleton getter
+_tracer_instance: Optional[LatencyTracer] = None
+
+def get_latency_tracer() -> LatencyTracer:
+    """Retourne l'instance singleton du traceur de latence."""
+    global _tracer_instance
+    if _tracer_instance is None:
+        _tracer_instance = LatencyTracer(enabled=get_config().system.latency_tracing)
+    return _tracer_instance
@@ -0,0 +1,159 @@
+"""
+THE CLOSER PRO V25 - Local Agreement
+Validation incrémentale des hypothèses de transcription en streaming.
+Un mot n'est validé que lorsque des passes successives sur le buffer
+croissant s'accordent sur lui (politique LocalAgreement-n).
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List
+
+
+@dataclass(frozen=True)
+class Word:
+    """Mot horodaté (secondes depuis le début de l'énoncé)."""
+    start: float
+    end: float
+    text: str
+    probability: float = field(default=1.0, compare=False)  # Probabilité du décodeur
+    
+    @property
+    def key(self) -> str:
+        """Forme normalisée pour la comparaison entre passes."""
+        return re.sub(r"[^\w']", "", self.text.lower())
+
+
+class LocalAgreement:
+    """
+    État de streaming d'un énoncé pour un locuteur.
+    
+    Chaque passe de décodage fournit une hypothèse complète du buffer non
+    validé. Le plus long préfixe commun aux `passes` dernières hypothèses est
+    validé; l'audio correspondant est retiré du buffer pour la passe suivante.
+    """
+    
+    # Nombre maximal de mots recherchés au raccord validé/nouvelle hypothèse
+    MAX_OVERLAP_WORDS = 5
+    
+    def __init__(self, utterance_id: int = 0, passes: int = 2):
+        """
+        Initialise l'état de streaming.
+        
+        Args:
+            utterance_id: Identifiant de l'énoncé suivi
+            passes: Nombre de passes consécutives devant s'accorder (>= 2)
+        """
+        self.passes = max(2, passes)
+        self.reset(utterance_id)
+    
+    def reset(self, utterance_id: int):
+        """
+        Repart d'un nouvel énoncé.
+        
+        Args:
+            utterance_id: Identifiant du nouvel énoncé
+        """
+        self.utterance_id = utterance_id
+        self.committed: List[Word] = []
+        self._hypotheses: Deque[List[Word]] = deque(maxlen=self.passes - 1)
+    
+    @property
+    def committed_end(self) -> float:
+        """Fin du dernier mot validé (secondes), point de coupe du buffer."""
+        return self.committed[-1].end if self.committed else 0.0
+    
+    @property
+    def committed_text(self) -> str:
+        """Texte validé (stable, ne sera plus révisé)."""
+        return " ".join(word.text for word in self.committed)
+    
+    @property
+    def tail(self) -> List[Word]:
+        """Mots de la dernière hypothèse non encore validés."""
+        return self._hypotheses[-1] if self._hypotheses else []
+    
+    @property
+    def tail_text(self) -> str:
+        """Texte provisoire (peut encore changer)."""
+        return " ".join(word.text for word in self.tail)
+    
+    def trim_samples(self, sample_rate: int) -> int:
+        """
+        Nombre d'échantillons déjà validés à retirer du début du buffer.
+        
+        Args:
+            sample_rate: Fréquence de l'audio
+        
+        Returns:
+            Offset d'échantillons du buffer restant à décoder
+        """
+        return int(self.committed_end * sample_rate)
+    
+    def update(self, words: List[Word]) -> List[Word]:
+        """
+        Intègre une nouvelle hypothèse et valide le préfixe stable.
+        
+        Args:
+            words: Hypothèse de la passe (temps absolus dans l'énoncé)
+        
+        Returns:
+            Mots nouvellement validés
+        """
+        hypothesis = self._strip_committed(words)
+        
+        newly_committed: List[Word] = []
+        if len(self._hypotheses) == self._hypotheses.maxlen:
+            for index, word in enumerate(hypothesis):
+                if any(
+                    index >= len(previous) or previous[index].key != word.key
+                    for previous in self._hypotheses
+                ):
+                    break
+                newly_committed.append(word)
+        
+        if newly_committed:
+            self.committed.extend(newly_committed)
+            # Les hypothèses précédentes sont relatives à l'ancien point de coupe
+            self._hypotheses = deque(
+                [self._strip_committed(previous) for previous in self._hypotheses],
+                maxlen=self.passes - 1
+            )
+            hypothesis = hypothesis[len(newly_committed):]
+        
+        self._hypotheses.append(hypothesis)
+        return newly_committed
+    
+    def _strip_committed(self, words: List[Word]) -> List[Word]:
+        """
+        Retire d'une hypothèse les mots déjà validés.
+        
+        Args:
+            words: Hypothèse brute
+        
+        Returns:
+            Hypothèse limitée à l'audio non validé
+        """
+        if not self.committed:
+            return list(words)
+        
+        # Mots qui commencent avant le point de coupe (tolérance 100ms)
+        boundary = self.committed_end - 0.1
+        remaining = [word for word in words if word.start >= boundary]
+        
+        # Whisper répète souvent le(s) dernier(s) mot(s) validé(s) au raccord
+        committed_keys = [word.key for word in self.committed]
+        for size in range(min(self.MAX_OVERLAP_WORDS, len(committed_keys), len(remaining)), 0, -1):
+            if committed_keys[-size:] == [word.key for word in remaining[:size]]:
+                return remaining[size:]
+        
+        return remaining
+    
+    @property
+    def full_text(self) -> str:
+        """Texte complet connu pour l'énoncé (validé + provisoire)."""
+        return " ".join(part for part in (self.committed_text, self.tail_text) if part)
@@ -0,0 +1,339 @@
+"""
+THE CLOSER PRO V25 - Metrics Registry
+Registre unifié de métriques (compteurs, jauges, histogrammes) alimenté par
+les composants du pipeline, et endpoint HTTP local au format texte
+Prometheus pour suivre une session en direct (queues, chunks perdus, RTF,
+latence d'inférence).
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import bisect
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Bornes par défaut des histogrammes de latence (secondes)
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+
+def _format_value(value: float) -> str:
+    """Formate une valeur selon le format texte Prometheus."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur de label."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Construit le bloc {label="valeur",...} (vide si aucun label)."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Famille de métriques: un nom, une aide et une valeur par combinaison de labels."""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = lock
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Clé de série à partir des labels fournis."""
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Metric {self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+    
+    def _samples(self) -> List[str]:
+        """Lignes d'échantillons (appelé sous verrou)."""
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+    
+    def render(self) -> List[str]:
+        """
+        Exposition texte de la famille.
+        
+        Returns:
+            Lignes HELP, TYPE et échantillons
+        """
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+
+class Counter(_Metric):
+    """Compteur monotone."""
+    
+    kind = "counter"
+    
+    def inc(self, amount: float = 1.0, **labels):
+        """
+        Incrémente le compteur.
+        
+        Args:
+            amount: Incrément (positif)
+            **labels: Valeurs des labels
+        """
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} cannot decrease")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def set_total(self, value: float, **labels):
+        """
+        Aligne le compteur sur un total cumulé tenu par un composant.
+        
+        Args:
+            value: Total depuis le démarrage
+            **labels: Valeurs des labels
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Gauge(_Metric):
+    """Valeur instantanée (profondeur de queue, RTF, VRAM...)."""
+    
+    kind = "gauge"
+    
+    def set(self, value: float, **labels):
+        """
+        Fixe la valeur de la jauge.
+        
+        Args:
+            value: Valeur courante
+            **labels: Valeurs des labels
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """Histogramme cumulatif à bornes fixes (buckets « le »)."""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str],
+        lock: threading.Lock,
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help_text, labels, lock)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+    
+    def observe(self, value: float, **labels):
+        """
+        Ajoute une observation.
+        
+        Args:
+            value: Valeur observée (secondes pour une latence)
+            **labels: Valeurs des labels
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+    
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques de l'application.
+    
+    Les composants publient de deux façons:
+    - à l'événement (ex: latence d'inférence observée dans un histogramme)
+    - par collecteur: fonction appelée à chaque lecture, qui recopie les
+      compteurs déjà tenus par le composant (get_stats) dans le registre
+    """
+    
+    def __init__(self):
+        """Initialise un registre vide."""
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+    
+    def _get_or_create(self, cls, name: str, help_text: str, labels: Sequence[str], **kwargs) -> _Metric:
+        """Retourne la famille existante ou la crée (type et labels doivent concorder)."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, self._lock, **kwargs)
+            elif type(metric) is not cls or metric.label_names != tuple(labels):
+                raise ValueError(f"Metric {name} already registered as {metric.kind} {metric.label_names}")
+            return metric
+    
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        """Retourne (ou crée) un compteur."""
+        return self._get_or_create(Counter, name, help_text, labels)
+    
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        """Retourne (ou crée) une jauge."""
+        return self._get_or_create(Gauge, name, help_text, labels)
+    
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Retourne (ou crée) un histogramme."""
+        return self._get_or_create(Histogram, name, help_text, labels, buckets=buckets)
+    
+    def register_collector(self, collector: Callable[["MetricsRegistry"], None]):
+        """
+        Enregistre une fonction de publication appelée avant chaque lecture.
+        
+        Args:
+            collector: Fonction collector(registry), typiquement component.publish_metrics
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+    
+    def collect(self):
+        """Exécute les collecteurs (une erreur n'interrompt pas les autres)."""
+        with self._lock:
+            collectors = list(self._collectors)
+        
+        for collector in collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                logger.error(f"Metrics collector {collector} failed: {e}", exc_info=True)
+    
+    def render(self) -> str:
+        """
+        Collecte puis sérialise toutes les métriques au format texte Prometheus.
+        
+        Returns:
+            Exposition texte (version 0.0.4)
+        """
+        self.collect()
+        
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._metrics):
+                lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serveur HTTP local exposant le registre sur /metrics (thread démon).
+    """
+    
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Initialise le serveur.
+        
+        Args:
+            registry: Registre à exposer
+            host: Adresse d'écoute (localhost par défaut)
+            port: Port d'écoute
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Démarre l'écoute en arrière-plan."""
+        if self._server is not None:
+            return
+        
+        registry = self.registry
+        
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = registry.render().encode("utf-8")
+                except Exception as e:
+                    logger.error(f"Metrics rendering failed: {e}", exc_info=True)
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                logger.debug("Metrics scrape: " + format % args)
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics endpoint on http://{self.host}:{self.port}/metrics")
+    
+    def stop(self):
+        """Arrête le serveur."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=2.0)
+        self._server = None
+        self._thread = None
+
+
+# Singleton getter
+_registry_instance: Optional[MetricsRegistry] = None
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Retourne l'instance singleton du registre de métriques."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = MetricsRegistry()
+    return _registry_instance
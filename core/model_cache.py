@@ -0,0 +1,81 @@
+"""
+THE CLOSER PRO V25 - Model Cache
+Résolution des modèles Whisper depuis le cache local vérifié: aucun accès
+réseau au démarrage quand le modèle est déjà présent et complet, et un
+cache incomplet (téléchargement interrompu) est détecté avant le chargement.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+# Fichiers indispensables d'un modèle CTranslate2 faster-whisper
+REQUIRED_FILES = ("model.bin", "config.json", "tokenizer.json")
+VOCABULARY_FILES = ("vocabulary.json", "vocabulary.txt")
+
+logger = logging.getLogger(__name__)
+
+
+def verify_model_dir(path: str) -> bool:
+    """
+    Vérifie qu'un répertoire contient un modèle complet.
+    
+    Args:
+        path: Répertoire du modèle
+    
+    Returns:
+        True si tous les fichiers requis sont présents et non vides
+    """
+    directory = Path(path)
+    if not directory.is_dir():
+        return False
+    
+    for name in REQUIRED_FILES:
+        file = directory / name
+        if not file.is_file() or file.stat().st_size == 0:
+            return False
+    
+    return any((directory / name).is_file() for name in VOCABULARY_FILES)
+
+
+def resolve_model_path(model_name: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Retourne le répertoire local d'un modèle, en privilégiant le cache.
+    
+    Un chemin local est vérifié tel quel. Un nom de modèle ("large-v3", ...)
+    est d'abord cherché dans le cache Hugging Face sans réseau; s'il est
+    absent ou incomplet, il est téléchargé puis vérifié.
+    
+    Args:
+        model_name: Nom du modèle ou chemin d'un répertoire CTranslate2
+        cache_dir: Cache Hugging Face (défaut: cache utilisateur)
+    
+    Returns:
+        Chemin du répertoire du modèle
+    
+    Raises:
+        RuntimeError: Modèle introuvable ou incomplet après téléchargement
+    """
+    if Path(model_name).is_dir():
+        if not verify_model_dir(model_name):
+            raise RuntimeError(f"Model directory {model_name} is incomplete")
+        return model_name
+    
+    from faster_whisper.utils import download_model
+    
+    try:
+        path = download_model(model_name, local_files_only=True, cache_dir=cache_dir)
+        if verify_model_dir(path):
+            logger.info(f"Model {model_name} loaded from local cache {path}")
+            return path
+        logger.warning(f"Cached model {model_name} is incomplete - downloading again")
+    except Exception as e:
+        logger.info(f"Model {model_name} not in local cache ({e}) - downloading")
+    
+    path = download_model(model_name, cache_dir=cache_dir)
+    if not verify_model_dir(path):
+        raise RuntimeError(f"Downloaded model {model_name} is incomplete ({path})")
+    return path
@@ -0,0 +1,571 @@
+"""
+THE CLOSER PRO V25 - Multi Stream Manager
+Gestion asynchrone de N canaux audio indépendants (VOUS, CLIENT, manager en
+écoute, clients d'un appel de groupe). Une queue bornée, un assembleur et un
+worker par canal; l'inférence reste partagée (batcher du transcripteur).
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import asyncio
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Optional, Callable, Dict, List, Sequence
+from datetime import datetime, timedelta
+import logging
+
+from config.manager import BackpressureConfig, BleedConfig, UtteranceConfig
+from core.backpressure import StreamQueue
+from core.bleed_suppressor import BleedSuppressor
+from core.utterance_assembler import UtteranceAssembler, Utterance
+from core.voice_activity import frame_count
+from core.resampler import PolyphaseResampler, WHISPER_SAMPLE_RATE
+from core.latency_tracer import NULL_TRACE
+
+# Nombre maximal de canaux capturés
+MAX_CHANNELS = 8
+
+
+def channel_name(index: int) -> str:
+    """
+    Nom stable d'un canal (identifiant des assembleurs, métriques et énoncés).
+    
+    Args:
+        index: Index du canal capturé
+    
+    Returns:
+        "LEFT", "RIGHT", puis "CH3", "CH4"...
+    """
+    return ("LEFT", "RIGHT")[index] if index < 2 else f"CH{index + 1}"
+
+
+@dataclass
+class AudioStream:
+    """Représente un flux audio mono avec métadonnées."""
+    data: np.ndarray
+    timestamp: datetime  # Premier échantillon du flux
+    channel: str  # "LEFT", "RIGHT", "CH3"...
+    duration: float
+    sample_rate: int
+    utterance_id: int = 0
+    is_partial: bool = False  # Audio d'un énoncé encore en cours
+    trace: Any = NULL_TRACE  # Trace de latence (chunk puis énoncé qu'il termine)
+    voiced: Optional[np.ndarray] = None  # Décisions VAD par trame calculées à la capture
+    speaker: str = ""  # Locuteur du canal ("VOUS", "CLIENT", "MANAGER"...)
+    enqueued_at: float = 0.0  # perf_counter à l'entrée en queue (échéance de délestage)
+
+
+@dataclass
+class StreamStats:
+    """Statistiques par canal."""
+    total_duration: float = 0.0
+    active_speech_duration: float = 0.0
+    segments_count: int = 0
+    last_activity: Optional[datetime] = None
+    
+    @property
+    def talk_percentage(self) -> float:
+        """Calcule le pourcentage de temps de parole."""
+        if self.total_duration == 0:
+            return 0.0
+        return (self.active_speech_duration / self.total_duration) * 100
+
+
+@dataclass
+class StreamChannel:
+    """État d'un canal: queue bornée, assembleur, statistiques et worker."""
+    index: int
+    name: str
+    speaker: str
+    queue: StreamQueue
+    assembler: UtteranceAssembler
+    stats: StreamStats = field(default_factory=StreamStats)
+    worker: Optional[asyncio.Task] = None
+
+
+class MultiStreamManager:
+    """
+    Gestionnaire de flux audio multi-canaux.
+    Chaque canal capturé est traité de manière totalement indépendante.
+    
+    Chaque canal passe par un UtteranceAssembler: le callback ne reçoit
+    que des énoncés complets (ou flushés), jamais les chunks bruts de 0.5s.
+    Le locuteur du canal voyage avec l'énoncé (AudioStream.speaker).
+    
+    Le rééchantillonnage vers 16kHz est fait une seule fois, au découpage,
+    pour tous les canaux à la fois: tout l'aval travaille en 16kHz mono float32.
+    
+    Un canal qui n'est qu'une copie atténuée d'un autre (fuite du micro,
+    mono dupliqué) est marqué non voisé avant l'assemblage (BleedSuppressor).
+    
+    Les queues ont un budget de latence: en retard, elles délestent selon la
+    politique configurée (StreamQueue) au lieu de bloquer le thread audio.
+    
+    Optionnellement, un callback partiel reçoit l'audio de l'énoncé en
+    cours après chaque chunk voisé (hypothèses incrémentales). Il tourne en
+    tâche de fond et est sauté si le précédent du canal n'est pas terminé.
+    """
+    
+    # Durée max d'un énoncé = buffer_duration du profil de performance x ratio
+    UTTERANCE_BUFFER_RATIO = 3.0
+    
+    def __init__(
+        self,
+        speakers: Sequence[str],
+        callback: Callable[[AudioStream], asyncio.Future],
+        max_queue_size: int = 50,
+        sample_rate: int = 48000,
+        utterance_config: Optional[UtteranceConfig] = None,
+        output_sample_rate: int = WHISPER_SAMPLE_RATE,
+        partial_callback: Optional[Callable[[AudioStream], asyncio.Future]] = None,
+        bleed_config: Optional[BleedConfig] = None,
+        backpressure_config: Optional[BackpressureConfig] = None
+    ):
+        """
+        Initialise le gestionnaire multi-canaux.
+        
+        Args:
+            speakers: Locuteur de chaque canal capturé, dans l'ordre des canaux
+            callback: Fonction async appelée pour chaque énoncé terminé (tous canaux)
+            max_queue_size: Taille maximale de chaque queue
+            sample_rate: Fréquence d'échantillonnage de la capture
+            utterance_config: Paramètres d'endpointing des énoncés
+            output_sample_rate: Fréquence des flux transmis aux canaux (16kHz pour Whisper)
+            partial_callback: Fonction async pour les énoncés en cours (None = désactivé)
+            bleed_config: Paramètres de suppression de la diaphonie entre canaux
+            backpressure_config: Politique de délestage et budget de latence des queues
+        """
+        if not 1 <= len(speakers) <= MAX_CHANNELS:
+            raise ValueError(f"Expected 1 to {MAX_CHANNELS} channels, got {len(speakers)}")
+        
+        self.callback = callback
+        self.partial_callback = partial_callback
+        self.input_sample_rate = sample_rate
+        self.sample_rate = output_sample_rate
+        self.backpressure = backpressure_config or BackpressureConfig()
+        utterance_config = utterance_config or UtteranceConfig()
+        
+        # Un canal par locuteur: queue bornée et assembleur dédiés
+        self.channels: List[StreamChannel] = [
+            StreamChannel(
+                index=index,
+                name=channel_name(index),
+                speaker=speaker,
+                queue=StreamQueue(max_queue_size, self.backpressure, utterance_config.hangover_duration),
+                assembler=UtteranceAssembler(channel_name(index), output_sample_rate, utterance_config)
+            )
+            for index, speaker in enumerate(speakers)
+        ]
+        self._by_name: Dict[str, StreamChannel] = {channel.name: channel for channel in self.channels}
+        
+        # Rééchantillonneur multi-canaux à état (continuité entre chunks)
+        self._resampler = PolyphaseResampler(sample_rate, output_sample_rate, channels=len(self.channels))
+        
+        # Un canal copie d'un autre (fuite micro, mono dupliqué) n'est pas décodé deux fois
+        self.bleed = BleedSuppressor(output_sample_rate, bleed_config, [channel.name for channel in self.channels])
+        
+        self._partial_tasks: Dict[str, asyncio.Task] = {}
+        self._channel_mismatch_logged = False
+        self._is_running = False
+        self._pending_submits = 0  # Soumissions en attente d'une queue pleine ('block')
+        
+        self.logger = logging.getLogger(__name__)
+        
+        # Session tracking
+        self._session_start: Optional[datetime] = None
+    
+    def channel(self, name: str) -> StreamChannel:
+        """
+        Retourne un canal par son nom.
+        
+        Args:
+            name: "LEFT", "RIGHT", "CH3"...
+        
+        Returns:
+            StreamChannel
+        """
+        return self._by_name[name]
+    
+    async def start(self):
+        """Démarre les workers de traitement asynchrone."""
+        if self._is_running:
+            raise RuntimeError(f"{type(self).__name__} already running")
+        
+        self._is_running = True
+        self._session_start = datetime.now()
+        
+        # Un worker indépendant par canal
+        for channel in self.channels:
+            channel.worker = asyncio.create_task(self._process_channel(channel))
+        
+        self.logger.info(
+            f"{type(self).__name__} started - {len(self.channels)} channels "
+            f"({', '.join(channel.speaker for channel in self.channels)}), zero-overlap mode active"
+        )
+    
+    async def stop(self):
+        """Arrête proprement les workers."""
+        if not self._is_running:
+            return
+        
+        self._is_running = False
+        
+        # Attendre que les queues se vident
+        await asyncio.gather(*(channel.queue.join() for channel in self.channels))
+        
+        # Abandonner les hypothèses partielles en vol (le final fait foi)
+        for task in self._partial_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._partial_tasks.values(), return_exceptions=True)
+        self._partial_tasks.clear()
+        
+        # Émettre les énoncés en cours
+        for channel in self.channels:
+            pending = channel.assembler.flush()
+            if pending:
+                await self._dispatch(pending, channel)
+        
+        # Annuler les workers
+        for channel in self.channels:
+            if channel.worker:
+                channel.worker.cancel()
+                try:
+                    await channel.worker
+                except asyncio.CancelledError:
+                    pass
+                channel.worker = None
+        
+        self.logger.info(f"{type(self).__name__} stopped")
+    
+    def _conform_channels(self, data: np.ndarray) -> np.ndarray:
+        """
+        Adapte le chunk capturé au nombre de canaux configurés.
+        Canaux manquants (fallback mono): copies du premier canal, écartées
+        ensuite comme diaphonie. Canaux en trop: ignorés.
+        
+        Args:
+            data: Audio [échantillons] ou [échantillons, canaux]
+        
+        Returns:
+            Audio [échantillons, canaux configurés]
+        """
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        
+        expected = len(self.channels)
+        received = data.shape[1]
+        if received == expected:
+            return data
+        
+        if not self._channel_mismatch_logged:
+            self._channel_mismatch_logged = True
+            if received < expected:
+                self.logger.warning(
+                    f"{received}-channel audio for {expected} configured channels - "
+                    f"duplicating channel 1 to the missing channels"
+                )
+            else:
+                self.logger.warning(f"{received}-channel audio detected - using first {expected}")
+        
+        if received > expected:
+            return data[:, :expected]
+        missing = np.repeat(data[:, :1], expected - received, axis=1)
+        return np.concatenate((data, missing), axis=1)
+    
+    async def submit_chunk(
+        self,
+        data: np.ndarray,
+        timestamp: datetime,
+        trace=NULL_TRACE,
+        voice=None
+    ):
+        """
+        Soumet un chunk multi-canaux et le sépare en un flux par canal.
+        
+        Args:
+            data: Audio [échantillons, canaux] ou mono [échantillons], float32 ou int16
+            timestamp: Fin du chunk (dernier échantillon), comme l'horodatent les sources
+            trace: Trace de latence du chunk (LatencyTracer)
+            voice: VoiceActivity du chunk (VAD de capture), réutilisée par les assembleurs
+        """
+        if not self._is_running:
+            # Arrêt en cours: le dernier chunk d'une source pas encore arrêtée est abandonné
+            if self._session_start is not None:
+                self.logger.debug("Chunk submitted after stop - dropped")
+                return
+            raise RuntimeError(f"{type(self).__name__} not running")
+        
+        trace.mark("loop_hop")
+        
+        # Les sources horodatent la fin du bloc, les flux et assembleurs son début
+        timestamp -= timedelta(seconds=data.shape[0] / self.input_sample_rate)
+        
+        # Capture int16 (mode ring) -> float32 normalisé
+        if data.dtype == np.int16:
+            data = data.astype(np.float32) / 32768.0
+        
+        # Rééchantillonnage de tous les canaux en une passe (48kHz -> 16kHz)
+        resampled = self._resampler.process(self._conform_channels(data))
+        duration = resampled.shape[0] / self.sample_rate
+        
+        voiced = [voice.channel(channel.index) if voice is not None else None for channel in self.channels]
+        
+        # Diaphonie: les canaux copies d'un autre sont marqués non voisés avant l'assemblage
+        if voice is not None:
+            active = np.array([decisions.any() for decisions in voiced])
+        else:
+            active = np.sqrt(np.mean(np.square(resampled), axis=0)) > self.channels[0].assembler.config.energy_threshold
+        bleed = self.bleed.check(resampled, active)
+        for index in bleed.suppressed:
+            voiced[index] = np.zeros(
+                frame_count(resampled.shape[0], self.channels[index].assembler.frame_length), dtype=bool
+            )
+        
+        trace.mark("split")
+        
+        # Un flux contigu par canal (copie: les flux survivent au chunk), une branche de trace chacun
+        streams = [
+            AudioStream(
+                data=np.ascontiguousarray(resampled[:, channel.index]),
+                timestamp=timestamp,
+                channel=channel.name,
+                duration=duration,
+                sample_rate=self.sample_rate,
+                trace=trace.fork(),
+                voiced=voiced[channel.index],
+                speaker=channel.speaker
+            )
+            for channel in self.channels
+        ]
+        
+        # Soumission aux queues indépendantes: attente ('block') ou délestage, jamais d'empilement
+        if self.backpressure.policy == "block":
+            self._pending_submits += 1
+            try:
+                await asyncio.gather(*(
+                    channel.queue.put(stream) for channel, stream in zip(self.channels, streams)
+                ))
+            finally:
+                self._pending_submits -= 1
+            return
+        
+        for channel, stream in zip(self.channels, streams):
+            shed = channel.queue.offer(stream)
+            if shed:
+                self.logger.debug(f"{channel.name} over latency budget - shed {shed:.2f}s")
+    
+    async def _process_channel(self, channel: StreamChannel):
+        """
+        Worker d'un canal: assemble les énoncés et les transmet au callback.
+        
+        Args:
+            channel: Canal traité
+        """
+        # À l'arrêt, le worker vide encore sa queue (stop() attend join()) et
+        # libère les soumissions bloquées sur une queue pleine
+        while self._is_running or self._pending_submits or not channel.queue.empty():
+            try:
+                stream = await channel.queue.get()
+                stream.trace.mark("stream_queue")
+                
+                # Accumuler jusqu'à la fin d'un énoncé
+                for utterance in channel.assembler.push(stream.data, stream.timestamp, stream.voiced):
+                    await self._dispatch(utterance, channel, stream.trace)
+                
+                self._dispatch_partial(channel)
+                
+                channel.stats.total_duration += stream.duration
+                channel.queue.task_done()
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Error in {channel.name} stream worker: {e}", exc_info=True)
+                channel.queue.task_done()
+    
+    async def _dispatch(self, utterance: Utterance, channel: StreamChannel, trace=NULL_TRACE):
+        """
+        Transmet un énoncé terminé au callback.
+        
+        Args:
+            utterance: Énoncé produit par l'assembleur
+            channel: Canal de l'énoncé (statistiques à mettre à jour)
+            trace: Trace du chunk qui a terminé l'énoncé
+        """
+        trace = trace.fork()
+        trace.mark("assembly")
+        
+        stream = AudioStream(
+            data=utterance.data,
+            timestamp=utterance.timestamp,
+            channel=utterance.channel,
+            duration=utterance.duration,
+            sample_rate=utterance.sample_rate,
+            utterance_id=utterance.utterance_id,
+            trace=trace,
+            speaker=channel.speaker
+        )
+        
+        try:
+            await self.callback(stream)
+        except Exception as e:
+            self.logger.error(f"Error in {utterance.channel} callback: {e}", exc_info=True)
+        
+        channel.stats.active_speech_duration += utterance.duration
+        channel.stats.segments_count += 1
+        channel.stats.last_activity = utterance.timestamp
+    
+    def _dispatch_partial(self, channel: StreamChannel):
+        """
+        Lance une hypothèse partielle sur l'énoncé en cours (sans bloquer le worker).
+        
+        Args:
+            channel: Canal dont l'énoncé est en cours
+        """
+        assembler = channel.assembler
+        if self.partial_callback is None or not assembler.in_speech:
+            return
+        
+        # Le décodage précédent n'est pas fini: la prochaine passe verra plus d'audio
+        running = self._partial_tasks.get(channel.name)
+        if running and not running.done():
+            return
+        
+        data = assembler.current_audio()
+        stream = AudioStream(
+            data=data,
+            timestamp=assembler.current_start,
+            channel=channel.name,
+            duration=len(data) / self.sample_rate,
+            sample_rate=self.sample_rate,
+            utterance_id=assembler.utterance_id,
+            is_partial=True,
+            speaker=channel.speaker
+        )
+        
+        async def _run():
+            try:
+                await self.partial_callback(stream)
+            except Exception as e:
+                self.logger.error(f"Error in {stream.channel} partial callback: {e}", exc_info=True)
+        
+        self._partial_tasks[channel.name] = asyncio.create_task(_run())
+    
+    def get_talk_ratio(self) -> dict:
+        """
+        Calcule la répartition du temps de parole entre locuteurs.
+        
+        Returns:
+            Dict avec durée et pourcentage par locuteur, et les raccourcis VOUS/CLIENT
+        """
+        durations: Dict[str, float] = {}
+        for channel in self.channels:
+            durations[channel.speaker] = durations.get(channel.speaker, 0.0) + channel.stats.active_speech_duration
+        total_speech = sum(durations.values())
+        
+        def percentage(speaker: str) -> float:
+            return (durations.get(speaker, 0.0) / total_speech) * 100 if total_speech else 0.0
+        
+        return {
+            "speakers": {
+                speaker: {"duration": duration, "percentage": percentage(speaker)}
+                for speaker, duration in durations.items()
+            },
+            "vous_percentage": percentage("VOUS"),
+            "client_percentage": percentage("CLIENT"),
+            "vous_duration": durations.get("VOUS", 0.0),
+            "client_duration": durations.get("CLIENT", 0.0),
+            "total_duration": total_speech
+        }
+    
+    def get_queue_health(self) -> dict:
+        """
+        Retourne l'état de santé des queues pour le self-healing.
+        
+        Returns:
+            Dict avec la profondeur de chaque queue, la capacité et la pression
+            (attente du plus ancien chunk / budget de latence, >= 1: délestage)
+        """
+        pressure = max(channel.queue.pressure for channel in self.channels)
+        return {
+            "queue_sizes": {channel.name: channel.queue.qsize() for channel in self.channels},
+            "max_queue_size": self.channels[0].queue.maxsize,
+            "pressure": pressure,
+            "is_healthy": pressure < 1 and not any(channel.queue.full() for channel in self.channels)
+        }
+    
+    def get_backpressure_stats(self) -> dict:
+        """
+        Retourne le délestage par canal.
+        
+        Returns:
+            Dict {nom du canal: {policy, shed_chunks, shed_seconds, shed_silence_seconds,
+            max_lag_seconds, pressure}}
+        """
+        return {channel.name: channel.queue.get_stats() for channel in self.channels}
+    
+    def publish_metrics(self, registry):
+        """
+        Publie la profondeur des queues, le délestage, les compteurs d'énoncés et la diaphonie écartée par canal.
+        
+        Args:
+            registry: MetricsRegistry
+        """
+        depth = registry.gauge("closer_stream_queue_depth", "Chunks en attente par canal", ("channel",))
+        capacity = registry.gauge("closer_stream_queue_capacity", "Capacité des queues de canal")
+        utterances = registry.counter("closer_utterances_total", "Énoncés finalisés", ("channel",))
+        forced = registry.counter("closer_utterances_forced_total", "Énoncés coupés à la durée maximale", ("channel",))
+        discarded = registry.counter("closer_utterances_discarded_total", "Énoncés trop courts ignorés", ("channel",))
+        skipped = registry.gauge("closer_audio_skipped_ratio", "Part de l'audio jamais envoyée au modèle", ("channel",))
+        bleed = registry.counter(
+            "closer_bleed_suppressed_seconds_total", "Audio écarté comme diaphonie d'un autre canal", ("channel",)
+        )
+        shed = registry.counter("closer_stream_shed_seconds_total", "Audio délesté hors budget de latence", ("channel",))
+        max_lag = registry.gauge("closer_stream_max_lag_seconds", "Attente maximale observée en queue", ("channel",))
+        pressure = registry.gauge("closer_stream_pressure", "Attente du plus ancien chunk / budget de latence", ("channel",))
+        
+        capacity.set(self.channels[0].queue.maxsize)
+        for channel in self.channels:
+            depth.set(channel.queue.qsize(), channel=channel.name)
+            metrics = channel.assembler.metrics
+            utterances.set_total(metrics.utterances_count, channel=channel.name)
+            forced.set_total(metrics.forced_flushes, channel=channel.name)
+            discarded.set_total(metrics.discarded_count, channel=channel.name)
+            skipped.set(metrics.skipped_fraction, channel=channel.name)
+            shed.set_total(channel.queue.shed_seconds, channel=channel.name)
+            max_lag.set(channel.queue.max_lag, channel=channel.name)
+            pressure.set(channel.queue.pressure, channel=channel.name)
+        for name, seconds in self.bleed.get_stats()["suppressed_seconds"].items():
+            bleed.set_total(seconds, channel=name)
+    
+    def apply_performance_profile(self, profile):
+        """
+        Applique un profil de performance aux assembleurs.
+        La durée maximale d'un énoncé suit le buffer_duration du profil
+        (UTTERANCE_BUFFER_RATIO fois), sans dépasser la durée configurée.
+        
+        Args:
+            profile: PerformanceProfile du GPUSelfHealingManager
+        """
+        for channel in self.channels:
+            assembler = channel.assembler
+            max_duration = min(
+                assembler.config.max_duration,
+                profile.buffer_duration * self.UTTERANCE_BUFFER_RATIO
+            )
+            assembler.max_samples = int(self.sample_rate * max_duration)
+        
+        self.logger.info(
+            f"Profile {profile.profile_name} applied - max utterance {max_duration:.1f}s"
+        )
+    
+    def get_utterance_metrics(self) -> dict:
+        """
+        Retourne les métriques d'endpointing par canal.
+        
+        Returns:
+            Dict {nom du canal: {...}} (énoncés/s, durée moyenne, latence d'endpoint,
+            part d'audio ignorée)
+        """
+        return {channel.name: channel.assembler.get_metrics() for channel in self.channels}
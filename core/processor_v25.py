@@ -8,10 +8,102 @@ Version: 2.5.0 (Elite)
 """
 
 import re
-from typing import List, Set
-from rapidfuzz import fuzz
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Set
+from rapidfuzz import fuzz, process
 import logging
 
+from core.text_annotation import annotate
+
+# Extraction d'entités: patterns compilés une fois
+ENTITY_PRICE_PATTERNS = [
+    re.compile(r'(\d+(?:[.,]\d+)?)\s*(?:€|euros?|EUR)', re.IGNORECASE),
+    re.compile(r'(?:\$|dollars?|USD)\s*(\d+(?:[.,]\d+)?)', re.IGNORECASE),
+    re.compile(r'(\d+)\s*(?:mille|millions?|milliards?)', re.IGNORECASE)
+]
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b(?:0[1-9](?:\s?\d{2}){4})\b')
+
+
+@dataclass(frozen=True)
+class HallucinationMatch:
+    """Pattern d'hallucination reconnu dans un texte."""
+    pattern: str
+    score: float  # 100 pour une correspondance exacte
+    kind: str  # "exact" ou "fuzzy"
+
+
+def max_inexact_partial_ratio(pattern_length: int) -> float:
+    """
+    Score partial_ratio maximal d'un pattern qui n'est PAS sous-chaîne du texte
+    (texte au moins aussi long): au mieux une fenêtre à une édition près.
+    
+    Args:
+        pattern_length: Longueur du pattern
+    
+    Returns:
+        Borne supérieure du score (0-100)
+    """
+    if pattern_length <= 1:
+        return 0.0
+    return 200.0 * (pattern_length - 1) / (2 * pattern_length - 1)
+
+
+class HallucinationMatcher:
+    """
+    Recherche multi-patterns construite une seule fois.
+    
+    - Passe exacte: une alternation compilée (un seul parcours du texte)
+    - Passe fuzzy: process.extractOne de rapidfuzz (boucle en C, arrêt au seuil)
+      avec élagage par longueur: un pattern court qui n'a pas matché
+      exactement ne peut pas dépasser le seuil sur un texte plus long
+    
+    Décisions identiques à la double boucle pattern par pattern.
+    """
+    
+    def __init__(self, patterns: Iterable[str], fuzzy_threshold: float):
+        """
+        Compile les patterns.
+        
+        Args:
+            patterns: Patterns en minuscules
+            fuzzy_threshold: Score fuzzy à dépasser strictement (0-100)
+        """
+        self.patterns = sorted(set(patterns), key=lambda p: (-len(p), p))
+        self.fuzzy_threshold = fuzzy_threshold
+        self._exact = re.compile("|".join(re.escape(p) for p in self.patterns))
+        
+        # Patterns que la passe fuzzy ne peut pas retenir sur un texte assez long
+        prunable = [p for p in self.patterns if max_inexact_partial_ratio(len(p)) <= fuzzy_threshold]
+        self._prune_min_length = max((len(p) for p in prunable), default=0)
+        self._fuzzy_all = self.patterns
+        self._fuzzy_pruned = [p for p in self.patterns if p not in prunable]
+    
+    def match(self, text_lower: str) -> Optional[HallucinationMatch]:
+        """
+        Cherche un pattern d'hallucination dans un texte.
+        
+        Args:
+            text_lower: Texte en minuscules
+        
+        Returns:
+            HallucinationMatch ou None
+        """
+        hit = self._exact.search(text_lower)
+        if hit:
+            return HallucinationMatch(hit.group(0), 100.0, "exact")
+        
+        choices = self._fuzzy_pruned if len(text_lower) >= self._prune_min_length else self._fuzzy_all
+        best = process.extractOne(
+            text_lower,
+            choices,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=self.fuzzy_threshold
+        )
+        if best and best[1] > self.fuzzy_threshold:
+            return HallucinationMatch(best[0], best[1], "fuzzy")
+        return None
+
 
 class EliteProcessor:
     """
@@ -62,6 +154,7 @@ class EliteProcessor:
         """
         self.fuzzy_threshold = fuzzy_threshold
         self.logger = logging.getLogger(__name__)
+        self.matcher = HallucinationMatcher(self.HALLUCINATION_PATTERNS, fuzzy_threshold)
         
         # Historique pour détection de répétitions
         self.recent_texts: List[str] = []
@@ -131,22 +224,16 @@ class EliteProcessor:
         if not text or len(text) < 2:
             return True
         
-        text_lower = text.lower()
+        segment = annotate(text)
         
-        # 1. Vérification des patterns exacts
-        for pattern in self.HALLUCINATION_PATTERNS:
-            if pattern in text_lower:
-                self.logger.debug(f"Hallucination detected (pattern): {pattern} in {text}")
-                self.total_filtered += 1
-                return True
-        
-        # 2. Vérification fuzzy contre les patterns connus
-        for pattern in self.HALLUCINATION_PATTERNS:
-            similarity = fuzz.partial_ratio(pattern, text_lower)
-            if similarity > self.fuzzy_threshold:
-                self.logger.debug(f"Hallucination detected (fuzzy {similarity}%): {text}")
-                self.total_filtered += 1
-                return True
+        # 1-2. Patterns connus (exacts puis fuzzy)
+        match = self.matcher.match(segment.lower)
+        if match:
+            self.logger.debug(
+                f"Hallucination detected ({match.kind} {match.score:.0f}%): {match.pattern} in {text}"
+            )
+            self.total_filtered += 1
+            return True
         
         # 3. Détection de répétitions (perroquet)
         if self._is_repetitive(text):
@@ -155,8 +242,7 @@ class EliteProcessor:
             return True
         
         # 4. Texte trop court (probable bruit)
-        words = text.split()
-        if len(words) == 1 and len(text) < 3:
+        if len(segment.tokens) == 1 and len(text) < 3:
             return True
         
         # 5. Texte entièrement en majuscules (souvent du spam)
@@ -211,8 +297,10 @@ class EliteProcessor:
         if not text:
             return False
         
-        words = text.lower().split()
-        meaningful_words = [w for w in words if w not in self.STOP_WORDS and len(w) > 2]
+        meaningful_words = [
+            token.lower for token in annotate(text).tokens
+            if token.lower not in self.STOP_WORDS and len(token.lower) > 2
+        ]
         
         return len(meaningful_words) >= min_words
     
@@ -234,35 +322,26 @@ class EliteProcessor:
             "phones": []
         }
         
-        # Prix (€, $, euros, dollars)
-        price_patterns = [
-            r'(\d+(?:[.,]\d+)?)\s*(?:€|euros?|EUR)',
-            r'(?:\$|dollars?|USD)\s*(\d+(?:[.,]\d+)?)',
-            r'(\d+)\s*(?:mille|millions?|milliards?)'
-        ]
-        for pattern in price_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            entities["prices"].extend(matches)
+        segment = annotate(text)
+        
+        # Prix, emails et téléphones demandent un chiffre ou un '@'
+        if segment.digit_runs:
+            # Prix (€, $, euros, dollars)
+            for pattern in ENTITY_PRICE_PATTERNS:
+                entities["prices"].extend(pattern.findall(text))
+            
+            # Téléphones (formats français)
+            entities["phones"].extend(PHONE_PATTERN.findall(text))
         
         # Nombres importants (3+ chiffres)
-        numbers = re.findall(r'\b\d{3,}\b', text)
-        entities["numbers"].extend(numbers)
+        entities["numbers"].extend(segment.numbers(min_digits=3))
         
         # Emails
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        entities["emails"].extend(emails)
-        
-        # Téléphones (formats français)
-        phones = re.findall(r'\b(?:0[1-9](?:\s?\d{2}){4})\b', text)
-        entities["phones"].extend(phones)
+        if "@" in text:
+            entities["emails"].extend(EMAIL_PATTERN.findall(text))
         
-        # Noms propres (mots capitalisés)
-        words = text.split()
-        for i, word in enumerate(words):
-            if word and word[0].isupper() and len(word) > 2:
-                # Éviter les débuts de phrase
-                if i > 0 and not words[i-1].endswith('.'):
-                    entities["names"].append(word)
+        # Noms propres (mots capitalisés, hors débuts de phrase)
+        entities["names"].extend(segment.names)
         
         return entities
     
@@ -311,6 +390,23 @@ class EliteProcessor:
             "clean_rate_percent": clean_rate
         }
     
+    def publish_metrics(self, registry):
+        """
+        Publie les compteurs de nettoyage et de filtrage.
+        
+        Args:
+            registry: MetricsRegistry
+        """
+        registry.counter(
+            "closer_processor_texts_total", "Textes traités par le processeur"
+        ).set_total(self.total_processed)
+        registry.counter(
+            "closer_processor_filtered_total", "Textes rejetés (hallucinations, répétitions)"
+        ).set_total(self.total_filtered)
+        registry.counter(
+            "closer_processor_cleaned_total", "Textes modifiés par le nettoyage"
+        ).set_total(self.total_cleaned)
+    
     def reset_history(self):
         """Réinitialise l'historique de répétitions."""
         self.recent_texts.clear()
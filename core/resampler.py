@@ -0,0 +1,170 @@
+"""
+THE CLOSER PRO V25 - Polyphase Resampler
+Rééchantillonnage polyphase avec état (48kHz -> 16kHz pour Whisper).
+Filtre anti-repliement, continuité entre chunks, vectorisé sur tous les canaux.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import numpy as np
+from math import gcd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Fréquence attendue par Whisper
+WHISPER_SAMPLE_RATE = 16000
+
+
+def design_lowpass(up: int, down: int, taps_per_phase: int, beta: float = 8.0) -> np.ndarray:
+    """
+    Conçoit le filtre passe-bas anti-repliement (sinc fenêtré Kaiser).
+    
+    Args:
+        up: Facteur d'interpolation L
+        down: Facteur de décimation M
+        taps_per_phase: Nombre de coefficients par sous-filtre polyphase
+        beta: Paramètre de la fenêtre Kaiser (atténuation en bande coupée)
+    
+    Returns:
+        Filtre de longueur up * taps_per_phase (gain up en bande passante)
+    """
+    num_taps = up * taps_per_phase
+    # Coupure légèrement sous Nyquist de la fréquence la plus basse
+    cutoff = 0.9 / max(up, down)
+    
+    n = np.arange(num_taps) - (num_taps - 1) / 2.0
+    taps = cutoff * np.sinc(cutoff * n) * np.kaiser(num_taps, beta)
+    taps *= up / taps.sum()
+    return taps
+
+
+class PolyphaseResampler:
+    """
+    Rééchantillonneur rationnel L/M à état, pour un flux découpé en chunks.
+    
+    La sortie n correspond à l'entrée floor(n*M/L) filtrée par le sous-filtre
+    de phase (n*M) mod L. Les K-1 derniers échantillons d'entrée et les
+    compteurs sont conservés d'un appel à l'autre: traiter un signal en
+    plusieurs chunks donne exactement le même résultat qu'en un seul bloc.
+    
+    Pour 48kHz -> 16kHz (L=1, M=3), c'est un décimateur pur: seule une
+    sortie sur trois est calculée.
+    """
+    
+    def __init__(
+        self,
+        input_rate: int,
+        output_rate: int = WHISPER_SAMPLE_RATE,
+        channels: int = 1,
+        taps_per_phase: int = 64
+    ):
+        """
+        Initialise le rééchantillonneur.
+        
+        Args:
+            input_rate: Fréquence d'entrée (Hz)
+            output_rate: Fréquence de sortie (Hz)
+            channels: Nombre de canaux traités simultanément
+            taps_per_phase: Longueur des sous-filtres (qualité vs coût)
+        """
+        if input_rate <= 0 or output_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+        
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.channels = channels
+        
+        divisor = gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        self.taps_per_phase = taps_per_phase
+        
+        # Sous-filtres inversés: phases[p] · x[i-K+1..i] = sum_k h[p + kL] x[i-k]
+        taps = design_lowpass(self.up, self.down, taps_per_phase)
+        self._phases = np.ascontiguousarray(
+            taps.reshape(taps_per_phase, self.up).T[:, ::-1], dtype=np.float32
+        )
+        
+        self.reset()
+    
+    @property
+    def is_passthrough(self) -> bool:
+        """True si les fréquences d'entrée et de sortie sont identiques."""
+        return self.up == self.down
+    
+    def reset(self):
+        """Réinitialise l'état (historique et compteurs)."""
+        self._history = np.zeros((self.taps_per_phase - 1, self.channels), dtype=np.float32)
+        self._input_count = 0
+        self._output_count = 0
+    
+    def process(self, data: np.ndarray) -> np.ndarray:
+        """
+        Rééchantillonne le chunk suivant du flux.
+        
+        Args:
+            data: Audio float32 (shape: [frames, channels] ou [frames] si mono)
+        
+        Returns:
+            Audio rééchantillonné float32, même disposition que l'entrée
+        """
+        mono = data.ndim == 1
+        block = data.reshape(-1, 1) if mono else data
+        
+        if block.shape[1] != self.channels:
+            raise ValueError(f"Expected {self.channels} channels, got {block.shape[1]}")
+        
+        if self.is_passthrough:
+            return data.astype(np.float32, copy=False)
+        
+        block = block.astype(np.float32, copy=False)
+        frames = len(block)
+        chunk_start = self._input_count
+        self._input_count += frames
+        
+        # Sorties dont l'échantillon d'entrée courant est disponible
+        first = self._output_count
+        last = -(-self._input_count * self.up // self.down)
+        self._output_count = last
+        
+        buffer = np.concatenate((self._history, block))
+        self._history = buffer[len(buffer) - (self.taps_per_phase - 1):].copy()
+        
+        if last <= first:
+            return np.empty((0,) if mono else (0, self.channels), dtype=np.float32)
+        
+        positions = np.arange(first, last, dtype=np.int64) * self.down
+        input_index = positions // self.up - chunk_start
+        
+        # windows: [positions_valides, channels, K]
+        windows = sliding_window_view(buffer, self.taps_per_phase, axis=0)
+        
+        if self.up == 1:
+            # Décimation entière: un seul sous-filtre, produit matriciel direct
+            start = int(input_index[0])
+            selected = windows[start:start + len(input_index) * self.down:self.down]
+            output = selected @ self._phases[0]
+        else:
+            phase = positions % self.up
+            output = np.einsum("nck,nk->nc", windows[input_index], self._phases[phase])
+        
+        return output[:, 0] if mono else output
+
+
+def resample(data: np.ndarray, input_rate: int, output_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Rééchantillonne un segment isolé (sans état entre appels).
+    
+    Args:
+        data: Audio mono ou multi-canaux (shape: [frames] ou [frames, channels])
+        input_rate: Fréquence d'entrée (Hz)
+        output_rate: Fréquence de sortie (Hz)
+    
+    Returns:
+        Audio rééchantillonné float32
+    """
+    if input_rate == output_rate:
+        return data.astype(np.float32, copy=False)
+    
+    channels = 1 if data.ndim == 1 else data.shape[1]
+    return PolyphaseResampler(input_rate, output_rate, channels).process(data)
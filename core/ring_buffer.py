@@ -0,0 +1,130 @@
+"""
+THE CLOSER PRO V25 - Audio Ring Buffer
+Buffer circulaire préalloué multi-canaux, single-producer / single-consumer.
+Le callback PortAudio n'effectue qu'une copie mémoire; le consommateur lit des vues.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+
+class AudioRingBuffer:
+    """
+    Ring buffer lock-free SPSC pour la capture audio.
+    
+    Le producteur (callback audio) est le seul à écrire `_write_index`, le
+    consommateur le seul à écrire `_read_index`. Les deux index sont des
+    compteurs monotones de frames: la position physique est `index % capacity`.
+    Sous le GIL, la publication d'un entier est atomique, et le producteur ne
+    publie son index qu'après la copie: aucun verrou n'est nécessaire.
+    """
+    
+    def __init__(self, capacity_frames: int, channels: int, dtype=np.float32):
+        """
+        Initialise le buffer circulaire.
+        
+        Args:
+            capacity_frames: Capacité en frames (échantillons par canal)
+            channels: Nombre de canaux
+            dtype: Type des échantillons (np.float32 ou np.int16)
+        """
+        if capacity_frames <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        
+        self.capacity = capacity_frames
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        
+        self._buffer = np.zeros((capacity_frames, channels), dtype=self.dtype)
+        
+        # Compteurs monotones (frames)
+        self._write_index = 0
+        self._read_index = 0
+        
+        # Frames perdues faute de place (écrites par le producteur uniquement)
+        self.overrun_frames = 0
+    
+    def write(self, block: np.ndarray) -> int:
+        """
+        Copie un bloc dans le buffer (côté producteur uniquement).
+        Les frames qui ne tiennent pas sont comptées comme overrun et perdues.
+        
+        Args:
+            block: Données (shape: [frames, channels])
+        
+        Returns:
+            Nombre de frames effectivement écrites
+        """
+        frames = len(block)
+        free = self.capacity - (self._write_index - self._read_index)
+        
+        if frames > free:
+            self.overrun_frames += frames - free
+            frames = free
+            if frames == 0:
+                return 0
+        
+        position = self._write_index % self.capacity
+        first = min(frames, self.capacity - position)
+        
+        self._buffer[position:position + first] = block[:first]
+        if frames > first:
+            self._buffer[:frames - first] = block[first:frames]
+        
+        # Publication après la copie
+        self._write_index += frames
+        return frames
+    
+    def available(self) -> int:
+        """Nombre de frames prêtes à être lues."""
+        return self._write_index - self._read_index
+    
+    def read_views(self, frames: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Retourne des vues zéro-copie sur les prochaines frames (côté consommateur).
+        Les vues restent valides jusqu'à l'appel de `advance()`.
+        
+        Args:
+            frames: Nombre de frames souhaitées (borné par `available()`)
+        
+        Returns:
+            (vue principale, vue de rebouclage ou None)
+        """
+        frames = min(frames, self.available())
+        position = self._read_index % self.capacity
+        first = min(frames, self.capacity - position)
+        
+        head = self._buffer[position:position + first]
+        tail = self._buffer[:frames - first] if frames > first else None
+        return head, tail
+    
+    def read_block(self, frames: int) -> np.ndarray:
+        """
+        Retourne un bloc contigu de frames: vue si possible, copie si rebouclage.
+        
+        Args:
+            frames: Nombre de frames souhaitées
+        
+        Returns:
+            Tableau (shape: [frames, channels])
+        """
+        head, tail = self.read_views(frames)
+        if tail is None:
+            return head
+        return np.concatenate((head, tail))
+    
+    def advance(self, frames: int):
+        """
+        Libère des frames lues (côté consommateur uniquement).
+        
+        Args:
+            frames: Nombre de frames consommées
+        """
+        self._read_index += min(frames, self.available())
+    
+    def reset(self):
+        """Vide le buffer (uniquement quand le flux est arrêté)."""
+        self._read_index = self._write_index
@@ -0,0 +1,209 @@
+"""
+THE CLOSER PRO V25 - Real-Time Factor Controller
+Décide des changements de profil de performance à partir de ce qui compte
+vraiment: l'inférence suit-elle la parole? (RTF, profondeur de queue, lag)
+Fonctionne à l'identique sur CPU et GPU.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional
+
+
+@dataclass
+class LoadSnapshot:
+    """État de charge agrégé sur la fenêtre glissante."""
+    rtf: float  # Temps de traitement / durée audio (p90 de la fenêtre)
+    lag: float  # Retard bout-en-bout max de la fenêtre (secondes)
+    queue_fill: float  # Remplissage max des queues (0-1)
+    samples: int  # Énoncés mesurés dans la fenêtre
+    pressure: float = 0.0  # Attente en queue / budget de latence (>= 1: délestage)
+    
+    @property
+    def is_empty(self) -> bool:
+        """True si aucune mesure n'est disponible."""
+        return self.samples == 0
+
+
+class RealtimeFactorController:
+    """
+    Contrôleur de profil avec hystérésis.
+    
+    - Surcharge (RTF p90 > overload_rtf, lag > max_lag, queues > max_queue_fill
+      ou pression > max_pressure): passage immédiat à un profil plus rapide
+      (hors cooldown), avant que les queues ne délestent.
+    - Marge confortable (RTF p90 < headroom_rtf, lag, queues et pression bas) soutenue
+      pendant `headroom_hold` secondes: passage à un profil plus qualitatif.
+    
+    L'écart entre les deux seuils et la durée de maintien évitent l'oscillation
+    entre deux profils voisins.
+    """
+    
+    def __init__(
+        self,
+        window_size: int = 20,
+        overload_rtf: float = 0.9,
+        headroom_rtf: float = 0.4,
+        max_lag: float = 3.0,
+        max_queue_fill: float = 0.5,
+        max_pressure: float = 0.5,
+        headroom_hold: float = 30.0,
+        cooldown: float = 10.0,
+        queue_health_provider: Optional[Callable[[], dict]] = None
+    ):
+        """
+        Initialise le contrôleur.
+        
+        Args:
+            window_size: Nombre d'énoncés dans la fenêtre glissante
+            overload_rtf: RTF au-delà duquel on accélère
+            headroom_rtf: RTF en deçà duquel on peut monter en qualité
+            max_lag: Retard bout-en-bout toléré (secondes)
+            max_queue_fill: Remplissage de queue toléré (0-1)
+            max_pressure: Attente en queue tolérée, en fraction du budget de latence
+            headroom_hold: Durée de marge soutenue avant montée en qualité (secondes)
+            cooldown: Délai minimal entre deux changements (secondes)
+            queue_health_provider: Fonction retournant MultiStreamManager.get_queue_health()
+        """
+        if headroom_rtf >= overload_rtf:
+            raise ValueError("headroom_rtf must be lower than overload_rtf (hysteresis)")
+        
+        self.overload_rtf = overload_rtf
+        self.headroom_rtf = headroom_rtf
+        self.max_lag = max_lag
+        self.max_queue_fill = max_queue_fill
+        self.max_pressure = max_pressure
+        self.headroom_hold = headroom_hold
+        self.cooldown = cooldown
+        self.queue_health_provider = queue_health_provider
+        
+        self.logger = logging.getLogger(__name__)
+        
+        self._rtf: Deque[float] = deque(maxlen=window_size)
+        self._lag: Deque[float] = deque(maxlen=window_size)
+        
+        self._headroom_since: Optional[float] = None
+        self._last_change: Optional[float] = None
+    
+    def record_utterance(self, audio_seconds: float, processing_seconds: float, lag_seconds: float):
+        """
+        Enregistre la mesure d'un énoncé transcrit.
+        
+        Args:
+            audio_seconds: Durée de l'audio
+            processing_seconds: Temps de traitement (attente de lot incluse)
+            lag_seconds: Retard entre la fin de l'énoncé et son résultat
+        """
+        if audio_seconds <= 0:
+            return
+        self._rtf.append(processing_seconds / audio_seconds)
+        self._lag.append(max(0.0, lag_seconds))
+    
+    def snapshot(self) -> LoadSnapshot:
+        """
+        Agrège les mesures de la fenêtre courante.
+        
+        Returns:
+            LoadSnapshot (RTF p90, lag max, remplissage et pression max des queues)
+        """
+        rtf = 0.0
+        if self._rtf:
+            ordered = sorted(self._rtf)
+            rtf = ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+        
+        queue_fill = 0.0
+        pressure = 0.0
+        if self.queue_health_provider:
+            health = self.queue_health_provider()
+            capacity = max(health.get("max_queue_size", 0), 1)
+            queue_fill = max(health["queue_sizes"].values(), default=0) / capacity
+            pressure = health.get("pressure", 0.0)
+        
+        return LoadSnapshot(
+            rtf=rtf,
+            lag=max(self._lag, default=0.0),
+            queue_fill=queue_fill,
+            samples=len(self._rtf),
+            pressure=pressure
+        )
+    
+    def decide(self, now: Optional[float] = None) -> Optional[str]:
+        """
+        Décide du prochain changement de profil.
+        
+        Args:
+            now: Horloge monotone (défaut: time.monotonic())
+        
+        Returns:
+            "up" (plus rapide), "down" (plus qualitatif) ou None
+        """
+        now = time.monotonic() if now is None else now
+        load = self.snapshot()
+        
+        overloaded = (
+            load.rtf > self.overload_rtf
+            or load.lag > self.max_lag
+            or load.queue_fill > self.max_queue_fill
+            or load.pressure > self.max_pressure
+        )
+        comfortable = (
+            not load.is_empty
+            and load.rtf < self.headroom_rtf
+            and load.lag < self.max_lag / 2
+            and load.queue_fill < self.max_queue_fill / 2
+            and load.pressure < self.max_pressure / 2
+        )
+        
+        if not comfortable:
+            self._headroom_since = None
+        elif self._headroom_since is None:
+            self._headroom_since = now
+        
+        if self._last_change is not None and now - self._last_change < self.cooldown:
+            return None
+        
+        if overloaded:
+            self.logger.warning(
+                f"Inference falling behind (RTF p90 {load.rtf:.2f}, lag {load.lag:.1f}s, "
+                f"queues {load.queue_fill * 100:.0f}%, pression {load.pressure:.2f})"
+            )
+            return "up"
+        
+        if self._headroom_since is not None and now - self._headroom_since >= self.headroom_hold:
+            return "down"
+        
+        return None
+    
+    def notify_change(self, now: Optional[float] = None):
+        """
+        Signale qu'un changement de profil a été appliqué.
+        Les mesures de l'ancien profil ne sont plus représentatives.
+        
+        Args:
+            now: Horloge monotone (défaut: time.monotonic())
+        """
+        self._last_change = time.monotonic() if now is None else now
+        self._headroom_since = None
+        self._rtf.clear()
+        self._lag.clear()
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne l'état du contrôleur.
+        
+        Returns:
+            Dict avec RTF p90, lag, remplissage et pression des queues
+        """
+        load = self.snapshot()
+        return {
+            "rtf_p90": load.rtf,
+            "max_lag_seconds": load.lag,
+            "queue_fill_percent": load.queue_fill * 100,
+            "queue_pressure": load.pressure,
+            "window_samples": load.samples
+        }
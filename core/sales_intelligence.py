@@ -9,10 +9,12 @@ Version: 0.25 (Elite Edition)
 
 import re
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Iterable, Optional, Set, Tuple
 from datetime import datetime
 import logging
 
+from core.text_annotation import AnnotatedSegment, annotate
+
 
 @dataclass
 class Budget:
@@ -51,6 +53,122 @@ class AgreementPoint:
     confidence: float  # 0-1
 
 
+def _strip_optional_prefix(pattern: str) -> str:
+    """
+    Retire les groupes optionnels (?:...)? en tête d'un pattern.
+    
+    Pour une simple recherche de présence, "(?:c'est )?cher" trouve un texte
+    si et seulement si "cher" le trouve; sans groupe optionnel en tête, le
+    moteur re saute directement aux occurrences du premier littéral.
+    
+    Args:
+        pattern: Pattern re
+    
+    Returns:
+        Pattern équivalent pour re.search
+    """
+    while pattern.startswith("(?:"):
+        depth, index, in_class, end = 0, 0, False, -1
+        while index < len(pattern):
+            char = pattern[index]
+            if char == "\\":
+                index += 2
+                continue
+            if in_class:
+                in_class = char != "]"
+            elif char == "[":
+                in_class = True
+            elif char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    end = index
+                    break
+            index += 1
+        
+        rest = pattern[end + 2:]
+        if end < 0 or pattern[end + 1:end + 2] != "?" or not rest or rest[0] in "?+|)":
+            break
+        pattern = rest
+    return pattern
+
+
+@dataclass
+class DetectionHits:
+    """Budgets, objections et accords trouvés dans un texte."""
+    budgets: List[re.Match] = field(default_factory=list)  # Ordre pattern puis position (group(1) = nombre)
+    objection_types: List[str] = field(default_factory=list)  # Dans l'ordre d'OBJECTION_PATTERNS
+    agreement_count: int = 0  # Patterns d'accord distincts présents
+
+
+class DetectionEngine:
+    """
+    Règles de détection compilées une seule fois, évaluées en un appel (scan).
+    
+    Une alternation unique de toutes les règles est plus lente sous CPython:
+    le moteur re y essaie chaque branche à chaque position, alors qu'un
+    pattern qui commence par un littéral saute directement à ses occurrences.
+    Chaque règle reste donc un pattern compilé:
+    - budgets: finditer par pattern (mêmes correspondances qu'avant)
+    - objections et accords: simple présence, groupes optionnels de tête
+      retirés (même résultat, recherche accélérée)
+    - chaque pattern d'accord n'est évalué qu'une fois (présence et confiance)
+    """
+    
+    def __init__(
+        self,
+        price_patterns: Iterable[str],
+        objection_patterns: Dict[str, Iterable[str]],
+        agreement_patterns: Iterable[str]
+    ):
+        """
+        Compile les règles.
+        
+        Args:
+            price_patterns: Patterns de montants (insensibles à la casse, groupe 1 = nombre)
+            objection_patterns: Patterns d'objection par type
+            agreement_patterns: Patterns d'accord
+        """
+        self._budgets = [re.compile(pattern, re.IGNORECASE) for pattern in price_patterns]
+        self._objections = [
+            (obj_type, [re.compile(_strip_optional_prefix(pattern)) for pattern in patterns])
+            for obj_type, patterns in objection_patterns.items()
+        ]
+        self._agreements = [re.compile(_strip_optional_prefix(pattern)) for pattern in agreement_patterns]
+    
+    def scan(self, text_lower: str, objections_only: bool = False) -> DetectionHits:
+        """
+        Cherche toutes les règles dans un texte.
+        
+        Args:
+            text_lower: Texte en minuscules
+            objections_only: Ne chercher que les objections (hypothèses partielles)
+        
+        Returns:
+            DetectionHits
+        """
+        hits = DetectionHits()
+        
+        for obj_type, patterns in self._objections:
+            for pattern in patterns:
+                if pattern.search(text_lower):
+                    hits.objection_types.append(obj_type)
+                    break
+        
+        if objections_only:
+            return hits
+        
+        for pattern in self._budgets:
+            hits.budgets.extend(pattern.finditer(text_lower))
+        
+        for pattern in self._agreements:
+            if pattern.search(text_lower):
+                hits.agreement_count += 1
+        
+        return hits
+
+
 class SalesIntelligence:
     """
     Moteur d'intelligence de vente.
@@ -132,117 +250,221 @@ class SalesIntelligence:
         
         # Cache pour éviter les doublons
         self._processed_texts: Set[str] = set()
+        
+        # Objections levées sur les partiels d'un énoncé encore ouvert: (speaker, id) -> type -> Objection
+        self._utterance_objections: Dict[Tuple[str, int], Dict[str, Objection]] = {}
+        # Dernier énoncé clos (final reçu ou écarté) par locuteur: les révisions tardives sont ignorées
+        self._closed_utterances: Dict[str, int] = {}
+        
+        # Règles de détection compilées une fois (budgets, objections, accords)
+        self.detector = DetectionEngine(self.PRICE_PATTERNS, self.OBJECTION_PATTERNS, self.AGREEMENT_PATTERNS)
     
     def analyze_text(
         self,
         text: str,
         speaker: str,
-        timestamp: Optional[datetime] = None
+        timestamp: Optional[datetime] = None,
+        is_final: bool = True,
+        utterance_id: Optional[int] = None
     ):
         """
         Analyse un texte et extrait toutes les informations.
         
+        Les hypothèses partielles et les textes provisoires (is_final=False)
+        ne déclenchent que la détection d'objections, pour alerter avant la
+        fin de la phrase; la version finale du même énoncé ne les compte pas
+        une seconde fois et retire celles qu'elle ne confirme pas. Un final
+        écarté doit être signalé par discard_utterance.
+        
         Args:
             text: Texte à analyser
             speaker: "VOUS" ou "CLIENT"
             timestamp: Timestamp du texte
+            is_final: False pour une révision partielle ou provisoire (peut encore changer)
+            utterance_id: Énoncé d'origine (déduplication partiels/provisoire/final)
         """
         if timestamp is None:
             timestamp = datetime.now()
         
-        # Éviter les doublons
+        segment = annotate(text)
+        text_lower = segment.lower
+        
+        raised = None
+        if utterance_id is not None:
+            if is_final:
+                raised = self._close_utterance(speaker, utterance_id)
+            elif utterance_id <= self._closed_utterances.get(speaker, -1):
+                # Révision arrivée après le final (ou l'abandon) de son énoncé
+                return
+            else:
+                raised = self._utterance_objections.setdefault((speaker, utterance_id), {})
+        
+        if not is_final:
+            if speaker == "CLIENT":
+                hits = self.detector.scan(text_lower, objections_only=True)
+                self._detect_objections(text, text_lower, timestamp, hits, raised)
+            return
+        
+        # Éviter les doublons (les objections des partiels ont déjà été comptées une fois)
         text_key = f"{speaker}:{text}"
         if text_key in self._processed_texts:
+            self._retract_objections(raised.values() if raised else ())
             return
         self._processed_texts.add(text_key)
         
-        text_lower = text.lower()
+        hits = self.detector.scan(text_lower)
         
         # Extraction des budgets/prix
-        self._extract_budgets(text, text_lower, speaker, timestamp)
+        self._extract_budgets(text, text_lower, speaker, timestamp, hits)
         
         # Détection des objections (seulement pour CLIENT)
         if speaker == "CLIENT":
-            self._detect_objections(text, text_lower, timestamp)
+            self._detect_objections(text, text_lower, timestamp, hits, raised)
+        
+        # Objections des partiels que le final ne confirme pas
+        if raised:
+            confirmed = hits.objection_types if speaker == "CLIENT" else ()
+            self._retract_objections(
+                objection for obj_type, objection in raised.items() if obj_type not in confirmed
+            )
         
         # Extraction des entités
-        self._extract_entities(text, speaker, timestamp)
+        self._extract_entities(segment, speaker, timestamp)
         
         # Détection des points d'accord
-        self._detect_agreements(text, text_lower, timestamp)
+        self._detect_agreements(text, timestamp, hits)
+    
+    def discard_utterance(self, speaker: str, utterance_id: int):
+        """
+        Clôt un énoncé dont le final est écarté (vide, filtré, hallucination):
+        les objections levées sur ses partiels sont retirées.
+        
+        Args:
+            speaker: "VOUS" ou "CLIENT"
+            utterance_id: Énoncé écarté
+        """
+        self._retract_objections(self._close_utterance(speaker, utterance_id).values())
+    
+    def _close_utterance(self, speaker: str, utterance_id: int) -> Dict[str, Objection]:
+        """
+        Clôt un énoncé et retourne les objections levées sur ses partiels.
+        
+        Les énoncés antérieurs du locuteur restés ouverts (final jamais reçu)
+        sont clos aussi, leurs objections non confirmées retirées.
+        
+        Args:
+            speaker: "VOUS" ou "CLIENT"
+            utterance_id: Énoncé clos
+        
+        Returns:
+            Type -> Objection levée sur un partiel de cet énoncé
+        """
+        self._closed_utterances[speaker] = max(utterance_id, self._closed_utterances.get(speaker, -1))
+        
+        stale = [key for key in self._utterance_objections if key[0] == speaker and key[1] < utterance_id]
+        for key in stale:
+            self._retract_objections(self._utterance_objections.pop(key).values())
+        
+        return self._utterance_objections.pop((speaker, utterance_id), {})
+    
+    def _retract_objections(self, objections: Iterable[Objection]):
+        """
+        Retire des objections levées sur des partiels non confirmés.
+        
+        Args:
+            objections: Objections à retirer
+        """
+        retracted = {id(objection) for objection in objections}
+        if not retracted:
+            return
+        
+        self.objections = [o for o in self.objections if id(o) not in retracted]
+        self.active_objections = [o for o in self.active_objections if id(o) not in retracted]
+        self.logger.info(f"{len(retracted)} unconfirmed partial objection(s) retracted")
     
     def _extract_budgets(
         self,
         text: str,
         text_lower: str,
         speaker: str,
-        timestamp: datetime
+        timestamp: datetime,
+        hits: DetectionHits
     ):
         """Extrait les montants et budgets."""
-        for pattern in self.PRICE_PATTERNS:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
+        for match in hits.budgets:
+            amount_str = match.group(1).replace(' ', '').replace(',', '.')
             
-            for match in matches:
-                amount_str = match.group(1).replace(' ', '').replace(',', '.')
+            try:
+                # Convertir en float
+                amount = float(amount_str)
+                
+                # Gérer les multiplicateurs (k, M)
+                if 'k' in text_lower[match.start():match.end()]:
+                    amount *= 1000
+                elif 'million' in text_lower[match.start():match.end()]:
+                    amount *= 1000000
+                
+                # Déterminer la devise
+                currency = "EUR"
+                if '$' in match.group(0) or 'dollar' in match.group(0):
+                    currency = "USD"
                 
-                try:
-                    # Convertir en float
-                    amount = float(amount_str)
-                    
-                    # Gérer les multiplicateurs (k, M)
-                    if 'k' in text_lower[match.start():match.end()].lower():
-                        amount *= 1000
-                    elif 'million' in text_lower[match.start():match.end()].lower():
-                        amount *= 1000000
-                    
-                    # Déterminer la devise
-                    currency = "EUR"
-                    if '$' in match.group(0) or 'dollar' in match.group(0).lower():
-                        currency = "USD"
-                    
-                    # Créer l'objet Budget
-                    budget = Budget(
-                        amount=amount,
-                        currency=currency,
-                        context=text,
-                        timestamp=timestamp,
-                        speaker=speaker
-                    )
-                    
-                    self.budgets.append(budget)
-                    self.logger.info(f"Budget detected: {amount} {currency} by {speaker}")
-                    
-                except ValueError:
-                    continue
+                # Créer l'objet Budget
+                budget = Budget(
+                    amount=amount,
+                    currency=currency,
+                    context=text,
+                    timestamp=timestamp,
+                    speaker=speaker
+                )
+                
+                self.budgets.append(budget)
+                self.logger.info(f"Budget detected: {amount} {currency} by {speaker}")
+                
+            except ValueError:
+                continue
     
     def _detect_objections(
         self,
         text: str,
         text_lower: str,
-        timestamp: datetime
+        timestamp: datetime,
+        hits: DetectionHits,
+        raised: Optional[Dict[str, Objection]] = None
     ):
-        """Détecte les objections dans le texte."""
-        for obj_type, patterns in self.OBJECTION_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    # Calculer la sévérité
-                    severity = self._calculate_objection_severity(text_lower, obj_type)
-                    
-                    objection = Objection(
-                        type=obj_type,
-                        text=text,
-                        timestamp=timestamp,
-                        severity=severity,
-                        resolved=False
-                    )
-                    
-                    self.objections.append(objection)
-                    self.active_objections.append(objection)
-                    
-                    self.logger.warning(
-                        f"Objection detected: {obj_type} (severity {severity}/5) - \"{text}\""
-                    )
-                    break
+        """
+        Détecte les objections dans le texte.
+        
+        Args:
+            hits: Résultat du DetectionEngine pour ce texte
+            raised: Objections déjà levées pour cet énoncé (mises à jour, pas dupliquées)
+        """
+        for obj_type in hits.objection_types:
+            # Calculer la sévérité
+            severity = self._calculate_objection_severity(text_lower, obj_type)
+            
+            # Déjà levée sur un partiel du même énoncé: on révise le texte
+            if raised is not None and obj_type in raised:
+                raised[obj_type].text = text
+                raised[obj_type].severity = max(raised[obj_type].severity, severity)
+                continue
+            
+            objection = Objection(
+                type=obj_type,
+                text=text,
+                timestamp=timestamp,
+                severity=severity,
+                resolved=False
+            )
+            
+            self.objections.append(objection)
+            self.active_objections.append(objection)
+            if raised is not None:
+                raised[obj_type] = objection
+            
+            self.logger.warning(
+                f"Objection detected: {obj_type} (severity {severity}/5) - \"{text}\""
+            )
     
     def _calculate_objection_severity(self, text: str, obj_type: str) -> int:
         """
@@ -277,58 +499,47 @@ class SalesIntelligence:
     
     def _extract_entities(
         self,
-        text: str,
+        segment: AnnotatedSegment,
         speaker: str,
         timestamp: datetime
     ):
         """Extrait les entités (noms, entreprises)."""
-        words = text.split()
-        
-        for i, word in enumerate(words):
-            # Noms propres (capitalisés)
-            if word and word[0].isupper() and len(word) > 2:
-                # Éviter les débuts de phrase
-                if i > 0 and not words[i-1].endswith('.'):
-                    # Vérifier si c'est potentiellement un nom
-                    if not word.lower() in ['le', 'la', 'les', 'un', 'une', 'des']:
-                        entity = Entity(
-                            type="nom",
-                            value=word,
-                            timestamp=timestamp,
-                            speaker=speaker
-                        )
-                        self.entities.append(entity)
+        # Noms propres (capitalisés, hors débuts de phrase)
+        for index in segment.name_tokens:
+            token = segment.tokens[index]
+            # Vérifier si c'est potentiellement un nom
+            if token.lower not in ['le', 'la', 'les', 'un', 'une', 'des']:
+                entity = Entity(
+                    type="nom",
+                    value=token.text,
+                    timestamp=timestamp,
+                    speaker=speaker
+                )
+                self.entities.append(entity)
     
     def _detect_agreements(
         self,
         text: str,
-        text_lower: str,
-        timestamp: datetime
+        timestamp: datetime,
+        hits: DetectionHits
     ):
         """Détecte les points d'accord."""
-        for pattern in self.AGREEMENT_PATTERNS:
-            if re.search(pattern, text_lower):
-                # Calculer la confiance
-                confidence = 0.7
-                
-                # Augmenter si plusieurs mots d'accord
-                agreement_count = sum(
-                    1 for p in self.AGREEMENT_PATTERNS 
-                    if re.search(p, text_lower)
-                )
-                confidence = min(1.0, 0.5 + (agreement_count * 0.2))
-                
-                agreement = AgreementPoint(
-                    description=text,
-                    timestamp=timestamp,
-                    confidence=confidence
-                )
-                
-                self.agreement_points.append(agreement)
-                self.last_agreement = agreement
-                
-                self.logger.info(f"Agreement detected (confidence {confidence:.0%}): \"{text}\"")
-                break
+        if not hits.agreement_count:
+            return
+        
+        # Confiance croissante avec le nombre de formules d'accord distinctes
+        confidence = min(1.0, 0.5 + (hits.agreement_count * 0.2))
+        
+        agreement = AgreementPoint(
+            description=text,
+            timestamp=timestamp,
+            confidence=confidence
+        )
+        
+        self.agreement_points.append(agreement)
+        self.last_agreement = agreement
+        
+        self.logger.info(f"Agreement detected (confidence {confidence:.0%}): \"{text}\"")
     
     def get_smart_summary(self) -> Dict:
         """
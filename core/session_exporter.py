@@ -38,7 +38,8 @@ class SessionExporter:
         transcriber_stats: Dict,
         gpu_stats: Dict,
         session_duration: float,
-        transcription_file: Optional[Path] = None
+        transcription_file: Optional[Path] = None,
+        latency_data: Optional[Dict] = None
     ) -> Path:
         """
         Exporte une session complète en JSON.
@@ -50,6 +51,7 @@ class SessionExporter:
             gpu_stats: Stats GPU
             session_duration: Durée de session (secondes)
             transcription_file: Fichier de transcription brute
+            latency_data: Latences par étape du pipeline (LatencyTracer)
         
         Returns:
             Path du fichier JSON généré
@@ -127,7 +129,8 @@ class SessionExporter:
                     "total_transcriptions": transcriber_stats["total_transcriptions"],
                     "average_inference_time": transcriber_stats["average_inference_time"],
                     "errors_count": transcriber_stats["errors_count"],
-                    "context_segments": transcriber_stats["context_segments"]
+                    "context_segments": transcriber_stats["context_segments"],
+                    "decoder_gating": transcriber_stats.get("gating")
                 },
                 
                 "gpu": {
@@ -136,7 +139,9 @@ class SessionExporter:
                     "average_vram_gb": gpu_stats["average_vram_gb"],
                     "total_adjustments": gpu_stats["total_adjustments"],
                     "lag_events": gpu_stats["lag_events"]
-                }
+                },
+                
+                "latency_by_stage_ms": latency_data or {}
             },
             
             "ai_recommendations": {
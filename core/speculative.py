@@ -0,0 +1,145 @@
+"""
+THE CLOSER PRO V25 - Speculative Transcription
+Métriques de la transcription à deux niveaux: un petit modèle affiche un
+texte provisoire quasi immédiat, le grand modèle le remplace par le texte
+final. Mesure les latences des deux niveaux et leur accord (WER).
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import re
+from collections import deque
+from typing import Deque, List
+
+
+def normalize_words(text: str) -> List[str]:
+    """
+    Découpe un texte en mots normalisés (minuscules, sans ponctuation).
+    
+    Args:
+        text: Texte brut
+    
+    Returns:
+        Liste de mots
+    """
+    return re.findall(r"[\w']+", text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Taux d'erreur mots (substitutions + insertions + suppressions) / mots de la référence.
+    
+    Args:
+        reference: Texte de référence (final)
+        hypothesis: Texte évalué (provisoire)
+    
+    Returns:
+        WER (0 = identiques; peut dépasser 1 si l'hypothèse est bien plus longue)
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    
+    # Distance d'édition sur les mots, une ligne à la fois
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    
+    return previous[-1] / len(ref)
+
+
+def _percentile(values: Deque[float], fraction: float) -> float:
+    """Percentile simple d'une fenêtre de mesures (0 si vide)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class SpeculativeStats:
+    """
+    Statistiques provisoire/final sur une fenêtre glissante.
+    
+    - Latence provisoire et finale: fin de l'énoncé -> texte disponible
+    - WER provisoire vs final: qualité du texte affiché en premier
+    - Provisoires en retard: final arrivé avant le brouillon (brouillon ignoré)
+    """
+    
+    def __init__(self, window_size: int = 200):
+        """
+        Initialise les statistiques.
+        
+        Args:
+            window_size: Nombre d'énoncés conservés pour les percentiles
+        """
+        self._draft_latency: Deque[float] = deque(maxlen=window_size)
+        self._final_latency: Deque[float] = deque(maxlen=window_size)
+        self._wer: Deque[float] = deque(maxlen=window_size)
+        
+        self.drafts_count = 0
+        self.finals_count = 0
+        self.compared_count = 0
+        self.exact_matches = 0
+        self.late_drafts = 0
+    
+    def record_draft(self, latency: float):
+        """Enregistre la latence d'un texte provisoire (secondes)."""
+        self.drafts_count += 1
+        self._draft_latency.append(latency)
+    
+    def record_final(self, latency: float):
+        """Enregistre la latence d'un texte final (secondes)."""
+        self.finals_count += 1
+        self._final_latency.append(latency)
+    
+    def record_agreement(self, draft_text: str, final_text: str) -> float:
+        """
+        Compare le texte provisoire au texte final du même énoncé.
+        
+        Args:
+            draft_text: Texte provisoire affiché
+            final_text: Texte final qui le remplace
+        
+        Returns:
+            WER du provisoire par rapport au final
+        """
+        wer = word_error_rate(final_text, draft_text)
+        self.compared_count += 1
+        self._wer.append(wer)
+        if wer == 0.0:
+            self.exact_matches += 1
+        return wer
+    
+    def record_late_draft(self):
+        """Signale un brouillon terminé après le final (non affiché)."""
+        self.late_drafts += 1
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne les métriques de la transcription spéculative.
+        
+        Returns:
+            Dict avec latences p50/p90, WER moyen et taux d'accord exact
+        """
+        mean_wer = sum(self._wer) / len(self._wer) if self._wer else 0.0
+        return {
+            "drafts_count": self.drafts_count,
+            "finals_count": self.finals_count,
+            "late_drafts": self.late_drafts,
+            "draft_latency_p50_ms": _percentile(self._draft_latency, 0.5) * 1000,
+            "draft_latency_p90_ms": _percentile(self._draft_latency, 0.9) * 1000,
+            "final_latency_p50_ms": _percentile(self._final_latency, 0.5) * 1000,
+            "final_latency_p90_ms": _percentile(self._final_latency, 0.9) * 1000,
+            "compared_count": self.compared_count,
+            "mean_wer": mean_wer,
+            "exact_match_rate": self.exact_matches / self.compared_count if self.compared_count else 0.0
+        }
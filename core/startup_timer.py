@@ -0,0 +1,131 @@
+"""
+THE CLOSER PRO V25 - Startup Timer
+Chronométrage des phases de démarrage, y compris les phases exécutées en
+parallèle (chargement du modèle pendant la détection audio et l'UI).
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class PhaseTiming:
+    """Durée d'une phase de démarrage."""
+    name: str
+    start: float  # Secondes depuis l'origine
+    duration: float  # Secondes
+    depth: int = 0  # 0 = phase, 1 = sous-phase
+    
+    @property
+    def end(self) -> float:
+        """Fin de la phase (secondes depuis l'origine)."""
+        return self.start + self.duration
+
+
+class StartupTimer:
+    """
+    Enregistre les phases de démarrage et produit un rapport.
+    
+    Les phases peuvent se chevaucher: le rapport donne la durée murale
+    totale et le temps gagné par le recouvrement.
+    """
+    
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Initialise le chronomètre.
+        
+        Args:
+            origin: Horloge perf_counter de référence (défaut: maintenant)
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: List[PhaseTiming] = []
+    
+    def record(self, name: str, started: float, ended: float, depth: int = 0):
+        """
+        Enregistre une phase mesurée ailleurs.
+        
+        Args:
+            name: Nom de la phase
+            started: perf_counter au début
+            ended: perf_counter à la fin
+            depth: Niveau d'imbrication (0 = phase)
+        """
+        self.phases.append(PhaseTiming(name, started - self.origin, ended - started, depth))
+    
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Chronomètre un bloc (synchrone ou contenant des await).
+        
+        Args:
+            name: Nom de la phase
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter())
+    
+    async def track(self, name: str, awaitable: Awaitable[T]) -> T:
+        """
+        Chronomètre une coroutine (typiquement lancée en tâche parallèle).
+        
+        Args:
+            name: Nom de la phase
+            awaitable: Coroutine à attendre
+        
+        Returns:
+            Résultat de la coroutine
+        """
+        with self.phase(name):
+            return await awaitable
+    
+    @property
+    def total(self) -> float:
+        """Durée murale du démarrage (secondes)."""
+        return max((p.end for p in self.phases), default=0.0)
+    
+    @property
+    def overlap_saved(self) -> float:
+        """Temps gagné par les phases parallèles (somme des phases - durée murale)."""
+        return max(0.0, sum(p.duration for p in self.phases if p.depth == 0) - self.total)
+    
+    def report(self) -> List[str]:
+        """
+        Rapport texte, une ligne par phase dans l'ordre de démarrage.
+        
+        Returns:
+            Lignes du rapport
+        """
+        lines = []
+        for phase in sorted(self.phases, key=lambda p: (p.start, p.depth)):
+            indent = "  " * (phase.depth + 1)
+            lines.append(
+                f"{indent}{phase.name:<{24 - 2 * phase.depth}} "
+                f"+{phase.start:6.2f}s  {phase.duration * 1000:8.0f}ms"
+            )
+        lines.append(f"  {'Total':<24} {self.total:7.2f}s (parallélisme: -{self.overlap_saved:.2f}s)")
+        return lines
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne les durées par phase.
+        
+        Returns:
+            Dict avec total, gain de recouvrement et phases (ms)
+        """
+        return {
+            "total_seconds": self.total,
+            "overlap_saved_seconds": self.overlap_saved,
+            "phases": [
+                {"name": p.name, "start_seconds": p.start, "duration_ms": p.duration * 1000, "depth": p.depth}
+                for p in self.phases
+            ]
+        }
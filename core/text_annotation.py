@@ -0,0 +1,129 @@
+"""
+THE CLOSER PRO V25 - Text Annotation
+Pré-passe unique sur le texte d'un énoncé: minuscules, mots avec positions,
+formes nettoyées, suites de chiffres, mots de devise et noms propres
+candidats. ContextMemory, EliteProcessor et SalesIntelligence lisent le même
+segment annoté au lieu de redécouper le texte chacun de leur côté.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+# Marqueurs de devise cherchés dans chaque mot (en minuscules)
+CURRENCY_MARKERS = ("€", "$", "euro", "dollar")
+
+_WORD = re.compile(r"\S+")
+_DIGITS = re.compile(r"\d+")
+
+
+def _is_word_char(char: str) -> bool:
+    """Caractère de mot au sens du module re (lettre, chiffre ou '_')."""
+    return char.isalnum() or char == "_"
+
+
+@dataclass(frozen=True)
+class Token:
+    """Mot du texte (découpage sur les espaces, comme str.split)."""
+    text: str
+    start: int  # Position dans le texte d'origine
+    end: int
+    lower: str
+    clean: str  # Sans ',' ni '.' (nombres: "1.500," -> "1500")
+    
+    @property
+    def is_number(self) -> bool:
+        """True si le mot n'est fait que de chiffres (séparateurs ',' et '.' ignorés)."""
+        return self.clean.isdigit()
+    
+    @property
+    def is_capitalized(self) -> bool:
+        """True si le mot commence par une majuscule et fait plus de 2 caractères."""
+        return len(self.text) > 2 and self.text[0].isupper()
+
+
+@dataclass(frozen=True)
+class AnnotatedSegment:
+    """Texte annoté, immuable et partagé entre les consommateurs."""
+    text: str
+    lower: str
+    tokens: Tuple[Token, ...]
+    digit_runs: Tuple[Tuple[int, int], ...]  # Suites de chiffres maximales (début, fin)
+    currency_tokens: Tuple[int, ...]  # Index des mots portant une devise
+    name_tokens: Tuple[int, ...]  # Index des mots capitalisés hors début de phrase
+    
+    @property
+    def words(self) -> Tuple[str, ...]:
+        """Mots du texte (équivalent de text.split())."""
+        return tuple(token.text for token in self.tokens)
+    
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Noms propres candidats, dans l'ordre du texte."""
+        return tuple(self.tokens[index].text for index in self.name_tokens)
+    
+    def numbers(self, min_digits: int = 1) -> Tuple[str, ...]:
+        """
+        Nombres isolés (suites de chiffres non collées à une lettre ou à '_').
+        
+        Args:
+            min_digits: Nombre minimal de chiffres
+        
+        Returns:
+            Nombres dans l'ordre du texte
+        """
+        text = self.text
+        return tuple(
+            text[start:end] for start, end in self.digit_runs
+            if end - start >= min_digits
+            and not (start > 0 and _is_word_char(text[start - 1]))
+            and not (end < len(text) and _is_word_char(text[end]))
+        )
+
+
+@lru_cache(maxsize=256)
+def annotate(text: str) -> AnnotatedSegment:
+    """
+    Annote un texte (résultat mis en cache: partiels, provisoire et final
+    d'un énoncé, ou texte nettoyé relu par plusieurs consommateurs).
+    
+    Args:
+        text: Texte d'un énoncé
+    
+    Returns:
+        AnnotatedSegment
+    """
+    lower = text.lower()
+    tokens = tuple(
+        Token(
+            text=match.group(0),
+            start=match.start(),
+            end=match.end(),
+            lower=match.group(0).lower(),
+            clean=match.group(0).replace(",", "").replace(".", "")
+        )
+        for match in _WORD.finditer(text)
+    )
+    
+    currency_tokens = tuple(
+        index for index, token in enumerate(tokens)
+        if any(marker in token.lower for marker in CURRENCY_MARKERS)
+    )
+    # Un mot capitalisé en début de texte ou après un point est un début de phrase
+    name_tokens = tuple(
+        index for index, token in enumerate(tokens)
+        if index > 0 and token.is_capitalized and not tokens[index - 1].text.endswith(".")
+    )
+    
+    return AnnotatedSegment(
+        text=text,
+        lower=lower,
+        tokens=tokens,
+        digit_runs=tuple(match.span() for match in _DIGITS.finditer(text)),
+        currency_tokens=currency_tokens,
+        name_tokens=name_tokens
+    )
@@ -9,17 +9,39 @@ Version: 2.5.0 (Elite)
 
 import asyncio
 import numpy as np
-import torch
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+import gc
+import time
 import logging
-from typing import Optional, Dict
-from datetime import datetime
-from dataclasses import dataclass
-from faster_whisper import WhisperModel
+from typing import TYPE_CHECKING, Optional, Dict, List, Sequence, Union
+from datetime import datetime, timedelta
+from pathlib import Path
+from dataclasses import dataclass, field
 
 from core.context_memory import ContextMemory
 from core.gpu_manager import GPUSelfHealingManager
+from core.resampler import resample, WHISPER_SAMPLE_RATE
+from core.inference_batcher import InferenceBatcher, InferenceRequest
+from core.local_agreement import LocalAgreement, Word
+from core.cpu_backend import CPUBackendConfig, CPUBackendTuner, physical_cores, resolve_device, synthetic_speech
+from core.model_cache import resolve_model_path
+from core.inference_pool import InferencePool, decode_utterance, decode_words
+from core.speculative import SpeculativeStats
+from core.decoder_gate import DecoderGate, SegmentSignals, compression_ratio
+from core.startup_timer import StartupTimer
+from core.latency_tracer import NULL_TRACE
+from core.metrics_registry import get_metrics_registry
 from config.manager import get_config
 
+# faster-whisper/ctranslate2 sont importés au chargement du modèle (démarrage rapide)
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+    from faster_whisper.tokenizer import Tokenizer
+
+# Fenêtre d'entrée de Whisper (30s à 16kHz)
+WHISPER_MAX_SAMPLES = 30 * WHISPER_SAMPLE_RATE
+
 
 @dataclass
 class TranscriptionResult:
@@ -30,6 +52,20 @@ class TranscriptionResult:
     duration: float
     confidence: float
     language: str = "fr"
+    utterance_id: Optional[int] = None
+    revision: str = "final"  # "partial", "provisional" (modèle rapide, sera remplacé) ou "final"
+    stable_text: str = ""  # Préfixe validé par accord entre passes (partiels)
+    segments: List[SegmentSignals] = field(default_factory=list)  # Segments retenus et signaux du décodeur
+    
+    @property
+    def is_final(self) -> bool:
+        """True si le texte ne sera plus révisé."""
+        return self.revision == "final"
+    
+    @property
+    def words(self) -> List[Word]:
+        """Mots horodatés de tous les segments (vide sans horodatage par mot)."""
+        return [word for segment in self.segments for word in segment.words]
 
 
 class EliteTranscriber:
@@ -68,57 +104,423 @@ class EliteTranscriber:
             adjustment_callback=self._on_performance_adjustment
         )
         
+        # Device effectif et réglage CPU (calibré à l'initialisation)
+        self.device = resolve_device(self.config.transcription.device)
+        self.cpu_backend: Optional[CPUBackendConfig] = None
+        self._worker_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Pool de processus (une réplique du modèle par worker), si configuré
+        self.pool: Optional[InferencePool] = None
+        
+        # Transcription spéculative: petit modèle pour le texte provisoire immédiat
+        self.draft_model: Optional["WhisperModel"] = None
+        self._draft_executor: Optional[ThreadPoolExecutor] = None
+        self._drafts: Dict[str, tuple] = {}  # speaker -> (utterance_id, texte provisoire)
+        self._final_ids: Dict[str, int] = {}  # speaker -> dernier énoncé finalisé
+        self.speculative = SpeculativeStats()
+        
+        # Filtrage par les signaux du décodeur, avant tout traitement de texte
+        self.gate = DecoderGate(self.config.gating)
+        
+        # Latence d'inférence publiée à chaque énoncé (endpoint de métriques)
+        self._inference_latency = get_metrics_registry().histogram(
+            "closer_inference_latency_seconds",
+            "Latence de transcription d'un énoncé final (attente + décodage)",
+            ("speaker",)
+        )
+        
         # Modèle Whisper
-        self.model: Optional[WhisperModel] = None
-        self._model_lock = asyncio.Lock()
+        self.model: Optional["WhisperModel"] = None
+        self._tokenizer: Optional["Tokenizer"] = None
+        self._tokenizer_model: Optional["WhisperModel"] = None
+        self._loaded_variant: Optional[tuple] = None  # (model_name, compute_type)
+        self._reload_task: Optional[asyncio.Task] = None
+        self._swapping = False  # Modèle libéré, remplaçant en cours de chargement
+        
+        # Batching inter-canaux (sérialise aussi l'accès au modèle)
+        self.batcher = InferenceBatcher(
+            runner=self._run_batch,
+            max_batch_size=self.config.transcription.max_batch_size,
+            batch_window=self.config.transcription.batch_window_ms / 1000.0
+        )
+        
+        # Streaming: état LocalAgreement de l'énoncé en cours, par locuteur
+        self._streams: Dict[str, LocalAgreement] = {}
         
         # Statistiques
         self.total_transcriptions = 0
         self.total_inference_time = 0.0
         self.errors_count = 0
+        self.partials_count = 0
+        self.committed_words = 0
         
         self._initialized = True
         self._is_running = False
     
-    async def initialize(self):
-        """Initialise le modèle et démarre les composants."""
+    async def initialize(self, timer: Optional[StartupTimer] = None):
+        """
+        Initialise le modèle et démarre les composants.
+        
+        Args:
+            timer: Chronomètre de démarrage (sous-phases enregistrées si fourni)
+        """
+        timer = timer or StartupTimer()
+        
         async with self._lock:
             if self._is_running:
                 return
             
-            self.logger.info("Initializing Elite Transcriber...")
+            self.logger.info(f"Initializing Elite Transcriber on {self.device}...")
+            
+            processes = self.config.transcription.inference_processes
+            
+            # CPU: réglage modèle/threads/workers (calibration ou cache)
+            if self.device == "cpu":
+                loop = asyncio.get_event_loop()
+                started = time.perf_counter()
+                self.cpu_backend = await loop.run_in_executor(None, self._tune_cpu_backend)
+                timer.record("cpu_tuning", started, time.perf_counter(), depth=1)
+                if self.cpu_backend.num_workers > 1 and processes == 0:
+                    self._worker_pool = ThreadPoolExecutor(
+                        max_workers=self.cpu_backend.num_workers,
+                        thread_name_prefix="WhisperWorker"
+                    )
             
-            # Charger le modèle Whisper
-            await self._load_model()
+            async def _load_main():
+                started = time.perf_counter()
+                if processes > 0:
+                    # Pool de processus: chaque worker charge sa réplique du modèle
+                    self.pool = InferencePool(
+                        num_workers=processes,
+                        model_options=self._pool_model_options(processes),
+                        vad_filter=self.config.transcription.vad_filter,
+                        word_timestamps=self.config.gating.word_timestamps
+                    )
+                    await self.pool.start()
+                    self._loaded_variant = self.pool.model_variant
+                    await self._attach_pool_tokenizer()
+                else:
+                    # Charger le modèle Whisper
+                    await self._load_model()
+                    
+                    # Démarrer le batcher d'inférence
+                    await self.batcher.start()
+                timer.record("model_load", started, time.perf_counter(), depth=1)
+            
+            async def _load_draft():
+                started = time.perf_counter()
+                await self._load_draft_model()
+                timer.record("draft_model_load", started, time.perf_counter(), depth=1)
+            
+            # Modèle provisoire (dans ce processus, hors batcher: n'attend jamais
+            # le grand modèle), chargé en parallèle du modèle principal
+            if self.config.transcription.draft_model:
+                await asyncio.gather(_load_main(), _load_draft())
+            else:
+                await _load_main()
             
             # Démarrer le GPU manager
+            started = time.perf_counter()
             await self.gpu_manager.start_monitoring()
+            timer.record("gpu_monitor", started, time.perf_counter(), depth=1)
             
             self._is_running = True
             self.logger.info("Elite Transcriber initialized successfully")
     
-    async def _load_model(self):
-        """Charge le modèle Whisper de manière asynchrone."""
+    async def _load_model(self, model_name: Optional[str] = None, compute_type: Optional[str] = None):
+        """
+        Charge le modèle Whisper de manière asynchrone.
+        
+        Args:
+            model_name: Modèle à charger (défaut: modèle configuré)
+            compute_type: Précision (défaut: précision configurée)
+        """
+        default_model, default_compute = self._default_variant()
+        model_name = model_name or default_model
+        compute_type = compute_type or default_compute
+        
+        # Threads/workers CPU issus de la calibration (défauts ctranslate2 sur GPU)
+        cpu_options = {}
+        if self.cpu_backend:
+            cpu_options = {
+                "cpu_threads": self.cpu_backend.cpu_threads,
+                "num_workers": self.cpu_backend.num_workers
+            }
+        
         def _load():
+            from faster_whisper import WhisperModel
             return WhisperModel(
-                self.config.transcription.model_name,
-                device=self.config.transcription.device,
-                compute_type=self.config.transcription.compute_type,
-                download_root=None,
-                local_files_only=False
+                resolve_model_path(model_name),
+                device=self.device,
+                compute_type=compute_type,
+                **cpu_options
             )
         
         # Charger dans un thread executor pour ne pas bloquer
         loop = asyncio.get_event_loop()
-        self.model = await loop.run_in_executor(None, _load)
+        model = await loop.run_in_executor(None, _load)
+        
+        # Remplacement atomique: les lots en cours gardent leur référence
+        self.model = model
+        self.context_memory.set_tokenizer(
+            lambda text: model.hf_tokenizer.encode(text, add_special_tokens=False).ids
+        )
+        self._loaded_variant = (model_name, compute_type)
+        
+        self.logger.info(f"Model {model_name} ({compute_type}) loaded on {self.device}")
+    
+    async def _load_draft_model(self):
+        """Charge le petit modèle du texte provisoire et son executor dédié."""
+        transcription = self.config.transcription
+        
+        def _load():
+            from faster_whisper import WhisperModel
+            return WhisperModel(
+                resolve_model_path(transcription.draft_model),
+                device=self.device,
+                compute_type=transcription.draft_compute_type
+            )
+        
+        try:
+            loop = asyncio.get_event_loop()
+            self.draft_model = await loop.run_in_executor(None, _load)
+        except Exception as e:
+            self.logger.error(f"Draft model {transcription.draft_model} unavailable - provisional text disabled: {e}")
+            return
+        
+        self._draft_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="WhisperDraft")
+        self.logger.info(
+            f"Draft model {transcription.draft_model} ({transcription.draft_compute_type}) loaded on {self.device}"
+        )
+    
+    async def warmup(self, timer: Optional[StartupTimer] = None, seconds: float = 2.0):
+        """
+        Décodage de préchauffage sur audio synthétique, avant la capture.
+        Le premier décodage (allocations, noyaux CUDA, caches) est le plus lent:
+        il ne doit pas tomber sur le premier énoncé du client. Hors statistiques.
+        
+        Args:
+            timer: Chronomètre de démarrage (sous-phases enregistrées si fourni)
+            seconds: Durée de l'audio de préchauffage
+        """
+        if not self.is_ready:
+            return
+        
+        timer = timer or StartupTimer()
+        audio = synthetic_speech(seconds)
+        transcription = self.config.transcription
+        loop = asyncio.get_event_loop()
+        
+        async def _warm_main():
+            started = time.perf_counter()
+            if self.pool:
+                # Une requête par worker (dispatch au moins chargé)
+                await asyncio.gather(*[
+                    self.pool.submit(audio, "", transcription.beam_size)
+                    for _ in range(self.pool.num_workers)
+                ])
+            else:
+                await loop.run_in_executor(None, self._transcribe_single, audio, "", transcription.beam_size)
+                if transcription.streaming_partials:
+                    await loop.run_in_executor(
+                        None, self._transcribe_words, audio, "", transcription.partial_beam_size
+                    )
+            timer.record("warmup_model", started, time.perf_counter(), depth=1)
+        
+        async def _warm_draft():
+            started = time.perf_counter()
+            await loop.run_in_executor(
+                self._draft_executor, decode_utterance, self.draft_model, audio, "", transcription.draft_beam_size
+            )
+            timer.record("warmup_draft", started, time.perf_counter(), depth=1)
         
-        self.logger.info(f"Model {self.config.transcription.model_name} loaded on {self.config.transcription.device}")
+        try:
+            if self.draft_model:
+                await asyncio.gather(_warm_main(), _warm_draft())
+            else:
+                await _warm_main()
+        except Exception as e:
+            self.logger.warning(f"Warm-up decode failed: {e}")
+    
+    async def _attach_pool_tokenizer(self):
+        """
+        Branche sur ContextMemory le tokenizer du modèle des workers du pool
+        (tokenizer.json seul, sans réplique du modèle dans ce processus):
+        les requêtes du pool reçoivent aussi des prompts en ids, dans le budget.
+        """
+        def _load():
+            from tokenizers import Tokenizer
+            path = Path(resolve_model_path(self.pool.model_variant[0])) / "tokenizer.json"
+            return Tokenizer.from_file(str(path)) if path.is_file() else None
+        
+        try:
+            tokenizer = await asyncio.get_running_loop().run_in_executor(None, _load)
+        except Exception as e:
+            tokenizer = None
+            self.logger.warning(f"Pool tokenizer unavailable: {e}")
+        
+        if tokenizer is None:
+            self.logger.warning("No tokenizer for the pool model - context prompts sent as text, token budget not enforced")
+            self.context_memory.set_tokenizer(None)
+            return
+        
+        self.context_memory.set_tokenizer(
+            lambda text: tokenizer.encode(text, add_special_tokens=False).ids
+        )
+    
+    def _pool_model_options(self, processes: int) -> Dict:
+        """
+        Arguments WhisperModel des workers du pool.
+        Sur CPU, les cœurs physiques sont répartis entre les processus.
+        
+        Args:
+            processes: Nombre de processus du pool
+        
+        Returns:
+            Dict d'arguments pour WhisperModel
+        """
+        model_name, compute_type = self._default_variant()
+        options = {
+            "model_size_or_path": model_name,
+            "device": self.device,
+            "compute_type": compute_type
+        }
+        if self.device == "cpu":
+            options["cpu_threads"] = max(1, physical_cores() // processes)
+            options["num_workers"] = 1
+        return options
+    
+    @property
+    def is_ready(self) -> bool:
+        """True si un modèle (local ou pool) peut décoder (ou le pourra à la fin d'un remplacement)."""
+        return (
+            self.model is not None
+            or self._swapping
+            or (self.pool is not None and self.pool.is_running)
+        )
+    
+    def _tune_cpu_backend(self) -> CPUBackendConfig:
+        """
+        Détermine la configuration CPU: valeurs explicites de la config,
+        sinon calibration (mise en cache pour les démarrages suivants).
+        
+        Returns:
+            CPUBackendConfig
+        """
+        transcription = self.config.transcription
+        tuner = CPUBackendTuner(
+            calibration_file=transcription.cpu_calibration_file,
+            model_candidates=transcription.cpu_model_candidates,
+            target_rtf=transcription.cpu_target_rtf,
+            beam_size=transcription.beam_size,
+            channels=len(self.config.audio.channel_speakers)
+        )
+        
+        if transcription.cpu_threads > 0 and transcription.num_workers > 0:
+            return CPUBackendConfig(
+                model_name=transcription.model_name,
+                compute_type="int8",
+                cpu_threads=transcription.cpu_threads,
+                num_workers=transcription.num_workers,
+                rtf=0.0,
+                cpu_signature=tuner.cpu_signature()
+            )
+        
+        return tuner.get_backend()
+    
+    def _default_variant(self) -> tuple:
+        """
+        Modèle et précision de base pour le device effectif.
+        
+        Returns:
+            (model_name, compute_type)
+        """
+        if self.cpu_backend:
+            return self.cpu_backend.model_name, self.cpu_backend.compute_type
+        return self.config.transcription.model_name, self.config.transcription.compute_type
+    
+    def _profile_variant(self, profile) -> tuple:
+        """
+        Modèle et précision demandés par un profil de performance.
+        Sur CPU, la calibration fait foi: seuls les réglages de décodage suivent le profil.
+        
+        Args:
+            profile: PerformanceProfile
+        
+        Returns:
+            (model_name, compute_type)
+        """
+        if self.device != "cuda":
+            return self._default_variant()
+        return profile.model_size or self.config.transcription.model_name, profile.compute_type
+    
+    async def _reload_model(self, model_name: str, compute_type: str, release_first: bool = False) -> bool:
+        """
+        Recharge le modèle pour un nouveau profil (en tâche de fond).
+        
+        Args:
+            model_name: Modèle à charger
+            compute_type: Précision
+            release_first: Libérer l'ancien modèle avant le chargement (VRAM saturée)
+        
+        Returns:
+            True si la variante demandée est chargée
+        """
+        try:
+            if self.pool:
+                await self.pool.reload(model_name, compute_type, release_first)
+                self._loaded_variant = self.pool.model_variant
+                await self._attach_pool_tokenizer()
+            elif release_first:
+                await self._swap_model(model_name, compute_type)
+            else:
+                await self._load_model(model_name, compute_type)
+            return True
+        except Exception as e:
+            self.logger.error(f"Model reload to {model_name} ({compute_type}) failed: {e}", exc_info=True)
+            return False
+    
+    async def _swap_model(self, model_name: str, compute_type: str):
+        """
+        Remplace le modèle en libérant l'ancien avant de charger le nouveau:
+        sous saturation VRAM, les deux ne tiennent pas ensemble. Le lot en
+        cours se termine d'abord; les requêtes suivantes attendent le nouveau
+        modèle dans le batcher.
+        
+        Args:
+            model_name: Modèle à charger
+            compute_type: Précision
+        """
+        previous = self._loaded_variant
+        async with self.batcher.model_lock:
+            self._swapping = True
+            try:
+                # Toutes les références au modèle (tokenizers compris) avant le ramasse-miettes
+                self.model = None
+                self._tokenizer = None
+                self._tokenizer_model = None
+                self.context_memory.set_tokenizer(None)
+                gc.collect()
+                self.gpu_manager.cleanup_vram()
+                
+                try:
+                    await self._load_model(model_name, compute_type)
+                except Exception:
+                    # Revenir à l'ancienne variante plutôt que de rester sans modèle
+                    if previous:
+                        await self._load_model(*previous)
+                    raise
+            finally:
+                self._swapping = False
     
     async def transcribe_stream(
         self,
         audio_data: np.ndarray,
         speaker: str,
-        timestamp: Optional[datetime] = None
+        timestamp: Optional[datetime] = None,
+        sample_rate: Optional[int] = None,
+        utterance_id: Optional[int] = None,
+        trace=NULL_TRACE
     ) -> Optional[TranscriptionResult]:
         """
         Transcrit un flux audio avec context memory.
@@ -127,23 +529,35 @@ class EliteTranscriber:
             audio_data: Données audio mono (float32, 16kHz ou 48kHz)
             speaker: "VOUS" ou "CLIENT"
             timestamp: Timestamp du segment
+            sample_rate: Fréquence de l'audio (défaut: fréquence de capture configurée)
+            utterance_id: Énoncé finalisé (clôt ses hypothèses partielles)
+            trace: Trace de latence de l'énoncé
         
         Returns:
             TranscriptionResult ou None si échec
         """
-        if not self._is_running or self.model is None:
+        if not self._is_running or not self.is_ready:
             self.logger.error("Transcriber not initialized")
             return None
         
         if timestamp is None:
             timestamp = datetime.now()
         
+        # Le décodage final fait foi: les partiels encore en vol seront ignorés
+        if utterance_id is not None:
+            self._streams.pop(speaker, None)
+        
         try:
             # Prétraitement audio
-            processed_audio = await self._preprocess_audio(audio_data)
+            processed_audio = await self._preprocess_audio(
+                audio_data,
+                sample_rate or self.config.audio.sample_rate
+            )
+            trace.mark("preprocess")
             
-            # Obtenir le prompt de contexte
-            context_prompt = self.context_memory.get_context_prompt(speaker)
+            # Obtenir le prompt de contexte (ids en cache si le tokenizer est branché)
+            context = self.context_memory.get_prompt(speaker)
+            context_prompt = context.tokens or context.text
             
             # Obtenir le profil de performance actuel
             profile = self.gpu_manager.current_profile
@@ -154,12 +568,36 @@ class EliteTranscriber:
             result = await self._transcribe_async(
                 processed_audio,
                 context_prompt,
-                profile.beam_size
+                profile.beam_size,
+                speaker,
+                trace
             )
             
             inference_time = (datetime.now() - start_time).total_seconds()
             self.total_inference_time += inference_time
             self.total_transcriptions += 1
+            self._inference_latency.observe(inference_time, speaker=speaker)
+            
+            # Mesure temps réel pour le contrôleur de profil (RTF, retard bout-en-bout)
+            audio_seconds = len(processed_audio) / WHISPER_SAMPLE_RATE
+            speech_end = timestamp + timedelta(seconds=audio_seconds)
+            lag = (datetime.now() - speech_end).total_seconds()
+            self.gpu_manager.record_utterance(
+                audio_seconds=audio_seconds,
+                processing_seconds=inference_time,
+                lag_seconds=lag
+            )
+            
+            # Signaux du décodeur: les segments douteux ne vont pas plus loin
+            result = self._apply_gate(result)
+            
+            # Spéculatif: le final remplace le provisoire de l'énoncé
+            if utterance_id is not None and self.draft_model:
+                self._final_ids[speaker] = utterance_id
+                self.speculative.record_final(lag)
+                draft = self._drafts.pop(speaker, None)
+                if result and draft and draft[0] == utterance_id:
+                    self.speculative.record_agreement(draft[1], result["text"])
             
             if not result:
                 return None
@@ -171,7 +609,9 @@ class EliteTranscriber:
                 timestamp=timestamp,
                 duration=result["duration"],
                 confidence=result["confidence"],
-                language="fr"
+                language="fr",
+                utterance_id=utterance_id,
+                segments=result.get("segments", [])
             )
             
             # Ajouter au contexte
@@ -193,16 +633,227 @@ class EliteTranscriber:
             self.errors_count += 1
             return None
     
-    async def _preprocess_audio(self, audio_data: np.ndarray) -> np.ndarray:
+    async def transcribe_draft(
+        self,
+        audio_data: np.ndarray,
+        speaker: str,
+        utterance_id: int,
+        timestamp: Optional[datetime] = None,
+        sample_rate: Optional[int] = None
+    ) -> Optional[TranscriptionResult]:
+        """
+        Texte provisoire d'un énoncé terminé, par le petit modèle.
+        
+        Lancé en parallèle de transcribe_stream: le texte s'affiche en
+        quelques centaines de ms puis est remplacé par le final du grand
+        modèle (même utterance_id). Un provisoire terminé après le final
+        est ignoré.
+        
+        Args:
+            audio_data: Audio de l'énoncé
+            speaker: "VOUS" ou "CLIENT"
+            utterance_id: Identifiant de l'énoncé
+            timestamp: Début de l'énoncé
+            sample_rate: Fréquence de l'audio (défaut: fréquence de capture configurée)
+        
+        Returns:
+            TranscriptionResult (revision "provisional") ou None
+        """
+        if not self._is_running or self.draft_model is None:
+            return None
+        
+        if timestamp is None:
+            timestamp = datetime.now()
+        
+        try:
+            processed_audio = await self._preprocess_audio(
+                audio_data,
+                sample_rate or self.config.audio.sample_rate
+            )
+            
+            prompt = self.context_memory.get_context_prompt(speaker)
+            
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(
+                self._draft_executor,
+                decode_utterance,
+                self.draft_model,
+                processed_audio,
+                prompt,
+                self.config.transcription.draft_beam_size,
+                self.config.transcription.vad_filter
+            )
+            
+            # Final déjà publié: le provisoire arriverait après lui
+            if self._final_ids.get(speaker, -1) >= utterance_id:
+                self.speculative.record_late_draft()
+                return None
+            
+            audio_seconds = len(processed_audio) / WHISPER_SAMPLE_RATE
+            speech_end = timestamp + timedelta(seconds=audio_seconds)
+            self.speculative.record_draft((datetime.now() - speech_end).total_seconds())
+            
+            result = self._apply_gate(result, record=False)
+            if not result:
+                return None
+            
+            self._drafts[speaker] = (utterance_id, result["text"])
+            
+            return TranscriptionResult(
+                text=result["text"],
+                speaker=speaker,
+                timestamp=timestamp,
+                duration=result["duration"],
+                confidence=result["confidence"],
+                language="fr",
+                utterance_id=utterance_id,
+                revision="provisional",
+                segments=result.get("segments", [])
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Draft transcription error: {e}", exc_info=True)
+            return None
+    
+    async def transcribe_partial(
+        self,
+        audio_data: np.ndarray,
+        speaker: str,
+        utterance_id: int,
+        timestamp: Optional[datetime] = None,
+        sample_rate: Optional[int] = None
+    ) -> Optional[TranscriptionResult]:
+        """
+        Hypothèse partielle sur un énoncé en cours (streaming).
+        
+        Re-décode le buffer croissant de l'énoncé, amputé de l'audio déjà
+        validé, et valide le préfixe sur lequel les dernières passes
+        s'accordent (LocalAgreement). Le texte validé sert de prompt à la
+        passe suivante.
+        
+        Args:
+            audio_data: Audio de l'énoncé depuis son début
+            speaker: "VOUS" ou "CLIENT"
+            utterance_id: Identifiant de l'énoncé en cours
+            timestamp: Début de l'énoncé
+            sample_rate: Fréquence de l'audio (défaut: fréquence de capture configurée)
+        
+        Returns:
+            TranscriptionResult (revision "partial") ou None
+        """
+        if not self._is_running or not self.is_ready:
+            return None
+        
+        if timestamp is None:
+            timestamp = datetime.now()
+        
+        state = self._streams.get(speaker)
+        if state is None or state.utterance_id != utterance_id:
+            state = LocalAgreement(utterance_id, self.config.transcription.agreement_passes)
+            self._streams[speaker] = state
+        
+        try:
+            processed_audio = await self._preprocess_audio(
+                audio_data,
+                sample_rate or self.config.audio.sample_rate
+            )
+            
+            # Buffer restant: l'audio des mots validés est retiré
+            offset = state.trim_samples(WHISPER_SAMPLE_RATE)
+            window = processed_audio[offset:]
+            if len(window) < self.config.transcription.partial_min_duration * WHISPER_SAMPLE_RATE:
+                return None
+            
+            prompt = self._partial_prompt(speaker, state.committed_text)
+            
+            result = await self._submit(
+                InferenceRequest(
+                    audio=window,
+                    initial_prompt=prompt,
+                    beam_size=self.config.transcription.partial_beam_size,
+                    speaker=speaker,
+                    word_timestamps=True
+                )
+            )
+            
+            # Énoncé finalisé pendant le décodage: hypothèse périmée
+            if self._streams.get(speaker) is not state or not result:
+                return None
+            
+            offset_seconds = offset / WHISPER_SAMPLE_RATE
+            committed = state.update([
+                Word(word.start + offset_seconds, word.end + offset_seconds, word.text)
+                for word in result["words"]
+            ])
+            
+            self.partials_count += 1
+            self.committed_words += len(committed)
+            
+            if not state.full_text:
+                return None
+            
+            return TranscriptionResult(
+                text=state.full_text,
+                speaker=speaker,
+                timestamp=timestamp,
+                duration=len(processed_audio) / WHISPER_SAMPLE_RATE,
+                confidence=result["confidence"],
+                language="fr",
+                utterance_id=utterance_id,
+                revision="partial",
+                stable_text=state.committed_text
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Partial transcription error: {e}", exc_info=True)
+            return None
+    
+    def _apply_gate(self, result: Optional[Dict], record: bool = True) -> Optional[Dict]:
+        """
+        Retire les segments rejetés par le DecoderGate et recompose le texte.
+        
+        Args:
+            result: Résultat de décodage (avec segments)
+            record: Comptabiliser les rejets (False pour le texte provisoire)
+        
+        Returns:
+            Résultat filtré, ou None si tous les segments sont rejetés
+        """
+        if not result or not result.get("segments"):
+            return result
+        
+        kept = self.gate.filter(result["segments"], record=record)
+        if not kept:
+            return None
+        if len(kept) == len(result["segments"]):
+            return result
+        
+        return dict(
+            result,
+            text=" ".join(segment.text for segment in kept),
+            confidence=sum(segment.avg_logprob for segment in kept) / len(kept),
+            segments=kept
+        )
+    
+    async def _preprocess_audio(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
         """
         Prétraite l'audio pour Whisper.
         
         Args:
             audio_data: Audio brut
+            sample_rate: Fréquence de l'audio
         
         Returns:
             Audio prétraité (16kHz, float32, mono)
         """
+        # Chemin nominal: déjà rééchantillonné au découpage, aucun travail
+        if (
+            audio_data.ndim == 1
+            and audio_data.dtype == np.float32
+            and sample_rate == WHISPER_SAMPLE_RATE
+        ):
+            return audio_data
+        
         # Conversion asynchrone dans un executor
         def _process():
             # Assurer que c'est mono
@@ -211,84 +862,321 @@ class EliteTranscriber:
             else:
                 processed = audio_data
             
-            # Resampling si nécessaire (48kHz -> 16kHz)
-            if self.config.audio.sample_rate != 16000:
-                original_length = len(processed)
-                target_length = int(original_length * 16000 / self.config.audio.sample_rate)
-                indices = np.linspace(0, original_length - 1, target_length)
-                processed = np.interp(indices, np.arange(original_length), processed)
-            
-            # Assurer float32
-            return processed.astype(np.float32)
+            # Resampling polyphase si nécessaire (48kHz -> 16kHz)
+            return resample(processed.astype(np.float32), sample_rate, WHISPER_SAMPLE_RATE)
         
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _process)
     
+    def _partial_prompt(self, speaker: str, committed_text: str) -> Union[str, List[int]]:
+        """
+        Prompt d'une passe partielle: contexte du locuteur + texte déjà validé.
+        
+        Avec le tokenizer, le texte validé (le plus proche de l'audio) garde sa
+        place dans le budget et le contexte en cache cède la sienne.
+        
+        Args:
+            speaker: Locuteur
+            committed_text: Texte déjà validé de l'énoncé
+        
+        Returns:
+            Ids Whisper, ou texte sans tokenizer
+        """
+        context = self.context_memory.get_prompt(speaker)
+        committed = self.context_memory.encode(committed_text) if committed_text else ()
+        if context.tokens is None or committed is None:
+            return " ".join(part for part in (context.text, committed_text) if part)
+        
+        budget = self.context_memory.max_prompt_tokens
+        committed = committed[-budget:]
+        return list(context.tokens[:budget - len(committed)]) + list(committed)
+    
     async def _transcribe_async(
         self,
         audio_data: np.ndarray,
-        initial_prompt: str,
-        beam_size: int
+        initial_prompt: Union[str, Sequence[int]],
+        beam_size: int,
+        speaker: str = "",
+        trace=NULL_TRACE
     ) -> Optional[Dict]:
         """
         Effectue la transcription de manière asynchrone.
+        Les énoncés concurrents des différents canaux sont décodés ensemble
+        (batcher) ou en parallèle (pool de processus).
         
         Args:
             audio_data: Audio prétraité
             initial_prompt: Prompt de contexte
             beam_size: Taille du beam search
+            speaker: Locuteur (statistiques)
+            trace: Trace de latence (attente et décodage)
         
         Returns:
             Dict avec text, duration, confidence
         """
-        async with self._model_lock:
-            def _transcribe():
-                segments, info = self.model.transcribe(
-                    audio_data,
-                    language="fr",
-                    task="transcribe",
-                    beam_size=beam_size,
-                    vad_filter=self.config.transcription.vad_filter,
-                    initial_prompt=initial_prompt,
-                    condition_on_previous_text=True,
-                    temperature=0.0,
-                    compression_ratio_threshold=2.4,
-                    log_prob_threshold=-1.0,
-                    no_speech_threshold=0.6
-                )
-                
-                # Collecter les segments
-                text_parts = []
-                total_confidence = 0.0
-                segment_count = 0
-                
-                for segment in segments:
-                    text_parts.append(segment.text.strip())
-                    if hasattr(segment, 'avg_logprob'):
-                        total_confidence += segment.avg_logprob
-                    segment_count += 1
-                
-                if segment_count == 0:
-                    return None
-                
-                full_text = " ".join(text_parts)
-                avg_confidence = total_confidence / segment_count if segment_count > 0 else 0.0
-                
-                return {
-                    "text": full_text,
-                    "duration": len(audio_data) / 16000,
-                    "confidence": avg_confidence
-                }
+        return await self._submit(
+            InferenceRequest(
+                audio=audio_data,
+                initial_prompt=initial_prompt,
+                beam_size=beam_size,
+                speaker=speaker,
+                trace=trace
+            )
+        )
+    
+    async def _submit(self, request: InferenceRequest) -> Optional[Dict]:
+        """
+        Route une requête vers le pool de processus ou le batcher local.
+        
+        Args:
+            request: Requête d'inférence
+        
+        Returns:
+            Résultat du décodage (ou None)
+        """
+        if self.pool:
+            return await self.pool.submit(
+                request.audio,
+                request.initial_prompt,
+                request.beam_size,
+                word_timestamps=request.word_timestamps,
+                trace=request.trace
+            )
+        return await self.batcher.submit(request)
+    
+    def _run_batch(self, requests: List[InferenceRequest]) -> List[Optional[Dict]]:
+        """
+        Exécute un lot de requêtes (thread executor, accès exclusif au modèle).
+        
+        Args:
+            requests: Requêtes partageant le même beam size
+        
+        Returns:
+            Un résultat (ou None) par requête
+        """
+        # CPU multi-workers: décodages parallèles (un worker ctranslate2 par requête)
+        if self._worker_pool and len(requests) > 1:
+            transcribe = self._transcribe_words if requests[0].word_timestamps else self._transcribe_single
+            return list(self._worker_pool.map(
+                lambda r: transcribe(r.audio, r.initial_prompt, r.beam_size),
+                requests
+            ))
+        
+        # Passes partielles: mots horodatés nécessaires au découpage du buffer
+        if requests[0].word_timestamps:
+            return [
+                self._transcribe_words(r.audio, r.initial_prompt, r.beam_size)
+                for r in requests
+            ]
+        
+        # Lot unique, énoncé > 30s, ou options que le lot ne sait pas reproduire
+        # (VAD, mots horodatés pour le DecoderGate): décodage classique
+        if (
+            len(requests) == 1
+            or not self._can_batch
+            or any(len(r.audio) > WHISPER_MAX_SAMPLES for r in requests)
+        ):
+            return [
+                self._transcribe_single(r.audio, r.initial_prompt, r.beam_size)
+                for r in requests
+            ]
+        
+        return self._transcribe_batched(requests)
+    
+    def _transcribe_single(
+        self,
+        audio_data: np.ndarray,
+        initial_prompt: Union[str, Sequence[int]],
+        beam_size: int
+    ) -> Optional[Dict]:
+        """
+        Transcrit un énoncé isolé avec model.transcribe.
+        
+        Args:
+            audio_data: Audio prétraité
+            initial_prompt: Prompt de contexte
+            beam_size: Taille du beam search
+        
+        Returns:
+            Dict avec text, duration, confidence
+        """
+        return decode_utterance(
+            self.model,
+            audio_data,
+            initial_prompt,
+            beam_size,
+            self.config.transcription.vad_filter,
+            self.config.gating.word_timestamps
+        )
+    
+    def _transcribe_words(
+        self,
+        audio_data: np.ndarray,
+        initial_prompt: Union[str, Sequence[int]],
+        beam_size: int
+    ) -> Optional[Dict]:
+        """
+        Transcrit un buffer partiel avec horodatage par mot.
+        
+        Args:
+            audio_data: Buffer non validé de l'énoncé
+            initial_prompt: Contexte + texte déjà validé
+            beam_size: Taille du beam search
+        
+        Returns:
+            Dict avec words (List[Word], temps relatifs au buffer) et confidence
+        """
+        return decode_words(self.model, audio_data, initial_prompt, beam_size)
+    
+    @staticmethod
+    def _prompt_tokens(tokenizer, initial_prompt: Union[str, Sequence[int]]) -> List[int]:
+        """
+        Ids du prompt d'une requête, comme model.transcribe les construit.
+        
+        Args:
+            tokenizer: Tokenizer faster-whisper
+            initial_prompt: Texte ou ids déjà encodés (ContextMemory)
+        
+        Returns:
+            Ids du prompt (vide sans prompt)
+        """
+        if not initial_prompt:
+            return []
+        if isinstance(initial_prompt, str):
+            return tokenizer.encode(" " + initial_prompt.strip())
+        return list(initial_prompt)
+    
+    @property
+    def _can_batch(self) -> bool:
+        """Le décodage groupé n'applique ni le filtre VAD ni l'horodatage par mot."""
+        return not (self.config.transcription.vad_filter or self.config.gating.word_timestamps)
+    
+    def _transcribe_batched(self, requests: List[InferenceRequest]) -> List[Optional[Dict]]:
+        """
+        Décode plusieurs énoncés (<= 30s) en un seul appel encode/generate.
+        
+        Température 0 et prompt sans timestamps: un seul segment par énoncé,
+        sans VAD ni horodatage par mot (voir _can_batch).
+        
+        Args:
+            requests: Requêtes partageant le même beam size
+        
+        Returns:
+            Un résultat (ou None) par requête
+        """
+        import ctranslate2
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+        
+        model = self.model
+        extractor = model.feature_extractor
+        
+        # Features log-Mel padées à 30s, empilées: [batch, n_mels, 3000]
+        features = np.stack([
+            pad_or_trim(extractor(r.audio)[:, :extractor.nb_max_frames], extractor.nb_max_frames)
+            for r in requests
+        ])
+        encoder_output = model.model.encode(
+            ctranslate2.StorageView.from_array(np.ascontiguousarray(features)),
+            to_cpu=False
+        )
+        
+        if self._tokenizer is None or self._tokenizer_model is not model:
+            self._tokenizer = Tokenizer(
+                model.hf_tokenizer,
+                model.model.is_multilingual,
+                task="transcribe",
+                language="fr"
+            )
+            self._tokenizer_model = model
+        tokenizer = self._tokenizer
+        
+        prompts = [
+            model.get_prompt(
+                tokenizer,
+                self._prompt_tokens(tokenizer, r.initial_prompt),
+                without_timestamps=True
+            )
+            for r in requests
+        ]
+        
+        outputs = model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=requests[0].beam_size,
+            max_length=model.max_length,
+            return_scores=True,
+            return_no_speech_prob=True,
+            suppress_blank=True,
+            suppress_tokens=[-1]
+        )
+        
+        results: List[Optional[Dict]] = []
+        for request, output in zip(requests, outputs):
+            tokens = output.sequences_ids[0]
+            avg_logprob = output.scores[0] * len(tokens) / (len(tokens) + 1)
+            text = tokenizer.decode(tokens).strip()
+            if not text:
+                results.append(None)
+                continue
             
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, _transcribe)
+            # Un segment par énoncé; le silence décodé est écarté par le DecoderGate
+            duration = len(request.audio) / WHISPER_SAMPLE_RATE
+            results.append({
+                "text": text,
+                "duration": duration,
+                "confidence": avg_logprob,
+                "segments": [SegmentSignals(
+                    text=text,
+                    start=0.0,
+                    end=duration,
+                    avg_logprob=avg_logprob,
+                    no_speech_prob=output.no_speech_prob,
+                    compression_ratio=compression_ratio(text)
+                )]
+            })
+        
+        return results
     
     def _on_performance_adjustment(self, new_profile):
-        """Callback appelé lors d'un ajustement de performance."""
+        """
+        Callback appelé lors d'un ajustement de performance.
+        Le beam size s'applique à la prochaine requête; un changement de
+        modèle ou de précision déclenche un rechargement en tâche de fond.
+        """
         self.logger.info(
             f"Performance adjusted to {new_profile.profile_name}: "
             f"buffer={new_profile.buffer_duration}s, beam={new_profile.beam_size}"
         )
+        
+        self._schedule_reload()
+    
+    def _schedule_reload(self):
+        """
+        Lance le rechargement vers la variante du profil actif si elle diffère
+        du modèle chargé. Un pas déclenché par la VRAM libère l'ancien modèle
+        avant de charger le nouveau.
+        """
+        variant = self._profile_variant(self.gpu_manager.current_profile)
+        if not self.is_ready or variant == self._loaded_variant:
+            return
+        
+        if self._reload_task and not self._reload_task.done():
+            self.logger.info("Model reload already in progress - profile change deferred")
+            return
+        
+        release_first = self.gpu_manager.last_adjustment_reason == "vram"
+        self._reload_task = asyncio.get_running_loop().create_task(
+            self._reload_model(*variant, release_first=release_first)
+        )
+        self._reload_task.add_done_callback(self._on_reload_done)
+    
+    def _on_reload_done(self, task: asyncio.Task):
+        """Rattrape un changement de profil arrivé pendant le rechargement."""
+        # Échec: pas de nouvel essai avant le prochain ajustement
+        if task.cancelled() or not task.result() or not self._is_running:
+            return
+        self._schedule_reload()
     
     async def shutdown(self):
         """Arrête proprement le transcripteur."""
@@ -297,11 +1185,31 @@ class EliteTranscriber:
         
         self.logger.info("Shutting down Elite Transcriber...")
         
+        # Arrêter le batcher (les requêtes en attente reçoivent None)
+        await self.batcher.stop()
+        
         # Arrêter le GPU manager
         await self.gpu_manager.stop_monitoring()
         
+        if self._reload_task and not self._reload_task.done():
+            self._reload_task.cancel()
+        
+        if self._worker_pool:
+            self._worker_pool.shutdown(wait=False)
+            self._worker_pool = None
+        
+        if self._draft_executor:
+            self._draft_executor.shutdown(wait=False)
+            self._draft_executor = None
+        self._drafts.clear()
+        
+        # Arrêter les processus d'inférence (les requêtes en vol reçoivent None)
+        if self.pool:
+            await self.pool.stop()
+        
         # Nettoyer le contexte
         self.context_memory.clear()
+        self._streams.clear()
         
         # Nettoyer la VRAM
         self.gpu_manager.cleanup_vram()
@@ -330,8 +1238,63 @@ class EliteTranscriber:
             "gpu_profile": gpu_report["current_profile"],
             "vram_usage_gb": gpu_report["current_vram_gb"],
             "context_segments": context_stats["total_segments"],
-            "gpu_adjustments": gpu_report["total_adjustments"]
+            "context_prompt": self.context_memory.get_prompt_stats(),
+            "gpu_adjustments": gpu_report["total_adjustments"],
+            "device": self.device,
+            "model_variant": self._loaded_variant,
+            "cpu_backend": asdict(self.cpu_backend) if self.cpu_backend else None,
+            "realtime": gpu_report["realtime"],
+            "batching": self.batcher.get_stats(),
+            "inference_pool": self.pool.get_stats() if self.pool else None,
+            "partials_count": self.partials_count,
+            "committed_words": self.committed_words,
+            "draft_model": self.config.transcription.draft_model if self.draft_model else None,
+            "speculative": self.speculative.get_stats(),
+            "gating": self.gate.get_stats()
         }
+    
+    def publish_metrics(self, registry):
+        """
+        Publie les compteurs de transcription, de batching et du pool.
+        
+        Args:
+            registry: MetricsRegistry
+        """
+        registry.counter(
+            "closer_transcriptions_total", "Énoncés finaux transcrits"
+        ).set_total(self.total_transcriptions)
+        registry.counter("closer_transcription_errors_total", "Erreurs de transcription").set_total(self.errors_count)
+        registry.counter("closer_partials_total", "Hypothèses partielles décodées").set_total(self.partials_count)
+        registry.counter(
+            "closer_drafts_total", "Textes provisoires (modèle rapide)"
+        ).set_total(self.speculative.drafts_count)
+        
+        prompts = self.context_memory.get_prompt_stats()
+        registry.counter(
+            "closer_prompt_requests_total", "Prompts de contexte demandés"
+        ).set_total(prompts["requests"])
+        registry.counter(
+            "closer_prompt_cache_hits_total", "Prompts de contexte servis par le cache"
+        ).set_total(self.context_memory.prompt_hits)
+        registry.gauge(
+            "closer_prompt_tokens_max", "Plus long prompt de contexte (tokens)"
+        ).set(prompts["max_tokens"])
+        
+        batching = self.batcher.get_stats()
+        registry.counter("closer_inference_batches_total", "Lots décodés").set_total(batching["batches_count"])
+        registry.gauge(
+            "closer_inference_queued_requests", "Requêtes en attente du modèle"
+        ).set(batching["queued_requests"])
+        
+        if self.pool:
+            in_flight = registry.gauge("closer_pool_worker_in_flight", "Requêtes en cours par worker", ("worker",))
+            completed = registry.counter("closer_pool_worker_completed_total", "Décodages par worker", ("worker",))
+            alive = registry.gauge("closer_pool_worker_alive", "Worker vivant (1) ou mort (0)", ("worker",))
+            for worker in self.pool.get_stats()["workers"]:
+                worker_id = worker["worker_id"]
+                in_flight.set(worker["in_flight"], worker=worker_id)
+                completed.set_total(worker["completed"], worker=worker_id)
+                alive.set(1 if worker["alive"] else 0, worker=worker_id)
 
 
 # Singleton getter
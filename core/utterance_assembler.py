@@ -0,0 +1,359 @@
+"""
+THE CLOSER PRO V25 - Utterance Assembler
+Assemblage des chunks audio en énoncés délimités par la parole (endpointing).
+Évite d'envoyer à Whisper des fragments de 0.5s qui coupent les mots en deux.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import numpy as np
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Deque, List, Optional, Tuple
+import logging
+
+from config.manager import UtteranceConfig
+
+
+@dataclass
+class Utterance:
+    """Énoncé complet prêt pour l'inférence."""
+    data: np.ndarray
+    timestamp: datetime  # Début de l'énoncé (pre-roll inclus)
+    channel: str
+    duration: float
+    sample_rate: int
+    forced: bool = False  # Flush forcé (durée max ou arrêt)
+    endpoint_latency: float = 0.0  # Secondes entre fin de parole et émission
+    utterance_id: int = 0  # Identifiant (partagé avec les hypothèses partielles)
+
+
+@dataclass
+class UtteranceMetrics:
+    """Métriques d'endpointing par canal."""
+    utterances_count: int = 0
+    forced_flushes: int = 0
+    discarded_count: int = 0
+    total_utterance_duration: float = 0.0
+    total_endpoint_latency: float = 0.0
+    max_endpoint_latency: float = 0.0
+    first_push: Optional[datetime] = None
+    pushed_duration: float = 0.0  # Audio reçu (secondes)
+    
+    @property
+    def skipped_fraction(self) -> float:
+        """Part de l'audio reçu jamais envoyée au modèle (silence, bruit, énoncés trop courts)."""
+        if self.pushed_duration <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.total_utterance_duration / self.pushed_duration)
+    
+    @property
+    def mean_utterance_duration(self) -> float:
+        """Durée moyenne d'un énoncé (secondes)."""
+        if self.utterances_count == 0:
+            return 0.0
+        return self.total_utterance_duration / self.utterances_count
+    
+    @property
+    def mean_endpoint_latency(self) -> float:
+        """Latence moyenne d'endpointing (secondes)."""
+        endpointed = self.utterances_count - self.forced_flushes
+        if endpointed <= 0:
+            return 0.0
+        return self.total_endpoint_latency / endpointed
+    
+    def utterances_per_second(self) -> float:
+        """Débit d'énoncés depuis le premier chunk reçu."""
+        if self.first_push is None:
+            return 0.0
+        elapsed = (datetime.now() - self.first_push).total_seconds()
+        if elapsed <= 0:
+            return 0.0
+        return self.utterances_count / elapsed
+
+
+class UtteranceAssembler:
+    """
+    Assembleur d'énoncés pour un canal.
+    Machine à états onset/offset avec hangover, pre-roll et durée maximale.
+    
+    Les chunks sont découpés en trames courtes; une trame est "voisée" selon
+    la VAD de capture (décisions transmises avec le chunk) ou, à défaut, si son
+    énergie RMS dépasse le seuil. L'énoncé s'ouvre après `onset_duration` de
+    trames voisées consécutives et se ferme après `hangover_duration` de silence.
+    """
+    
+    def __init__(
+        self,
+        channel: str,
+        sample_rate: int,
+        config: Optional[UtteranceConfig] = None
+    ):
+        """
+        Initialise l'assembleur.
+        
+        Args:
+            channel: Nom du canal ("LEFT" ou "RIGHT")
+            sample_rate: Fréquence d'échantillonnage des chunks reçus
+            config: Paramètres d'endpointing (défaut: UtteranceConfig())
+        """
+        self.channel = channel
+        self.sample_rate = sample_rate
+        self.config = config or UtteranceConfig()
+        self.logger = logging.getLogger(__name__)
+        
+        self.frame_length = max(1, int(sample_rate * self.config.frame_duration))
+        self.onset_frames = max(1, int(round(self.config.onset_duration / self.config.frame_duration)))
+        self.hangover_frames = max(1, int(round(self.config.hangover_duration / self.config.frame_duration)))
+        self.preroll_samples = int(sample_rate * self.config.preroll_duration)
+        self.max_samples = int(sample_rate * self.config.max_duration)
+        self.min_samples = int(sample_rate * self.config.min_duration)
+        self._preroll_frames = -(-self.preroll_samples // self.frame_length) + self.onset_frames + 1
+        
+        # Pre-roll: (début, trame) conservés hors énoncé
+        self._preroll: Deque[Tuple[datetime, np.ndarray]] = deque()
+        self._preroll_length = 0
+        self._voiced_run = 0
+        
+        # Énoncé en cours
+        self._in_speech = False
+        self._parts: List[np.ndarray] = []
+        self._length = 0
+        self._start: Optional[datetime] = None
+        self._silence_run = 0
+        self._voiced_samples = 0
+        self._speech_end: Optional[datetime] = None
+        self._utterance_id = 0
+        
+        self.metrics = UtteranceMetrics()
+    
+    @property
+    def in_speech(self) -> bool:
+        """True si un énoncé est en cours d'accumulation."""
+        return self._in_speech
+    
+    @property
+    def utterance_id(self) -> int:
+        """Identifiant de l'énoncé en cours (ou du dernier émis)."""
+        return self._utterance_id
+    
+    @property
+    def current_start(self) -> Optional[datetime]:
+        """Début de l'énoncé en cours."""
+        return self._start
+    
+    def current_audio(self) -> np.ndarray:
+        """
+        Audio accumulé de l'énoncé en cours (pour les hypothèses partielles).
+        
+        Returns:
+            Copie de l'audio depuis le début de l'énoncé (vide hors parole)
+        """
+        if not self._parts:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._parts)
+    
+    def push(self, data: np.ndarray, timestamp: datetime, voiced: Optional[np.ndarray] = None) -> List[Utterance]:
+        """
+        Ajoute un chunk mono et retourne les énoncés terminés.
+        
+        Args:
+            data: Audio mono float32
+            timestamp: Timestamp du premier échantillon du chunk
+            voiced: Décisions par trame de la VAD de capture (recalculées si absentes
+                    ou si le découpage ne correspond pas)
+        
+        Returns:
+            Liste (souvent vide) des énoncés finalisés
+        """
+        if self.metrics.first_push is None:
+            self.metrics.first_push = datetime.now()
+        
+        completed: List[Utterance] = []
+        if len(data) == 0:
+            return completed
+        
+        self.metrics.pushed_duration += len(data) / self.sample_rate
+        
+        if voiced is None or len(voiced) != max(1, len(data) // self.frame_length):
+            voiced = self._frame_decisions(data)
+        
+        # Silence hors énoncé: seules les dernières trames peuvent servir de pre-roll
+        first_frame = 0
+        if not self._in_speech and not voiced.any():
+            first_frame = max(0, len(voiced) - self._preroll_frames)
+        
+        for index in range(first_frame, len(voiced)):
+            is_voiced = voiced[index]
+            start = index * self.frame_length
+            end = start + self.frame_length if index < len(voiced) - 1 else len(data)
+            frame = data[start:end]
+            frame_time = timestamp + timedelta(seconds=start / self.sample_rate)
+            
+            if not self._in_speech:
+                self._push_preroll(frame_time, frame)
+                self._voiced_run = self._voiced_run + 1 if is_voiced else 0
+                
+                if self._voiced_run >= self.onset_frames:
+                    self._open_utterance()
+                continue
+            
+            self._parts.append(frame)
+            self._length += len(frame)
+            
+            if is_voiced:
+                self._silence_run = 0
+                self._voiced_samples += len(frame)
+                self._speech_end = frame_time + timedelta(seconds=len(frame) / self.sample_rate)
+            else:
+                self._silence_run += 1
+            
+            if self._silence_run >= self.hangover_frames:
+                utterance = self._close_utterance(forced=False)
+                if utterance:
+                    completed.append(utterance)
+            elif self._length >= self.max_samples:
+                utterance = self._close_utterance(forced=True)
+                if utterance:
+                    completed.append(utterance)
+                # La parole continue: nouvel énoncé immédiat sans pre-roll
+                self._in_speech = True
+                self._utterance_id += 1
+                self._start = frame_time + timedelta(seconds=len(frame) / self.sample_rate)
+        
+        return completed
+    
+    def flush(self) -> Optional[Utterance]:
+        """
+        Force l'émission de l'énoncé en cours (arrêt du système).
+        
+        Returns:
+            Énoncé partiel ou None
+        """
+        if not self._in_speech:
+            self._reset_preroll()
+            return None
+        return self._close_utterance(forced=True)
+    
+    def _frame_decisions(self, data: np.ndarray) -> np.ndarray:
+        """
+        Calcule la décision voisé/non-voisé par trame (vectorisé).
+        Les échantillons restants sont rattachés à la dernière trame.
+        
+        Args:
+            data: Audio mono
+        
+        Returns:
+            Tableau booléen (une entrée par trame)
+        """
+        n_frames = max(1, len(data) // self.frame_length)
+        usable = n_frames * self.frame_length
+        
+        if usable > len(data):
+            rms = np.sqrt(np.mean(np.square(data, dtype=np.float32)))
+            return np.array([rms > self.config.energy_threshold])
+        
+        frames = data[:usable].reshape(n_frames, self.frame_length)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        return rms > self.config.energy_threshold
+    
+    def _push_preroll(self, frame_time: datetime, frame: np.ndarray):
+        """Conserve les dernières trames hors énoncé (pre-roll + fenêtre d'onset)."""
+        self._preroll.append((frame_time, frame))
+        self._preroll_length += len(frame)
+        
+        limit = self.preroll_samples + self.onset_frames * self.frame_length
+        while self._preroll and self._preroll_length - len(self._preroll[0][1]) >= limit:
+            _, dropped = self._preroll.popleft()
+            self._preroll_length -= len(dropped)
+    
+    def _reset_preroll(self):
+        """Vide le pre-roll."""
+        self._preroll.clear()
+        self._preroll_length = 0
+        self._voiced_run = 0
+    
+    def _open_utterance(self):
+        """Ouvre un énoncé à partir du pre-roll accumulé."""
+        self._in_speech = True
+        self._utterance_id += 1
+        self._start = self._preroll[0][0]
+        self._parts = [frame for _, frame in self._preroll]
+        self._length = self._preroll_length
+        self._silence_run = 0
+        self._voiced_samples = sum(len(frame) for frame in self._parts[-self.onset_frames:])
+        
+        last_time, last_frame = self._preroll[-1]
+        self._speech_end = last_time + timedelta(seconds=len(last_frame) / self.sample_rate)
+        self._reset_preroll()
+    
+    def _close_utterance(self, forced: bool) -> Optional[Utterance]:
+        """
+        Ferme l'énoncé en cours et met à jour les métriques.
+        
+        Args:
+            forced: True si flush forcé (durée max ou arrêt)
+        
+        Returns:
+            Utterance, ou None si trop court
+        """
+        parts, length, start, speech_end = self._parts, self._length, self._start, self._speech_end
+        voiced_samples = self._voiced_samples
+        
+        self._in_speech = False
+        self._parts = []
+        self._length = 0
+        self._start = None
+        self._silence_run = 0
+        self._voiced_samples = 0
+        self._speech_end = None
+        
+        if voiced_samples < self.min_samples or not parts:
+            self.metrics.discarded_count += 1
+            return None
+        
+        data = np.concatenate(parts) if len(parts) > 1 else parts[0].copy()
+        duration = length / self.sample_rate
+        
+        latency = 0.0
+        if not forced and speech_end is not None:
+            latency = max(0.0, (datetime.now() - speech_end).total_seconds())
+        
+        self.metrics.utterances_count += 1
+        self.metrics.total_utterance_duration += duration
+        if forced:
+            self.metrics.forced_flushes += 1
+        else:
+            self.metrics.total_endpoint_latency += latency
+            self.metrics.max_endpoint_latency = max(self.metrics.max_endpoint_latency, latency)
+        
+        return Utterance(
+            data=data,
+            timestamp=start,
+            channel=self.channel,
+            duration=duration,
+            sample_rate=self.sample_rate,
+            forced=forced,
+            endpoint_latency=latency,
+            utterance_id=self._utterance_id
+        )
+    
+    def get_metrics(self) -> dict:
+        """
+        Retourne les métriques d'endpointing du canal.
+        
+        Returns:
+            Dict avec débit, durée moyenne et latence d'endpoint
+        """
+        return {
+            "utterances_count": self.metrics.utterances_count,
+            "utterances_per_second": self.metrics.utterances_per_second(),
+            "mean_utterance_duration": self.metrics.mean_utterance_duration,
+            "mean_endpoint_latency": self.metrics.mean_endpoint_latency,
+            "max_endpoint_latency": self.metrics.max_endpoint_latency,
+            "forced_flushes": self.metrics.forced_flushes,
+            "discarded_count": self.metrics.discarded_count,
+            "skipped_fraction": self.metrics.skipped_fraction
+        }
@@ -0,0 +1,364 @@
+"""
+THE CLOSER PRO V25 - Voice Activity
+Détection d'activité vocale par canal, calculée une seule fois à la capture:
+énergie par trame, planéité spectrale (rejette les bruits stationnaires) et
+plancher de bruit adaptatif. Les décisions par trame voyagent avec le chunk
+et sont réutilisées par l'assembleur d'énoncés: le silence n'atteint jamais
+le modèle.
+
+Backend optionnel 'silero': réseau Silero VAD (ONNX Runtime, CPU), même
+interface, plus robuste aux claviers et aux voix faibles.
+
+Author: THE CLOSER PRO Team
+Version: 2.5.0 (Elite)
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config.manager import UtteranceConfig
+from core.resampler import PolyphaseResampler
+
+# Bande de la parole utilisée pour la planéité spectrale (Hz)
+SPEECH_BAND = (100.0, 4000.0)
+
+# Silero VAD: fenêtres de 512 échantillons (32ms) à 16kHz, état LSTM [2, batch, 64]
+SILERO_SAMPLE_RATE = 16000
+SILERO_WINDOW = 512
+SILERO_STATE_SIZE = 64
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VoiceActivity:
+    """Décisions voisé/non-voisé d'un chunk, par canal et par trame."""
+    frames: np.ndarray  # bool [canaux, trames]
+    frame_duration: float  # Secondes par trame (le reste du chunk est rattaché à la dernière)
+    
+    @property
+    def any_voiced(self) -> bool:
+        """True si au moins une trame d'un canal est voisée."""
+        return bool(self.frames.any())
+    
+    def channel(self, index: int) -> np.ndarray:
+        """
+        Décisions d'un canal (un flux mono sert tous les canaux).
+        
+        Args:
+            index: Index du canal
+        
+        Returns:
+            Tableau booléen (une entrée par trame)
+        """
+        return self.frames[min(index, len(self.frames) - 1)]
+
+
+def frame_count(samples: int, frame_length: int) -> int:
+    """Nombre de trames d'un bloc (le reste est rattaché à la dernière trame)."""
+    return max(1, samples // frame_length)
+
+
+class VoiceActivityDetector:
+    """
+    VAD vectorisé multi-canaux.
+    
+    Une trame est voisée si:
+    - son énergie RMS dépasse le seuil absolu et le plancher de bruit du canal
+      d'au moins `vad_noise_margin_db`
+    - son spectre n'est pas plat (planéité < `vad_max_flatness`): un souffle ou
+      un ventilateur ont beau être forts, ils ne sont pas de la parole
+    
+    Le plancher suit le bruit ambiant: descente immédiate, remontée lente,
+    mise à jour une fois par chunk.
+    """
+    
+    backend = "energy"
+    
+    def __init__(self, sample_rate: int, config: Optional[UtteranceConfig] = None):
+        """
+        Initialise le détecteur.
+        
+        Args:
+            sample_rate: Fréquence des chunks analysés
+            config: Paramètres d'endpointing (trame, seuils)
+        """
+        self.sample_rate = sample_rate
+        self.config = config or UtteranceConfig()
+        self.frame_length = max(1, int(sample_rate * self.config.frame_duration))
+        
+        freqs = np.fft.rfftfreq(self.frame_length, 1.0 / sample_rate)
+        band = (freqs >= SPEECH_BAND[0]) & (freqs <= SPEECH_BAND[1])
+        self._band = band if band.sum() >= 4 else np.ones_like(band)
+        self._window = np.hanning(self.frame_length).astype(np.float32)
+        self.threshold = self.config.vad_threshold
+        
+        self._noise_floor: Optional[np.ndarray] = None  # RMS par canal
+        self.frames_total: Optional[np.ndarray] = None
+        self.frames_voiced: Optional[np.ndarray] = None
+    
+    def set_threshold(self, threshold: float):
+        """
+        Fixe la probabilité de parole minimale (profil de performance).
+        Sans effet sur le backend énergie, qui suit ses propres seuils.
+        
+        Args:
+            threshold: Probabilité (0-1)
+        """
+        self.threshold = threshold
+    
+    def analyze(self, data: np.ndarray) -> VoiceActivity:
+        """
+        Analyse un chunk (toutes les trames de tous les canaux en une passe).
+        
+        Args:
+            data: Audio [échantillons] ou [échantillons, canaux], float32 ou int16
+        
+        Returns:
+            VoiceActivity du chunk
+        """
+        audio = data.reshape(-1, 1) if data.ndim == 1 else data
+        scale = 1.0 / 32768.0 if audio.dtype == np.int16 else 1.0
+        samples, channels = audio.shape
+        
+        n_frames = frame_count(samples, self.frame_length)
+        if samples < self.frame_length:
+            return self._record(np.zeros((channels, 1), dtype=bool))
+        
+        # [canaux, trames, échantillons]
+        usable = n_frames * self.frame_length
+        frames = audio[:usable].T.reshape(channels, n_frames, self.frame_length).astype(np.float32) * scale
+        
+        rms = np.sqrt(np.mean(np.square(frames), axis=2))
+        
+        if self._noise_floor is None or len(self._noise_floor) != channels:
+            self._noise_floor = np.full(channels, self.config.energy_threshold / 2, dtype=np.float32)
+        margin = 10 ** (self.config.vad_noise_margin_db / 20)
+        threshold = np.maximum(self.config.energy_threshold, self._noise_floor * margin)
+        loud = rms > threshold[:, None]
+        
+        voiced = loud
+        if loud.any():
+            # Planéité spectrale des seules trames assez fortes
+            spectrum = np.abs(np.fft.rfft(frames[loud] * self._window, axis=1)) ** 2
+            power = spectrum[:, self._band] + 1e-12
+            flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+            voiced = loud.copy()
+            voiced[loud] = flatness < self.config.vad_max_flatness
+        
+        self._update_noise_floor(rms, voiced)
+        return self._record(voiced)
+    
+    def _update_noise_floor(self, rms: np.ndarray, voiced: np.ndarray):
+        """
+        Suit le bruit de fond: trame non voisée la plus faible du chunk,
+        descente immédiate, remontée lente. Un canal entièrement voisé garde
+        son plancher (la parole continue ne doit pas se faire passer pour du bruit).
+        """
+        quietest = np.min(np.where(voiced, np.inf, rms), axis=1)
+        quietest = np.where(np.isfinite(quietest), quietest, self._noise_floor)
+        rising = quietest > self._noise_floor
+        adapt = self.config.vad_noise_adaptation
+        self._noise_floor = np.where(
+            rising,
+            self._noise_floor + adapt * (quietest - self._noise_floor),
+            quietest
+        ).astype(np.float32)
+    
+    def _record(self, voiced: np.ndarray) -> VoiceActivity:
+        """Met à jour les compteurs par canal et emballe les décisions."""
+        if self.frames_total is None or len(self.frames_total) != len(voiced):
+            self.frames_total = np.zeros(len(voiced), dtype=np.int64)
+            self.frames_voiced = np.zeros(len(voiced), dtype=np.int64)
+        self.frames_total += voiced.shape[1]
+        self.frames_voiced += voiced.sum(axis=1)
+        return VoiceActivity(voiced, self.config.frame_duration)
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne la part de trames voisées par canal.
+        
+        Returns:
+            Dict avec trames analysées, ratio voisé et plancher de bruit par canal
+        """
+        if self.frames_total is None:
+            return {"backend": self.backend, "channels": []}
+        return {
+            "backend": self.backend,
+            "channels": [
+                {
+                    "frames": int(total),
+                    "voiced_ratio": float(voiced / total) if total else 0.0,
+                    "noise_floor_rms": float(floor) if self._noise_floor is not None else 0.0
+                }
+                for total, voiced, floor in zip(
+                    self.frames_total,
+                    self.frames_voiced,
+                    self._noise_floor if self._noise_floor is not None else np.zeros(len(self.frames_total))
+                )
+            ]
+        }
+
+
+class SileroVoiceActivityDetector(VoiceActivityDetector):
+    """
+    VAD neuronal Silero (ONNX Runtime, CPU), même interface que le backend énergie.
+    
+    Les canaux sont rééchantillonnés à 16kHz puis passés au réseau par
+    fenêtres de 32ms, tous les canaux dans le même batch (un appel ONNX par
+    fenêtre). L'état LSTM et le reliquat de fenêtre sont conservés par canal
+    d'un chunk à l'autre. Chaque trame de 30ms prend la probabilité de la
+    fenêtre qui couvre son centre (la dernière connue si elle n'est pas encore
+    complète), comparée à `threshold`.
+    """
+    
+    backend = "silero"
+    
+    def __init__(self, sample_rate: int, config: Optional[UtteranceConfig] = None, session=None):
+        """
+        Initialise le détecteur.
+        
+        Args:
+            sample_rate: Fréquence des chunks analysés
+            config: Paramètres d'endpointing (trame, seuil, modèle)
+            session: Session ONNX Runtime déjà chargée (défaut: chargée depuis vad_model_path)
+        """
+        super().__init__(sample_rate, config)
+        self.session = session or load_silero_session(self.config.vad_model_path)
+        self._resampler: Optional[PolyphaseResampler] = None
+        self._channels = 0
+        self.reset()
+    
+    def reset(self, channels: int = 0):
+        """
+        Réinitialise l'état du réseau (début de flux ou changement de canaux).
+        
+        Args:
+            channels: Nombre de canaux du flux
+        """
+        self._channels = channels
+        self._state = np.zeros((2, channels, SILERO_STATE_SIZE), dtype=np.float32)
+        self._cell = np.zeros((2, channels, SILERO_STATE_SIZE), dtype=np.float32)
+        self._carry = np.zeros((channels, 0), dtype=np.float32)
+        self._last_probability = np.zeros(channels, dtype=np.float32)
+        self._stream_position = 0  # Échantillons 16kHz reçus
+        self._resampler = PolyphaseResampler(self.sample_rate, SILERO_SAMPLE_RATE, max(1, channels))
+    
+    def analyze(self, data: np.ndarray) -> VoiceActivity:
+        """
+        Analyse un chunk (probabilités de parole par canal, en batch).
+        
+        Args:
+            data: Audio [échantillons] ou [échantillons, canaux], float32 ou int16
+        
+        Returns:
+            VoiceActivity du chunk
+        """
+        audio = data.reshape(-1, 1) if data.ndim == 1 else data
+        samples, channels = audio.shape
+        if channels != self._channels:
+            self.reset(channels)
+        
+        scale = 1.0 / 32768.0 if audio.dtype == np.int16 else 1.0
+        resampled = self._resampler.process(audio.astype(np.float32) * scale)
+        
+        # Fenêtres complètes de ce chunk (le reliquat attend le suivant)
+        pending = np.concatenate((self._carry, resampled.T), axis=1)
+        window_count = pending.shape[1] // SILERO_WINDOW
+        first_window = self._stream_position - self._carry.shape[1]
+        
+        probabilities = np.empty((channels, window_count), dtype=np.float32)
+        sr = np.array(SILERO_SAMPLE_RATE, dtype=np.int64)
+        for index in range(window_count):
+            window = pending[:, index * SILERO_WINDOW:(index + 1) * SILERO_WINDOW]
+            output, self._state, self._cell = self.session.run(
+                None, {"input": window, "h": self._state, "c": self._cell, "sr": sr}
+            )
+            probabilities[:, index] = output.reshape(channels)
+        
+        self._carry = pending[:, window_count * SILERO_WINDOW:]
+        chunk_start = self._stream_position
+        self._stream_position += resampled.shape[0]
+        
+        # Fenêtre couvrant le centre de chaque trame (-1: fenêtre d'un chunk précédent)
+        n_frames = frame_count(samples, self.frame_length)
+        step = resampled.shape[0] / n_frames
+        centers = chunk_start + (np.arange(n_frames) + 0.5) * step
+        starts = first_window + np.arange(window_count) * SILERO_WINDOW
+        covering = np.searchsorted(starts, centers, side="right")
+        
+        timeline = np.concatenate((self._last_probability[:, None], probabilities), axis=1)
+        if window_count:
+            self._last_probability = probabilities[:, -1]
+        
+        return self._record(timeline[:, covering] >= self.threshold)
+    
+    def get_stats(self) -> dict:
+        """
+        Retourne la part de trames voisées par canal.
+        
+        Returns:
+            Dict avec backend, trames analysées, ratio voisé et seuil de probabilité
+        """
+        stats = super().get_stats()
+        stats["threshold"] = self.threshold
+        return stats
+
+
+def load_silero_session(model_path: str = ""):
+    """
+    Charge le modèle Silero VAD sur CPU (un thread: ne concurrence pas Whisper).
+    
+    Args:
+        model_path: Fichier ONNX (vide = modèle fourni avec faster-whisper)
+    
+    Returns:
+        onnxruntime.InferenceSession
+    
+    Raises:
+        RuntimeError: onnxruntime absent ou modèle introuvable
+    """
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise RuntimeError("onnxruntime is required for the silero VAD backend (pip install onnxruntime)") from e
+    
+    if not model_path:
+        try:
+            from faster_whisper.utils import get_assets_path
+        except ImportError as e:
+            raise RuntimeError("vad_model_path is required when faster-whisper is not installed") from e
+        model_path = str(Path(get_assets_path()) / "silero_vad.onnx")
+    
+    if not Path(model_path).is_file():
+        raise RuntimeError(f"Silero VAD model not found: {model_path}")
+    
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = 1
+    options.inter_op_num_threads = 1
+    options.log_severity_level = 4
+    return onnxruntime.InferenceSession(model_path, providers=["CPUExecutionProvider"], sess_options=options)
+
+
+def create_voice_activity_detector(sample_rate: int, config: Optional[UtteranceConfig] = None) -> VoiceActivityDetector:
+    """
+    Crée le détecteur du backend configuré (repli sur l'énergie si Silero est indisponible).
+    
+    Args:
+        sample_rate: Fréquence des chunks analysés
+        config: Paramètres d'endpointing (vad_backend)
+    
+    Returns:
+        VoiceActivityDetector
+    """
+    config = config or UtteranceConfig()
+    if config.vad_backend == "silero":
+        try:
+            return SileroVoiceActivityDetector(sample_rate, config)
+        except RuntimeError as e:
+            logger.warning(f"Silero VAD unavailable ({e}) - falling back to energy VAD")
+    return VoiceActivityDetector(sample_rate, config)
@@ -7,7 +7,6 @@ Author: THE CLOSER PRO Team
 Version: 0.25 (Elite Edition)
 """
 
-import torch
 import gc
 import logging
 import asyncio
@@ -15,6 +14,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 from dataclasses import dataclass
 
+from core.gpu_manager import cuda_available, get_torch
+
 
 @dataclass
 class VRAMSnapshot:
@@ -71,7 +72,7 @@ class VRAMGuardian:
         Returns:
             VRAMSnapshot avec les métriques
         """
-        if not torch.cuda.is_available():
+        if not cuda_available():
             return VRAMSnapshot(
                 timestamp=datetime.now(),
                 allocated_gb=0.0,
@@ -80,6 +81,7 @@ class VRAMGuardian:
                 utilization_percent=0.0
             )
         
+        torch = get_torch()
         allocated = torch.cuda.memory_allocated(0) / (1024**3)
         reserved = torch.cuda.memory_reserved(0) / (1024**3)
         free = self.max_vram_gb - allocated
@@ -107,9 +109,10 @@ class VRAMGuardian:
         Args:
             aggressive: Mode agressif (force le garbage collection Python)
         """
-        if not torch.cuda.is_available():
+        if not cuda_available():
             return
         
+        torch = get_torch()
         before = self.get_vram_usage()
         
         # Nettoyage CUDA
@@ -245,6 +248,24 @@ class VRAMGuardian:
             "snapshots_count": len(self.snapshots)
         }
     
+    def publish_metrics(self, registry):
+        """
+        Publie l'utilisation VRAM et les nettoyages.
+        
+        Lit la dernière mesure de la boucle de monitoring sans en prendre une
+        nouvelle: un scrape (thread HTTP) ne doit pas alimenter l'historique.
+        
+        Args:
+            registry: MetricsRegistry
+        """
+        latest = self.snapshots[-1] if self.snapshots else None
+        registry.gauge(
+            "closer_vram_utilization_percent", "Utilisation VRAM (%)"
+        ).set(latest.utilization_percent if latest else 0.0)
+        cleanups = registry.counter("closer_vram_cleanups_total", "Nettoyages du cache VRAM", ("kind",))
+        cleanups.set_total(self.total_cleanups, kind="all")
+        cleanups.set_total(self.aggressive_cleanups, kind="aggressive")
+    
     def print_report(self):
         """Affiche un rapport détaillé."""
         stats = self.get_stats()
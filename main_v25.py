@@ -7,6 +7,9 @@ Author: THE CLOSER PRO Team
 Version: 2.5.0 (Elite)
 """
 
+import time
+_PROCESS_STARTED = time.perf_counter()
+
 # CRITICAL: Force Windows to load DLLs from project directory FIRST
 import os
 if os.name == 'nt':
@@ -14,7 +17,9 @@ if os.name == 'nt':
     project_dir = os.path.dirname(os.path.abspath(__file__))
     os.add_dll_directory(project_dir)
 
+import argparse
 import asyncio
+import dataclasses
 import signal
 import logging
 import sys
@@ -29,15 +34,21 @@ from core.cuda_dll_fixer import apply_cuda_fix
 apply_cuda_fix()
 
 from config.manager import get_config
-from core.audio_streamer import AudioStreamer, AudioChunk
-from core.dual_stream_manager import DualStreamManager, AudioStream
+from core.audio_source import AudioSource, AudioChunk, FileReplaySource
+from core.multi_stream_manager import MultiStreamManager, AudioStream
 from core.transcriber_v25 import get_elite_transcriber, TranscriptionResult
 from core.analytics_engine import AnalyticsEngine
-from core.processor import get_processor
+from core.processor_v25 import get_elite_processor
 from core.sales_intelligence import get_sales_intelligence
 from core.realtime_ui import get_realtime_ui
 from core.vram_guardian import get_vram_guardian
 from core.session_exporter import get_session_exporter
+from core.startup_timer import StartupTimer
+from core.latency_tracer import get_latency_tracer
+from core.metrics_registry import MetricsServer, get_metrics_registry
+
+# torch, faster-whisper et sounddevice ne sont importés qu'au démarrage effectif
+_IMPORTS_DONE = time.perf_counter()
 
 init(autoreset=True)
 
@@ -48,25 +59,36 @@ class TheCloserProV25:
     Intègre dual-stream, context memory, GPU self-healing et analytics temps réel.
     """
     
-    def __init__(self):
-        """Initialise l'orchestrateur V25."""
+    def __init__(self, replay_path: Optional[str] = None, replay_realtime: bool = True):
+        """
+        Initialise l'orchestrateur V25.
+        
+        Args:
+            replay_path: Fichier WAV/FLAC stéréo à rejouer à la place de la capture live
+            replay_realtime: Cadencer le replay en temps réel (sinon débit maximal)
+        """
         self.config = get_config()
         self.logger = self._setup_logging()
         
         # Composants Elite v0.25
         self.transcriber = get_elite_transcriber()
         self.analytics = AnalyticsEngine(snapshot_interval=30)
-        self.processor = get_processor()
+        self.processor = get_elite_processor()
         self.sales_intelligence = get_sales_intelligence()
         self.realtime_ui = get_realtime_ui()
         self.vram_guardian = get_vram_guardian()
         self.session_exporter = get_session_exporter()
+        self.tracer = get_latency_tracer()
+        self.metrics = get_metrics_registry()
+        self.metrics_server: Optional[MetricsServer] = None
         
-        # Dual-stream manager
-        self.dual_stream: Optional[DualStreamManager] = None
+        # Gestionnaire multi-canaux (un flux par locuteur)
+        self.streams: Optional[MultiStreamManager] = None
         
-        # Audio streamer
-        self.audio_streamer: Optional[AudioStreamer] = None
+        # Source audio (capture live ou replay fichier)
+        self.audio_source: Optional[AudioSource] = None
+        self.replay_path = replay_path
+        self.replay_realtime = replay_realtime
         
         # État
         self._is_running = False
@@ -76,6 +98,13 @@ class TheCloserProV25:
         # Live monitoring
         self._live_monitor_task: Optional[asyncio.Task] = None
         
+        # Chronométrage du démarrage (depuis le lancement du processus)
+        self.startup_timer = StartupTimer(origin=_PROCESS_STARTED)
+        self.startup_timer.record("imports", _PROCESS_STARTED, _IMPORTS_DONE)
+        
+        # Textes provisoires en vol (modèle rapide)
+        self._draft_tasks: set = set()
+        
         # Asyncio event loop
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         
@@ -107,86 +136,182 @@ class TheCloserProV25:
             self._output_file = Path(f"transcription_v25_{timestamp}.txt")
             self._output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    async def _process_left_channel(self, stream: AudioStream):
+    async def _process_channel(self, stream: AudioStream):
         """
-        Traite le canal GAUCHE (VOUS) de manière asynchrone.
+        Traite un énoncé terminé d'un canal, de manière asynchrone.
         
         Args:
-            stream: Flux audio du canal gauche
+            stream: Énoncé du canal (le locuteur voyage avec le flux)
         """
+        speaker = stream.speaker
+        self._start_draft(stream, speaker)
+        analyzed = False
+        
         try:
             # Transcrire avec context memory
             result = await self.transcriber.transcribe_stream(
                 audio_data=stream.data,
-                speaker="VOUS",
-                timestamp=stream.timestamp
+                speaker=speaker,
+                timestamp=stream.timestamp,
+                sample_rate=stream.sample_rate,
+                utterance_id=stream.utterance_id,
+                trace=stream.trace
             )
             
             if result and result.text:
                 # Nettoyer avec le processor
                 cleaned = self.processor.clean_text(result.text)
+                is_valid = bool(cleaned) and not self.processor.is_hallucination(cleaned)
+                stream.trace.mark("processor")
                 
-                if cleaned and not self.processor.is_hallucination(cleaned):
+                if is_valid:
                     # Analyser avec Sales Intelligence
                     self.sales_intelligence.analyze_text(
                         text=cleaned,
-                        speaker="VOUS",
-                        timestamp=result.timestamp
+                        speaker=speaker,
+                        timestamp=result.timestamp,
+                        is_final=True,
+                        utterance_id=result.utterance_id
                     )
+                    analyzed = True
                     
                     # Enregistrer dans analytics
                     self.analytics.record_speech(
-                        speaker="VOUS",
+                        speaker=speaker,
                         duration=result.duration,
                         timestamp=result.timestamp
                     )
+                    stream.trace.mark("intelligence")
                     
                     # Afficher
                     self._display_transcription(result, cleaned)
+                    stream.trace.mark("display")
+                    stream.trace.finish()
                     
+                    # Alertes en temps réel pour objections/budgets
+                    if speaker == "CLIENT":
+                        self._check_realtime_alerts(cleaned)
+                        
         except Exception as e:
-            self.logger.error(f"Error processing left channel: {e}", exc_info=True)
+            self.logger.error(f"Error processing {stream.channel} channel ({speaker}): {e}", exc_info=True)
+            
+        finally:
+            # Final vide, filtré ou en erreur: les objections de ses partiels et provisoire tombent
+            if not analyzed and stream.utterance_id is not None:
+                self.sales_intelligence.discard_utterance(speaker, stream.utterance_id)
+    
+    def _start_draft(self, stream: AudioStream, speaker: str):
+        """
+        Lance le texte provisoire (modèle rapide) en parallèle du final.
+        
+        Args:
+            stream: Énoncé terminé
+            speaker: "VOUS" ou "CLIENT"
+        """
+        if self.transcriber.draft_model is None or stream.utterance_id is None:
+            return
+        
+        task = asyncio.create_task(self._process_draft(stream, speaker))
+        self._draft_tasks.add(task)
+        task.add_done_callback(self._draft_tasks.discard)
     
-    async def _process_right_channel(self, stream: AudioStream):
+    async def _process_draft(self, stream: AudioStream, speaker: str):
         """
-        Traite le canal DROIT (CLIENT) de manière asynchrone.
+        Affiche et analyse le texte provisoire d'un énoncé.
+        Le final du même énoncé le remplacera à l'écran et dans le fichier.
         
         Args:
-            stream: Flux audio du canal droit
+            stream: Énoncé terminé
+            speaker: "VOUS" ou "CLIENT"
         """
         try:
-            result = await self.transcriber.transcribe_stream(
+            result = await self.transcriber.transcribe_draft(
                 audio_data=stream.data,
-                speaker="CLIENT",
-                timestamp=stream.timestamp
+                speaker=speaker,
+                utterance_id=stream.utterance_id,
+                timestamp=stream.timestamp,
+                sample_rate=stream.sample_rate
             )
             
-            if result and result.text:
-                cleaned = self.processor.clean_text(result.text)
+            if not result or not result.text:
+                return
+            
+            cleaned = self.processor.clean_text(result.text)
+            if not cleaned or self.processor.is_hallucination(cleaned):
+                return
+            
+            # Provisoire: objections seulement, dédupliquées avec le final
+            known_objections = len(self.sales_intelligence.objections)
+            self.sales_intelligence.analyze_text(
+                text=cleaned,
+                speaker=speaker,
+                timestamp=result.timestamp,
+                is_final=False,
+                utterance_id=result.utterance_id
+            )
+            
+            self._display_transcription(result, cleaned)
+            
+            for objection in self.sales_intelligence.objections[known_objections:]:
+                self.realtime_ui.display_objection_alert(
+                    objection_type=objection.type,
+                    objection_text=objection.text,
+                    severity=objection.severity
+                )
+                
+        except Exception as e:
+            self.logger.error(f"Error processing {speaker} draft: {e}", exc_info=True)
+    
+    async def _process_channel_partial(self, stream: AudioStream):
+        """Hypothèse partielle d'un canal."""
+        await self._process_partial(stream, stream.speaker)
+    
+    async def _process_partial(self, stream: AudioStream, speaker: str):
+        """
+        Traite l'audio d'un énoncé en cours (hypothèse partielle).
+        Affiche le texte provisoire et lève les objections avant la fin de la phrase.
+        
+        Args:
+            stream: Audio de l'énoncé depuis son début
+            speaker: "VOUS" ou "CLIENT"
+        """
+        try:
+            result = await self.transcriber.transcribe_partial(
+                audio_data=stream.data,
+                speaker=speaker,
+                utterance_id=stream.utterance_id,
+                timestamp=stream.timestamp,
+                sample_rate=stream.sample_rate
+            )
+            
+            if not result or not result.text:
+                return
+            
+            cleaned = self.processor.clean_text(result.text)
+            if not cleaned or self.processor.is_hallucination(cleaned):
+                return
+            
+            known_objections = len(self.sales_intelligence.objections)
+            self.sales_intelligence.analyze_text(
+                text=cleaned,
+                speaker=speaker,
+                timestamp=result.timestamp,
+                is_final=False,
+                utterance_id=result.utterance_id
+            )
+            
+            self._display_transcription(result, cleaned)
+            
+            # Alerte anticipée: objection levée sur le partiel
+            for objection in self.sales_intelligence.objections[known_objections:]:
+                self.realtime_ui.display_objection_alert(
+                    objection_type=objection.type,
+                    objection_text=objection.text,
+                    severity=objection.severity
+                )
                 
-                if cleaned and not self.processor.is_hallucination(cleaned):
-                    # Analyser avec Sales Intelligence
-                    self.sales_intelligence.analyze_text(
-                        text=cleaned,
-                        speaker="CLIENT",
-                        timestamp=result.timestamp
-                    )
-                    
-                    # Enregistrer dans analytics
-                    self.analytics.record_speech(
-                        speaker="CLIENT",
-                        duration=result.duration,
-                        timestamp=result.timestamp
-                    )
-                    
-                    # Afficher
-                    self._display_transcription(result, cleaned)
-                    
-                    # Alertes en temps réel pour objections/budgets
-                    self._check_realtime_alerts(cleaned)
-                    
         except Exception as e:
-            self.logger.error(f"Error processing right channel: {e}", exc_info=True)
+            self.logger.error(f"Error processing {speaker} partial: {e}", exc_info=True)
     
     def _check_realtime_alerts(self, text: str):
         """
@@ -270,6 +395,9 @@ class TheCloserProV25:
     def _display_transcription(self, result: TranscriptionResult, text: str):
         """
         Affiche une transcription avec le format chat Elite.
+        Un partiel ou un provisoire réécrit la ligne courante (texte atténué);
+        le final la remplace définitivement. Le fichier reçoit les révisions
+        provisoire et finale, identifiées par l'énoncé.
         
         Args:
             result: Résultat de transcription
@@ -283,14 +411,37 @@ class TheCloserProV25:
         else:
             color = Fore.CYAN
         
-        # Affichage console
-        formatted = f"[{timestamp}] {color}[{result.speaker}]{Style.RESET_ALL} -> \"{text}\""
-        print(formatted, flush=True)
+        if result.revision == "partial":
+            stable = result.stable_text if text.startswith(result.stable_text) else ""
+            pending = text[len(stable):]
+            print(
+                f"\r\033[K[{timestamp}] {color}[{result.speaker} …]{Style.RESET_ALL} "
+                f"{stable}{Style.DIM}{pending}{Style.RESET_ALL}",
+                end="",
+                flush=True
+            )
+            return
         
-        # Sauvegarde fichier
+        if result.revision == "provisional":
+            # Affichage console atténué, remplacé par le final
+            print(
+                f"\r\033[K[{timestamp}] {color}[{result.speaker} ~]{Style.RESET_ALL} "
+                f"{Style.DIM}\"{text}\"{Style.RESET_ALL}",
+                end="",
+                flush=True
+            )
+            marker = "~>"
+        else:
+            # Affichage console (remplace le partiel ou le provisoire éventuel)
+            formatted = f"[{timestamp}] {color}[{result.speaker}]{Style.RESET_ALL} -> \"{text}\""
+            print(f"\r\033[K{formatted}", flush=True)
+            marker = "->"
+        
+        # Sauvegarde fichier (provisoire "~>" puis final "->" du même énoncé #id)
         if self._output_file:
             try:
-                plain = f"[{timestamp}] [{result.speaker}] -> \"{text}\"\n"
+                utterance = f" #{result.utterance_id}" if result.utterance_id is not None else ""
+                plain = f"[{timestamp}] [{result.speaker}]{utterance} {marker} \"{text}\"\n"
                 with open(self._output_file, 'a', encoding='utf-8') as f:
                     f.write(plain)
             except Exception as e:
@@ -299,17 +450,60 @@ class TheCloserProV25:
     def _audio_callback(self, chunk: AudioChunk):
         """
         Callback pour les chunks audio du streamer.
-        Soumet au dual-stream manager de manière asynchrone.
+        Soumet au gestionnaire multi-canaux de manière asynchrone.
         
         Args:
-            chunk: Chunk audio stéréo
+            chunk: Chunk audio multi-canaux
         """
-        if self.dual_stream and self.loop:
-            # Soumettre de manière thread-safe
-            asyncio.run_coroutine_threadsafe(
-                self.dual_stream.submit_stereo_chunk(chunk.data, chunk.timestamp),
+        if self.streams and self.loop:
+            # Les vues du ring buffer ne survivent pas au callback
+            chunk = chunk.detach()
+            
+            # Trace de latence: origine à la capture du chunk
+            trace = self.tracer.start(origin=chunk.captured_at)
+            trace.mark("audio_queue")
+            
+            # Soumettre de manière thread-safe (timestamp epoch -> datetime)
+            future = asyncio.run_coroutine_threadsafe(
+                self.streams.submit_chunk(
+                    chunk.data,
+                    datetime.fromtimestamp(chunk.timestamp),
+                    trace,
+                    chunk.voice
+                ),
                 self.loop
             )
+            
+            # Une source non-live attend le pipeline (backpressure naturelle)
+            if self.audio_source and not self.audio_source.is_live:
+                future.result()
+    
+    def _create_audio_source(self) -> AudioSource:
+        """
+        Crée la source audio: replay fichier si demandé, sinon capture live.
+        
+        Returns:
+            Source audio prête à démarrer
+        """
+        if self.replay_path:
+            source = FileReplaySource(
+                self.replay_path,
+                callback=self._audio_callback,
+                realtime=self.replay_realtime,
+                on_complete=self._on_replay_complete
+            )
+        else:
+            from core.audio_streamer import AudioStreamer
+            source = AudioStreamer(callback=self._audio_callback)
+        
+        # VAD chargée ici (thread de détection) plutôt que sur le premier chunk
+        source.prepare_voice_detection()
+        return source
+    
+    def _on_replay_complete(self):
+        """Fin du fichier rejoué: déclenche l'arrêt propre (appelé hors event loop)."""
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._shutdown_event.set)
     
     async def start(self):
         """Démarre le système V25."""
@@ -328,44 +522,114 @@ class TheCloserProV25:
             print(f"{Fore.CYAN}" + "="*70 + Style.RESET_ALL)
             print()
             
+            timer = self.startup_timer
+            
             # Validation config
-            self.config.validate()
-            self._setup_output_file()
+            with timer.phase("config"):
+                self.config.validate()
+                self._setup_output_file()
             
-            # Initialiser le transcripteur Elite
+            # Charger le modèle en tâche de fond: il recouvre la détection audio et la mise en place du pipeline
             print(f"{Fore.YELLOW}[INIT]{Style.RESET_ALL} Chargement du modèle Whisper Elite...")
-            await self.transcriber.initialize()
+            model_task = asyncio.create_task(
+                timer.track("transcriber", self.transcriber.initialize(timer))
+            )
+            
+            try:
+                # Démarrer analytics
+                with timer.phase("analytics"):
+                    self.analytics.start_session()
+                
+                # Créer la source audio (la fréquence du pipeline suit la source)
+                # Détection des périphériques dans un thread: le chargement du modèle continue
+                with timer.phase("audio_device"):
+                    self.audio_source = await asyncio.get_running_loop().run_in_executor(
+                        None, self._create_audio_source
+                    )
+                if self.audio_source.sample_rate != self.config.audio.sample_rate:
+                    self.logger.info(
+                        f"Source sample rate {self.audio_source.sample_rate} Hz overrides "
+                        f"configured {self.config.audio.sample_rate} Hz"
+                    )
+                    self.config.audio.sample_rate = self.audio_source.sample_rate
+                
+                # Créer le gestionnaire multi-canaux (hypothèses partielles si streaming actif)
+                partials = self.config.transcription.streaming_partials
+                # Un rejeu de fichier n'a pas d'échéance: aucune perte, le producteur attend
+                backpressure = self.config.backpressure
+                if not self.audio_source.is_live:
+                    backpressure = dataclasses.replace(backpressure, policy="block")
+                print(f"{Fore.YELLOW}[INIT]{Style.RESET_ALL} Initialisation du système multi-stream...")
+                with timer.phase("streams"):
+                    self.streams = MultiStreamManager(
+                        speakers=self.config.audio.channel_speakers,
+                        callback=self._process_channel,
+                        max_queue_size=50,
+                        sample_rate=self.audio_source.sample_rate,
+                        utterance_config=self.config.utterance,
+                        partial_callback=self._process_channel_partial if partials else None,
+                        bleed_config=self.config.bleed,
+                        backpressure_config=backpressure
+                    )
+                    await self.streams.start()
+                    
+                    # Contrôle temps réel: profondeur et pression des queues + profil appliqué aux assembleurs
+                    gpu_manager = self.transcriber.gpu_manager
+                    gpu_manager.set_queue_health_provider(self.streams.get_queue_health)
+                    gpu_manager.add_adjustment_listener(self.streams.apply_performance_profile)
+                    self.streams.apply_performance_profile(gpu_manager.current_profile)
+                    gpu_manager.add_adjustment_listener(self.audio_source.apply_performance_profile)
+                    self.audio_source.apply_performance_profile(gpu_manager.current_profile)
+                
+                # Le modèle doit être prêt avant la capture
+                await model_task
+            finally:
+                if not model_task.done():
+                    model_task.cancel()
             
-            # Démarrer analytics
-            self.analytics.start_session()
+            # Premier décodage (le plus lent) sur audio synthétique, pas sur le client
+            print(f"{Fore.YELLOW}[INIT]{Style.RESET_ALL} Préchauffage du modèle...")
+            await timer.track("warmup", self.transcriber.warmup(timer))
             
             # Démarrer VRAM Guardian
             print(f"{Fore.YELLOW}[INIT]{Style.RESET_ALL} Activation du VRAM Guardian...")
-            await self.vram_guardian.start_monitoring()
-            
-            # Créer le dual-stream manager
-            print(f"{Fore.YELLOW}[INIT]{Style.RESET_ALL} Initialisation du système dual-stream...")
-            self.dual_stream = DualStreamManager(
-                left_callback=self._process_left_channel,
-                right_callback=self._process_right_channel,
-                max_queue_size=50,
-                sample_rate=self.config.audio.sample_rate
-            )
-            await self.dual_stream.start()
+            with timer.phase("vram_guardian"):
+                await self.vram_guardian.start_monitoring()
             
-            # Démarrer l'audio streamer
-            print(f"{Fore.YELLOW}[INIT]{Style.RESET_ALL} Démarrage de la capture audio...")
-            self.audio_streamer = AudioStreamer(callback=self._audio_callback)
-            self.audio_streamer.start()
+            # Métriques live (endpoint Prometheus local si configuré)
+            with timer.phase("metrics"):
+                self._start_metrics_endpoint()
+            
+            # Démarrer la source audio
+            if self.replay_path:
+                print(f"{Fore.YELLOW}[INIT]{Style.RESET_ALL} Replay du fichier {self.replay_path}...")
+            else:
+                print(f"{Fore.YELLOW}[INIT]{Style.RESET_ALL} Démarrage de la capture audio...")
+            with timer.phase("capture_start"):
+                self.audio_source.start()
+            
+            self._display_startup_report()
             
             self._is_running = True
             self._session_start = datetime.now()
             
             print(f"{Fore.GREEN}[READY]{Style.RESET_ALL} Système v0.25 Elite opérationnel - Parlez maintenant !")
-            print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} Architecture: Dual-Stream Zero-Overlap")
+            print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} Architecture: Multi-Stream Zero-Overlap "
+                  f"({', '.join(channel.speaker for channel in self.streams.channels)})")
             print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} Intelligence: Entity & Objection Detection")
             print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} Analytics: Live Talk-Ratio Monitoring")
-            print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} GPU: VRAM Guardian + Self-Healing")
+            if self.transcriber.cpu_backend:
+                backend = self.transcriber.cpu_backend
+                print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} CPU: {backend.model_name} {backend.compute_type}, "
+                      f"{backend.cpu_threads} threads x {backend.num_workers} workers (RTF {backend.rtf:.2f})")
+            else:
+                print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} GPU: VRAM Guardian + Self-Healing")
+            if self.transcriber.pool:
+                print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} Inference: {self.transcriber.pool.num_workers} processus "
+                      f"(dispatch au moins chargé)")
+            if self.metrics_server:
+                print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} Métriques: "
+                      f"http://{self.metrics_server.host}:{self.metrics_server.port}/metrics")
             print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} Appuyez sur Ctrl+C pour arrêter\n")
             
             # Afficher l'en-tête de monitoring
@@ -379,6 +643,39 @@ class TheCloserProV25:
             await self.stop()
             raise
     
+    def _start_metrics_endpoint(self):
+        """Branche les composants sur le registre de métriques et démarre l'endpoint HTTP."""
+        for component in (
+            self.audio_source,
+            self.streams,
+            self.transcriber,
+            self.transcriber.gpu_manager,
+            self.transcriber.gate,
+            self.processor,
+            self.vram_guardian
+        ):
+            self.metrics.register_collector(component.publish_metrics)
+        
+        port = self.config.system.metrics_port
+        if not port:
+            return
+        
+        server = MetricsServer(self.metrics, host=self.config.system.metrics_host, port=port)
+        try:
+            server.start()
+            self.metrics_server = server
+        except OSError as e:
+            # Port occupé: la session continue sans endpoint
+            self.logger.warning(f"Metrics endpoint unavailable on port {port}: {e}")
+    
+    def _display_startup_report(self):
+        """Affiche (et journalise) la durée de chaque phase de démarrage."""
+        lines = self.startup_timer.report()
+        print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} Démarrage en {self.startup_timer.total:.2f}s:")
+        for line in lines:
+            print(f"{Style.DIM}{line}{Style.RESET_ALL}")
+        self.logger.info("Startup timing:\n" + "\n".join(lines))
+    
     async def stop(self):
         """Arrête proprement tous les composants."""
         if not self._is_running:
@@ -388,10 +685,6 @@ class TheCloserProV25:
         
         self._is_running = False
         
-        # Arrêter l'audio streamer
-        if self.audio_streamer:
-            self.audio_streamer.stop()
-        
         # Arrêter le monitoring live
         if self._live_monitor_task:
             self._live_monitor_task.cancel()
@@ -400,9 +693,14 @@ class TheCloserProV25:
             except asyncio.CancelledError:
                 pass
         
-        # Arrêter le dual-stream
-        if self.dual_stream:
-            await self.dual_stream.stop()
+        # Arrêter la source (hors de la boucle: une source non-live attend que son
+        # chunk en cours soit accepté) et les flux ensemble: les workers vident les
+        # queues pleines ('block') et libèrent le thread de capture, les chunks
+        # soumis après l'arrêt des flux sont abandonnés
+        await asyncio.gather(
+            self._stop_audio_source(),
+            self.streams.stop() if self.streams else asyncio.sleep(0)
+        )
         
         # Arrêter le VRAM Guardian
         await self.vram_guardian.stop_monitoring()
@@ -416,8 +714,17 @@ class TheCloserProV25:
         # Exporter la session
         self._export_session_summary()
         
+        # Arrêter l'endpoint de métriques (après les derniers scrapes possibles)
+        if self.metrics_server:
+            self.metrics_server.stop()
+        
         print(f"\n{Fore.GREEN}[DONE]{Style.RESET_ALL} Session terminée.")
     
+    async def _stop_audio_source(self):
+        """Arrête la source audio dans un thread (son stop() attend la fin de la capture)."""
+        if self.audio_source:
+            await asyncio.get_running_loop().run_in_executor(None, self.audio_source.stop)
+    
     def _export_session_summary(self):
         """
         Exporte le résumé de session enrichi.
@@ -442,7 +749,8 @@ class TheCloserProV25:
                 transcriber_stats=transcriber_stats,
                 gpu_stats=gpu_stats,
                 session_duration=session_duration,
-                transcription_file=self._output_file
+                transcription_file=self._output_file,
+                latency_data=self.tracer.get_stats()
             )
             
             print(f"\n{Fore.GREEN}[EXPORT]{Style.RESET_ALL} Session summary: {output_path}")
@@ -504,14 +812,100 @@ class TheCloserProV25:
         print(f"   Transcriptions: {trans_stats['total_transcriptions']}")
         print(f"   Temps moyen: {trans_stats['average_inference_time']:.2f}s")
         print(f"   Ajustements auto: {trans_stats['gpu_adjustments']}")
-        
-        # Dual-stream health
-        if self.dual_stream:
-            health = self.dual_stream.get_queue_health()
+        realtime = trans_stats['realtime']
+        print(f"   Temps réel: RTF p90 {realtime['rtf_p90']:.2f}, retard max {realtime['max_lag_seconds']:.1f}s")
+        
+        batching = trans_stats['batching']
+        distribution = ", ".join(f"{size}x{count}" for size, count in batching['batch_size_distribution'].items())
+        print(f"   Batching: {batching['batches_count']} lots, taille moy {batching['mean_batch_size']:.2f} "
+              f"[{distribution}], attente moy {batching['mean_queue_delay_ms']:.0f}ms "
+              f"(max {batching['max_queue_delay_ms']:.0f}ms)")
+        
+        speculative = trans_stats['speculative']
+        if trans_stats['draft_model']:
+            print(f"   Provisoire ({trans_stats['draft_model']}): {speculative['drafts_count']} textes, "
+                  f"latence p50 {speculative['draft_latency_p50_ms']:.0f}ms (p90 {speculative['draft_latency_p90_ms']:.0f}ms), "
+                  f"{speculative['late_drafts']} après le final")
+            print(f"   Final: latence p50 {speculative['final_latency_p50_ms']:.0f}ms "
+                  f"(p90 {speculative['final_latency_p90_ms']:.0f}ms)")
+            print(f"   Accord provisoire/final: WER moy {speculative['mean_wer'] * 100:.1f}%, "
+                  f"{speculative['exact_match_rate'] * 100:.0f}% identiques "
+                  f"({speculative['compared_count']} comparés)")
+        
+        pool = trans_stats['inference_pool']
+        if pool:
+            print(f"   Pool: {pool['num_workers']} workers, {pool['completed']} décodages")
+            for worker in pool['workers']:
+                print(f"     Worker {worker['worker_id']}: {worker['completed']} requêtes, "
+                      f"latence {worker['latency_ewma_ms']:.0f}ms (max {worker['max_latency_ms']:.0f}ms), "
+                      f"{worker['errors']} erreurs, {worker['restarts']} redémarrages")
+        
+        # Filtrage par les signaux du décodeur
+        gating = trans_stats['gating']
+        if gating['enabled'] and gating['segments_checked']:
+            rejections = ", ".join(f"{gate} {count}" for gate, count in gating['rejections'].items())
+            print(f"   Filtres décodeur: {gating['segments_checked'] - gating['segments_passed']}/"
+                  f"{gating['segments_checked']} segments rejetés ({rejections}), "
+                  f"{gating['utterances_rejected']} énoncés écartés")
+        
+        prompts = trans_stats['context_prompt']
+        if prompts['requests']:
+            print(f"   Prompt contexte: {prompts['mean_tokens']:.0f} tokens moy "
+                  f"(max {prompts['max_tokens']}/{prompts['token_budget']}), "
+                  f"cache {prompts['cache_hit_rate'] * 100:.0f}% ({prompts['builds']} construits, "
+                  f"{prompts['truncated']} réduits)")
+        
+        # Latence par étape du pipeline
+        latency = self.tracer.get_stats()
+        if latency:
+            print(f"\n{Fore.WHITE}⏱️ LATENCE PAR ÉTAPE:{Style.RESET_ALL} (p50 / p95 / p99)")
+            for stage, hist in latency.items():
+                print(f"   {stage:<15} {hist['p50_ms']:8.1f} / {hist['p95_ms']:8.1f} / {hist['p99_ms']:8.1f} ms "
+                      f"({hist['count']})")
+        
+        # Débit du replay
+        if self.audio_source and not self.audio_source.is_live:
+            replay = self.audio_source.get_stats()
+            print(f"\n{Fore.WHITE}⏩ REPLAY:{Style.RESET_ALL}")
+            print(f"   Audio: {replay['audio_seconds']:.1f}s en {replay['wall_seconds']:.1f}s "
+                  f"({replay['speed_factor']:.1f}x temps réel)")
+        
+        # Multi-stream health
+        if self.streams:
+            health = self.streams.get_queue_health()
             health_icon = "✅" if health["is_healthy"] else "⚠️"
-            print(f"\n{Fore.WHITE}🔄 DUAL-STREAM:{Style.RESET_ALL} {health_icon}")
-            print(f"   Queue VOUS: {health['left_queue_size']}")
-            print(f"   Queue CLIENT: {health['right_queue_size']}")
+            print(f"\n{Fore.WHITE}🔄 MULTI-STREAM:{Style.RESET_ALL} {health_icon}")
+            utterances = self.streams.get_utterance_metrics()
+            for channel in self.streams.channels:
+                metrics = utterances[channel.name]
+                print(f"   Queue {channel.speaker}: {health['queue_sizes'][channel.name]}")
+                print(f"   Énoncés {channel.speaker}: {metrics['utterances_count']} "
+                      f"({metrics['utterances_per_second']:.2f}/s), "
+                      f"moy {metrics['mean_utterance_duration']:.1f}s, "
+                      f"endpoint {metrics['mean_endpoint_latency'] * 1000:.0f}ms, "
+                      f"silence ignoré {metrics['skipped_fraction']:.0%}")
+            
+            backpressure = self.streams.get_backpressure_stats()
+            if any(stats['shed_chunks'] for stats in backpressure.values()):
+                for channel in self.streams.channels:
+                    stats = backpressure[channel.name]
+                    print(f"   Délestage {channel.speaker} ({stats['policy']}): {stats['shed_seconds']:.1f}s "
+                          f"(dont silence {stats['shed_silence_seconds']:.1f}s), "
+                          f"attente max {stats['max_lag_seconds']:.1f}s")
+            
+            bleed = self.streams.bleed.get_stats()
+            if bleed['chunks_suppressed']:
+                seconds = ", ".join(
+                    f"{channel.speaker} {bleed['suppressed_seconds'][channel.name]:.1f}s"
+                    for channel in self.streams.channels
+                )
+                print(f"   Diaphonie écartée: {seconds} "
+                      f"({bleed['chunks_suppressed']}/{bleed['chunks_checked']} chunks)")
+            
+            if self.audio_source and self.audio_source.vad:
+                vad = self.audio_source.vad.get_stats()
+                voiced = ", ".join(f"{channel['voiced_ratio']:.0%}" for channel in vad["channels"])
+                print(f"   VAD {vad['backend']}: trames voisées {voiced or '-'}")
         
         print(f"\n{Fore.CYAN}" + "═"*70 + Style.RESET_ALL)
     
@@ -534,9 +928,34 @@ class TheCloserProV25:
             self.loop.call_soon_threadsafe(self._shutdown_event.set)
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse les arguments de la ligne de commande.
+    
+    Args:
+        argv: Arguments (défaut: sys.argv)
+    
+    Returns:
+        Namespace avec replay et fast
+    """
+    parser = argparse.ArgumentParser(description="THE CLOSER PRO v0.25")
+    parser.add_argument(
+        "--replay",
+        metavar="FICHIER",
+        help="Rejouer un appel enregistré (WAV/FLAC stéréo: gauche=VOUS, droite=CLIENT)"
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Replay aussi vite que possible (mesure de débit) au lieu du temps réel"
+    )
+    return parser.parse_args(argv)
+
+
 async def main():
     """Point d'entrée principal."""
-    app = TheCloserProV25()
+    args = parse_args()
+    app = TheCloserProV25(replay_path=args.replay, replay_realtime=not args.fast)
     
     # Configurer les signaux
     loop = asyncio.get_event_loop()
@@ -0,0 +1,168 @@
+"""
+Microbenchmark du filtre d'hallucinations: double boucle historique
+(sous-chaîne puis fuzz.partial_ratio pattern par pattern) contre le
+HallucinationMatcher compilé d'EliteProcessor.
+
+Vérifie que les deux donnent les mêmes décisions, puis compare le temps
+par ligne sur un corpus de transcription français (fichiers fournis ou
+corpus synthétique d'appels de vente).
+
+Usage:
+    python tools/bench_hallucination_matcher.py
+    python tools/bench_hallucination_matcher.py --corpus transcription_v25_*.txt --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from rapidfuzz import fuzz
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.processor_v25 import EliteProcessor, HallucinationMatcher
+
+
+OPENINGS = [
+    "Bonjour", "Oui bonjour", "Alors", "D'accord", "Écoutez", "Très bien", "Parfait",
+    "Je comprends", "Effectivement", "Justement", "Bon", "Voilà"
+]
+SUBJECTS = [
+    "votre projet de rénovation", "le devis que je vous ai envoyé", "notre offre annuelle",
+    "la solution de gestion", "le contrat de maintenance", "votre équipe commerciale",
+    "l'installation des panneaux", "le budget prévu", "la formation de vos collaborateurs",
+    "le calendrier de déploiement", "votre associé", "la proposition tarifaire"
+]
+VERBS = [
+    "je voulais revenir sur", "on peut regarder ensemble", "il faudrait valider",
+    "je vous propose de discuter de", "vous m'aviez parlé de", "on a bien avancé sur",
+    "je dois en parler avec ma direction concernant", "c'est un peu cher pour",
+    "on hésite encore sur", "ça correspond bien à"
+]
+ENDINGS = [
+    "la semaine prochaine", "avant la fin du mois", "pour environ {n} euros",
+    "si ça vous convient", "d'ici jeudi", "avec un paiement en {k} fois",
+    "pour le trimestre prochain", "sans engagement", "dès que possible", ""
+]
+# Lignes typiques d'hallucination Whisper (silence, musique, sous-titres)
+HALLUCINATIONS = [
+    "Sous-titres réalisés para la communauté d'Amara.org", "Merci d'avoir regardé cette vidéo !",
+    "Abonnez-vous à la chaîne", "N'oubliez pas de mettre un pouce bleu",
+    "Sous-titrage ST' 501", "Merci d'avoir regardé", "Thank you for watching",
+    "Activez la cloche pour ne rien manquer", "Transcription automatique générée",
+    "Sou-titres réalisé par la comunauté", "Abonez vous et partagé la vidéo"
+]
+
+
+def synthetic_corpus(lines: int, hallucination_rate: float = 0.05, seed: int = 42) -> list:
+    """
+    Génère un corpus d'appel de vente en français.
+    
+    Args:
+        lines: Nombre de lignes
+        hallucination_rate: Proportion de lignes d'hallucination
+        seed: Graine aléatoire
+    
+    Returns:
+        Liste de lignes
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(lines):
+        if rng.random() < hallucination_rate:
+            corpus.append(rng.choice(HALLUCINATIONS))
+            continue
+        sentence = " ".join(part for part in (
+            rng.choice(OPENINGS) + ",",
+            rng.choice(VERBS),
+            rng.choice(SUBJECTS),
+            rng.choice(ENDINGS).format(n=rng.randrange(1000, 90000, 500), k=rng.choice((3, 4, 10)))
+        ) if part)
+        corpus.append(sentence.strip() + rng.choice((".", " ?", " !", "...")))
+    return corpus
+
+
+def load_corpus(paths: list) -> list:
+    """
+    Charge des transcriptions (une ligne par énoncé, préfixe horodaté retiré).
+    
+    Args:
+        paths: Fichiers texte
+    
+    Returns:
+        Liste de lignes non vides
+    """
+    prefix = re.compile(r"^\[[^\]]*\]\s*(?:\S+\s*(?:->|~>)\s*)?(?:#\d+\s*)?")
+    corpus = []
+    for path in paths:
+        for line in Path(path).read_text(encoding="utf-8", errors="ignore").splitlines():
+            line = prefix.sub("", line).strip()
+            if line:
+                corpus.append(line)
+    return corpus
+
+
+def legacy_is_match(patterns, threshold: float, text_lower: str) -> bool:
+    """Filtre historique: deux boucles Python sur les patterns."""
+    for pattern in patterns:
+        if pattern in text_lower:
+            return True
+    for pattern in patterns:
+        if fuzz.partial_ratio(pattern, text_lower) > threshold:
+            return True
+    return False
+
+
+def bench(label: str, func, corpus: list, repeat: int) -> float:
+    """Meilleur temps par ligne (µs) sur plusieurs passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            func(text)
+        best = min(best, time.perf_counter() - started)
+    per_line = best / len(corpus) * 1e6
+    print(f"  {label:<10} {per_line:8.2f} µs/ligne  ({best * 1000:.1f} ms pour {len(corpus)} lignes)")
+    return per_line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du filtre d'hallucinations")
+    parser.add_argument("--corpus", nargs="*", default=[], help="Fichiers de transcription")
+    parser.add_argument("--lines", type=int, default=20000, help="Taille du corpus synthétique")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de passes (meilleur temps)")
+    parser.add_argument("--threshold", type=float, default=85, help="Seuil fuzzy")
+    args = parser.parse_args()
+    
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.lines)
+    corpus = [text.lower() for text in corpus if len(text) >= 2]
+    if not corpus:
+        print("Corpus vide")
+        return 1
+    
+    patterns = list(EliteProcessor.HALLUCINATION_PATTERNS)
+    matcher = HallucinationMatcher(patterns, args.threshold)
+    
+    # Parité des décisions avant toute mesure
+    mismatches = [
+        text for text in corpus
+        if legacy_is_match(patterns, args.threshold, text) != (matcher.match(text) is not None)
+    ]
+    flagged = sum(1 for text in corpus if matcher.match(text) is not None)
+    print(f"Corpus: {len(corpus)} lignes, {len(patterns)} patterns, {flagged} filtrées, "
+          f"{len(mismatches)} divergences")
+    for text in mismatches[:10]:
+        print(f"  DIVERGENCE: {text}")
+    
+    legacy = bench("boucle", lambda t: legacy_is_match(patterns, args.threshold, t), corpus, args.repeat)
+    compiled = bench("compilé", matcher.match, corpus, args.repeat)
+    print(f"  Accélération: x{legacy / compiled:.2f}")
+    
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Benchmark de la détection de SalesIntelligence: boucles historiques
+(re.finditer par pattern de prix, re.search par pattern d'objection, double
+passe sur les patterns d'accord) contre le DetectionEngine compilé.
+
+Vérifie que les deux trouvent les mêmes budgets, objections et accords,
+puis compare le débit en segments/seconde sur un corpus de transcription
+français (fichiers fournis ou corpus synthétique d'appels de vente).
+
+Usage:
+    python tools/bench_sales_detection.py
+    python tools/bench_sales_detection.py --corpus transcription_v25_*.txt --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.sales_intelligence import DetectionEngine, SalesIntelligence
+
+
+OPENINGS = [
+    "Bonjour", "Oui", "Alors", "Écoutez", "Bon", "Voilà", "Je comprends", "Honnêtement", "Franchement", ""
+]
+CLAUSES = [
+    "c'est trop cher pour nous", "je dois y réfléchir", "je vais en parler avec mon associé",
+    "on a d'autres offres sur la table", "ça me va", "je suis d'accord sur le principe",
+    "c'est parfait", "je ne suis pas convaincu", "rappelez-moi la semaine prochaine",
+    "pas le budget cette année", "la concurrence propose moins", "on fait comme ça",
+    "je valide le devis", "le calendrier de déploiement nous convient", "on part sur {n} euros",
+    "le contrat est à {k}k par an", "comptez {m} millions sur trois ans", "pour {n} € hors taxes",
+    "je vous envoie la proposition", "votre équipe a bien travaillé", "je ne vois pas l'intérêt",
+    "c'est pas moi qui décide", "trop occupé en ce moment", "on regarde ça ensemble demain"
+]
+
+
+def synthetic_corpus(lines: int, seed: int = 42) -> list:
+    """
+    Génère un corpus d'appel de vente en français.
+    
+    Args:
+        lines: Nombre de segments
+        seed: Graine aléatoire
+    
+    Returns:
+        Liste de segments
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(lines):
+        clauses = [
+            rng.choice(CLAUSES).format(n=rng.randrange(500, 90000, 500), k=rng.randrange(2, 60), m=rng.randrange(1, 5))
+            for _ in range(rng.randint(1, 3))
+        ]
+        sentence = " ".join(part for part in (rng.choice(OPENINGS), ", ".join(clauses)) if part)
+        corpus.append(sentence + rng.choice((".", " ?", " !", "...")))
+    return corpus
+
+
+def load_corpus(paths: list) -> list:
+    """
+    Charge des transcriptions (une ligne par énoncé, préfixe horodaté retiré).
+    
+    Args:
+        paths: Fichiers texte
+    
+    Returns:
+        Liste de lignes non vides
+    """
+    prefix = re.compile(r"^\[[^\]]*\]\s*(?:\S+\s*(?:->|~>)\s*)?(?:#\d+\s*)?")
+    corpus = []
+    for path in paths:
+        for line in Path(path).read_text(encoding="utf-8", errors="ignore").splitlines():
+            line = prefix.sub("", line).strip()
+            if line:
+                corpus.append(line)
+    return corpus
+
+
+def legacy_detect(text_lower: str) -> tuple:
+    """Détection historique: un appel re par pattern, accords évalués deux fois."""
+    budgets = []
+    for pattern in SalesIntelligence.PRICE_PATTERNS:
+        for match in re.finditer(pattern, text_lower, re.IGNORECASE):
+            budgets.append((match.start(), match.end(), match.group(1)))
+    
+    objections = []
+    for obj_type, patterns in SalesIntelligence.OBJECTION_PATTERNS.items():
+        for pattern in patterns:
+            if re.search(pattern, text_lower):
+                objections.append(obj_type)
+                break
+    
+    agreements = 0
+    for pattern in SalesIntelligence.AGREEMENT_PATTERNS:
+        if re.search(pattern, text_lower):
+            agreements = sum(1 for p in SalesIntelligence.AGREEMENT_PATTERNS if re.search(p, text_lower))
+            break
+    
+    return budgets, objections, agreements
+
+
+def engine_detect(engine: DetectionEngine, text_lower: str) -> tuple:
+    """Même résultat, en un appel du DetectionEngine."""
+    hits = engine.scan(text_lower)
+    budgets = [(match.start(), match.end(), match.group(1)) for match in hits.budgets]
+    return budgets, hits.objection_types, hits.agreement_count
+
+
+def bench(label: str, func, corpus: list, repeat: int) -> float:
+    """Meilleur débit (segments/s) sur plusieurs passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            func(text)
+        best = min(best, time.perf_counter() - started)
+    throughput = len(corpus) / best
+    print(f"  {label:<10} {throughput:10.0f} segments/s  ({best / len(corpus) * 1e6:.2f} µs/segment)")
+    return throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la détection budgets/objections/accords")
+    parser.add_argument("--corpus", nargs="*", default=[], help="Fichiers de transcription")
+    parser.add_argument("--lines", type=int, default=20000, help="Taille du corpus synthétique")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de passes (meilleur temps)")
+    args = parser.parse_args()
+    
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.lines)
+    corpus = [text.lower() for text in corpus]
+    if not corpus:
+        print("Corpus vide")
+        return 1
+    
+    engine = DetectionEngine(
+        SalesIntelligence.PRICE_PATTERNS,
+        SalesIntelligence.OBJECTION_PATTERNS,
+        SalesIntelligence.AGREEMENT_PATTERNS
+    )
+    
+    # Parité des détections avant toute mesure
+    mismatches = [text for text in corpus if legacy_detect(text) != engine_detect(engine, text)]
+    budgets = sum(len(engine.scan(text).budgets) for text in corpus)
+    print(f"Corpus: {len(corpus)} segments, {budgets} budgets, {len(mismatches)} divergences")
+    for text in mismatches[:10]:
+        print(f"  DIVERGENCE: {text}")
+    
+    legacy = bench("boucles", legacy_detect, corpus, args.repeat)
+    compiled = bench("compilé", engine.scan, corpus, args.repeat)
+    print(f"  Accélération: x{compiled / legacy:.2f}")
+    
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())